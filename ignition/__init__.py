@@ -5,7 +5,14 @@ was not distributed with this file, You can obtain one
 at http://mozilla.org/MPL/2.0/.
 """
 
+from . import defaults
+from .batch import BatchRequest
+from .connect import HappyEyeballsConnector
+from .dns_cache import DNSCache
+from .download import Download, DownloadResponse
 from .globals import *
+from .hooks import Hooks
+from .redirect import RedirectCache, RedirectFollower
 from .request import Request
 from .response import (
     ClientCertRequiredResponse,
@@ -16,16 +23,37 @@ from .response import (
     SuccessResponse,
     TempFailureResponse,
 )
-from .ssl.cert_store import CertStore
-from .util import TimeoutManager
+from .response_cache import ResponseCache
+from .scheduler import HostScheduler
+from .ssl.session_cache import SSLSessionCache
+from .url import URL
 
 __version__ = "1.0.0"
 
-__timeout = TimeoutManager(DEFAULT_REQUEST_TIMEOUT)
-__cert_store = CertStore(DEFAULT_HOSTS_FILE)
+__timeout = defaults.timeout_manager
+__cert_store = defaults.cert_store
+__ssl_context_cache = defaults.ssl_context_cache
+__ssl_session_cache = SSLSessionCache(
+    DEFAULT_TLS_SESSION_CACHE_SIZE, DEFAULT_TLS_SESSION_TTL
+)
+__hooks = Hooks()
+__dns_cache = DNSCache(
+    DEFAULT_DNS_CACHE_SIZE, DEFAULT_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_NEGATIVE_TTL
+)
+__connector = HappyEyeballsConnector(
+    DEFAULT_HAPPY_EYEBALLS_DELAY, DEFAULT_HAPPY_EYEBALLS_HOSTS
+)
+__scheduler = HostScheduler(max_pause=DEFAULT_SLOW_DOWN_MAX_PAUSE)
+__redirect_cache = RedirectCache(DEFAULT_REDIRECT_CACHE_SIZE)
+__response_cache = ResponseCache(
+    DEFAULT_RESPONSE_CACHE_DIR,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_RESPONSE_CACHE_SIZE,
+    DEFAULT_RESPONSE_CACHE_STATUSES,
+)
 
 
-def set_default_hosts_file(hosts_file):
+def set_default_hosts_file(hosts_file, mode=None, fingerprint_mode=None):
     """
     Set the default host file location where all of the certificate fingerprints
     are stored in order to support Trust-On-First-Use (TOFU) validation.
@@ -36,22 +64,260 @@ def set_default_hosts_file(hosts_file):
     The format of this file is very similar to (but not identical to)
     the SSH `known_hosts` file.
 
+    If a *mode* is provided, this also changes how the hosts file is accessed:
+    * `ignition.CERT_STORE_MODE_DEFAULT`: the file is re-read on every request
+      and rewritten whenever a certificate record is new or different.
+    * `ignition.CERT_STORE_MODE_INDEXED`: the file is loaded once into memory and
+      only re-read when it changes on disk; as in the default mode, it is only
+      rewritten when a certificate record is new or different.  Recommended for
+      clients with many known hosts.
+    * `ignition.CERT_STORE_MODE_JOURNAL`: as above, but new or changed records are
+      appended to the file as single lines instead of rewriting it, and the file is
+      compacted atomically once it holds too many superseded lines.  Recommended for
+      long-running clients that validate many new hosts.
+    * `ignition.CERT_STORE_MODE_SQLITE`: *hosts_file* is a SQLite database (created if
+      needed) with an indexed lookup by hostname.  The database runs in WAL mode, and
+      each TOFU check & update runs in a single write transaction, so it can safely be
+      shared by many worker processes.
+
+    If a *fingerprint_mode* is provided, this also changes how new certificates
+    are fingerprinted:
+    * `ignition.FINGERPRINT_MODE_OPENSSH`: the OpenSSH-encoded public key (default).
+    * `ignition.FINGERPRINT_MODE_SHA256`: the SHA-256 digest of the certificate's
+      SubjectPublicKeyInfo, kept as 32 bytes in memory and as hex in the hosts file.
+    Existing records are still checked against the fingerprint they were stored
+    with, and are rewritten in the new format the next time their host is trusted.
+
     Parameters:
     * hosts_file: `string`
+    * mode: `string` (optional)
+    * fingerprint_mode: `string` (optional)
+
+    """
+    __cert_store.set_hosts_file(
+        hosts_file, mode=mode, fingerprint_mode=fingerprint_mode
+    )
+
 
+def set_default_response_cache(
+    directory,
+    ttl=DEFAULT_RESPONSE_CACHE_TTL,
+    max_size=DEFAULT_RESPONSE_CACHE_SIZE,
+    statuses=DEFAULT_RESPONSE_CACHE_STATUSES,
+):
     """
-    __cert_store.set_hosts_file(hosts_file)
+    Set the directory where responses to requests made with `use_cache=True` are stored.
+    By default, responses are stored in a directory named `.ignition_cache` in the
+    working directory, which is created on first use.
 
+    Responses expire *ttl* seconds after they are stored (default: 1 hour), and the least
+    recently used responses are evicted once the stored responses exceed *max_size* bytes
+    (default: 64MiB).  Only responses whose basic status is in *statuses* are stored; by
+    default these are success (2x) and permanent failure (5x) responses.
 
-def set_default_timeout(timeout):
+    Parameters:
+    * directory: `string`
+    * ttl: `float` (optional)
+    * max_size: `int` (optional)
+    * statuses: `Iterable[string]` (optional)
+    """
+    __response_cache.configure(directory, ttl, max_size, statuses)
+
+
+def set_default_timeout(
+    timeout,
+    connect_timeout=None,
+    handshake_timeout=None,
+    first_byte_timeout=None,
+    total_timeout=None,
+):
     """
     Set the default timeout (in seconds) for all requests made via ignition.
-    The default timeout is 30 seconds.
+    The default timeout is 30 seconds.  This timeout applies to each network
+    operation separately, so a server that keeps sending data slowly can hold
+    a request open for longer.
+
+    Optionally, each phase of a request can be given its own budget (in seconds),
+    which replaces *timeout* for that phase:
+    * *connect_timeout*: establishing the TCP connection
+    * *handshake_timeout*: the TLS handshake
+    * *first_byte_timeout*: sending the request until the response header arrives
+    * *total_timeout*: a deadline for the whole request, including reading the body.
+      Every network operation is bounded by the time left until this deadline.
+
+    Each call replaces all of the phase budgets; the default is no phase budgets.
+
+    ```python
+    ignition.set_default_timeout(30, connect_timeout=5, total_timeout=60)
+    ```
 
     Parameters:
     * timeout: `float`
+    * connect_timeout: `float` (optional)
+    * handshake_timeout: `float` (optional)
+    * first_byte_timeout: `float` (optional)
+    * total_timeout: `float` (optional)
     """
     __timeout.set_default_timeout(timeout)
+    __timeout.set_default_budgets(
+        connect_timeout=connect_timeout,
+        handshake_timeout=handshake_timeout,
+        first_byte_timeout=first_byte_timeout,
+        total_timeout=total_timeout,
+    )
+
+
+def add_hook(event, callback):
+    """
+    Register a *callback* for an *event* in the request pipeline, for every request made
+    via ignition.  The callback is called with an `ignition.hooks.HookEvent`, which holds
+    the request `url`, `host`, `timings` and, depending on the event, the response `status`,
+    `meta`, `bytes_read`, `tofu_result` and `response`.  The events are:
+
+    * `ignition.HOOK_ON_CONNECT`: the TCP connection is established
+    * `ignition.HOOK_ON_HANDSHAKE`: the TLS handshake is complete
+    * `ignition.HOOK_ON_TOFU_RESULT`: the server certificate was validated, or rejected.
+      `tofu_result` is one of `ignition.TOFU_RESULT_TRUSTED`, `ignition.TOFU_RESULT_ADDED`,
+      `ignition.TOFU_RESULT_UPDATED`, `ignition.TOFU_RESULT_REJECTED` or `ignition.TOFU_RESULT_EXPIRED`.
+    * `ignition.HOOK_ON_HEADER`: the response header was received
+    * `ignition.HOOK_ON_COMPLETE`: the request returned a response (including error responses).
+      For a streamed response, this is called before the body is read.
+
+    Callbacks run synchronously on the thread making the request, and errors raised by a
+    callback are logged without interrupting the request.  When no hooks are registered,
+    no events are built.
+
+    ```python
+    ignition.add_hook(ignition.HOOK_ON_COMPLETE, lambda event: histogram.observe(event.timings.total()))
+    ```
+
+    Parameters:
+    * event: `string`
+    * callback: `Callable[[ignition.hooks.HookEvent], None]`
+    """
+    __hooks.add(event, callback)
+
+
+def remove_hook(event, callback):
+    """
+    Unregister a *callback* registered with `ignition.add_hook()`.
+
+    Parameters:
+    * event: `string`
+    * callback: `Callable[[ignition.hooks.HookEvent], None]`
+    """
+    __hooks.remove(event, callback)
+
+
+def set_host_limits(
+    requests_per_second=None,
+    burst=1,
+    max_in_flight=None,
+    max_pause=DEFAULT_SLOW_DOWN_MAX_PAUSE,
+):
+    """
+    Set politeness limits per capsule (host:port), shared by every request made via
+    ignition, including `ignition.request_many()` and `ignition.download()`.
+
+    At most *requests_per_second* requests (with bursts of up to *burst* requests) are
+    started against each host, and at most *max_in_flight* requests to a host run at the
+    same time.  A request over either limit waits until it may be sent; the wait is not
+    part of the request timeout.  Both limits are disabled by default.  A streamed request
+    (including a download) holds its slot until its body stream is closed.
+
+    Whatever the limits, a `44 SLOW DOWN` response pauses further requests to its host for
+    the number of seconds in the response meta, up to *max_pause* seconds.  The pause is
+    not part of the *timeout* or *total_timeout* of the waiting requests either, so a
+    request may wait up to *max_pause* seconds before its own deadline starts.
+
+    Parameters:
+    * requests_per_second: `float` (optional)
+    * burst: `int` (optional)
+    * max_in_flight: `int` (optional)
+    * max_pause: `float` (optional)
+    """
+    __scheduler.set_limits(
+        rate=requests_per_second,
+        burst=burst,
+        max_in_flight=max_in_flight,
+        max_pause=max_pause,
+    )
+
+
+def pre_resolve(request_urls):
+    """
+    Resolves the hosts of an iterable of *urls* into the DNS cache used by requests
+    made with `cache_dns=True`, so that those requests skip the resolver round trip.
+    Hosts are resolved sequentially.
+
+    Returns a dictionary of each host (as `host`, or `host:port` for a non-default port)
+    to whether it resolved.
+
+    Parameters:
+    * urls: `Iterable[string]`
+
+    Returns: `Dict[string, bool]`
+    """
+    netlocs = {}
+    for request_url in request_urls:
+        parsed_url = URL(request_url)
+        netlocs[parsed_url.netloc()] = (parsed_url.host(), parsed_url.port())
+
+    resolved = __dns_cache.pre_resolve(netlocs.values())
+    return {netloc: resolved[address] for netloc, address in netlocs.items()}
+
+
+def get_dns_cache_stats():
+    """
+    Returns counters for the DNS cache used by requests made with `cache_dns=True`,
+    as a dictionary with the keys:
+    * hits: `int`, lookups answered from the cache (including cached failures)
+    * misses: `int`, lookups that went to the system resolver
+    * size: `int`, number of hosts in the cache
+
+    Returns: `dict`
+    """
+    return __dns_cache.stats()
+
+
+def get_redirect_cache_stats():
+    """
+    Returns counters for the cache of permanent redirects used by requests made with
+    `follow_redirects`, as a dictionary with the keys:
+    * hits: `int`, requests sent straight to the new location of a moved url
+    * misses: `int`, requests for urls not known to have moved
+    * size: `int`, number of moved urls in the cache
+
+    Returns: `dict`
+    """
+    return __redirect_cache.stats()
+
+
+def get_response_cache_stats():
+    """
+    Returns counters for the response cache used by requests made with `use_cache=True`,
+    as a dictionary with the keys:
+    * hits: `int`, requests answered from the cache
+    * misses: `int`, requests sent to the server
+    * size: `int`, number of stored responses
+    * bytes: `int`, size of the stored responses
+
+    Returns: `dict`
+    """
+    return __response_cache.stats()
+
+
+def get_tls_session_stats():
+    """
+    Returns counters for TLS session resumption on requests made with
+    `reuse_tls_session=True`, as a dictionary with the keys:
+    * hits: `int`, handshakes that resumed a stored session
+    * misses: `int`, handshakes that required a full negotiation
+    * size: `int`, number of hosts with a stored session
+
+    Returns: `dict`
+    """
+    return __ssl_session_cache.stats()
 
 
 def url(request_url, referer=None):
@@ -103,7 +369,21 @@ def url(request_url, referer=None):
     return dummy_req.get_url()
 
 
-def request(request_url, referer=None, timeout=None, raise_errors=False, ca_cert=None):
+def request(
+    request_url,
+    referer=None,
+    timeout=None,
+    raise_errors=False,
+    ca_cert=None,
+    reuse_tls_session=False,
+    stream=False,
+    max_body_bytes=None,
+    total_timeout=None,
+    hooks=None,
+    cache_dns=False,
+    follow_redirects=0,
+    use_cache=False,
+):
     """
     Given a *url* to a Gemini capsule, this performs a request to the specified
     url and returns a response (as a subclass of [ignition.BaseResponse](#ignitionbaseresponse))
@@ -126,9 +406,73 @@ def request(request_url, referer=None, timeout=None, raise_errors=False, ca_cert
     for this request.  The default is 30 seconds.  See also `ignition.set_default_timeout`
     to change the default timeout.
 
+    If a *total_timeout* is provided, this will specify a deadline (in seconds) for the whole
+    request, from connecting until the body has been read.  This overrides the default set
+    with `ignition.set_default_timeout`.  For a streamed response, the deadline also bounds
+    reading the body from the stream.  Time spent waiting on the limits set with
+    `ignition.set_host_limits()`, including a `44 SLOW DOWN` pause of up to *max_pause*
+    seconds, is not part of either timeout.
+
+    If *hooks* are provided (as a dict of event name to callback, or list of callbacks), they
+    are called for this request in addition to the hooks registered with `ignition.add_hook()`.
+
+    If *cache_dns* is `True`, the addresses of the capsule host are looked up in an in-process
+    cache before asking the system resolver.  Resolved hosts are kept for 5 minutes, and
+    unknown hosts for 30 seconds, in a bounded, least-recently-used store.  Other lookup
+    failures, such as a resolver timeout, are not cached.  See `ignition.pre_resolve()` to
+    fill the cache ahead of a crawl, and `ignition.get_dns_cache_stats()` to check the
+    hit rate.
+
+    If *follow_redirects* is greater than 0, up to that many redirect (3x) responses are
+    followed, and the response from the final url is returned.  Redirect targets are resolved
+    relative to the redirecting url, and only Gemini urls are followed.  A redirect back to a
+    url already visited, or to a malformed url, returns an
+    [ignition.ErrorResponse](#ignitionerrorresponse) with status
+    `ignition.RESPONSE_STATUSDETAIL_ERROR_PROTOCOL`.  Permanent redirects (31) are remembered
+    in-process, so that later requests for a moved url (that follow redirects) go straight to
+    its new location.  See `ignition.get_redirect_cache_stats()` to check the hit rate.  With
+    a *ca_cert*, redirects to another host are returned as is rather than followed, so that the
+    client certificate is never sent to a host it was not meant for, and the remembered
+    permanent redirects are neither used nor updated.
+
+    If *use_cache* is `True`, the response is served from the on-disk response cache when
+    the same url was requested (with `use_cache=True`) before, without touching the network.
+    Otherwise the request is sent, and its response stored if its status is cacheable.  Cached
+    responses keep the server certificate, but are not validated against the hosts file
+    again.  Streamed requests, and requests made with a *ca_cert* (whose responses may be
+    private to that client certificate), never use the cache.  A cached body larger than
+    *max_body_bytes* is answered with the same error as a live response would be.  See
+    `ignition.set_default_response_cache()` to configure the cache, and
+    `ignition.get_response_cache_stats()` to check the hit rate.
+
     If a *ca_cert* is provided, the certificate will be sent to the server as a CA CERT.
     You will need to provide the paths to both the certificate and the key in this case.
 
+    If *reuse_tls_session* is `True`, the TLS session negotiated with a capsule is stored
+    and offered again on the next request to the same host, so that the handshake can be
+    resumed instead of fully renegotiated.  Sessions are held in a bounded, least-recently-used
+    store and expire after an hour.  See `ignition.get_tls_session_stats()` to check the hit rate.
+
+    If *stream* is `True`, the body of a success response is not read into memory before the
+    response is returned.  Instead, the connection stays open and the body can be read
+    incrementally through `response.iter_content()` or `response.stream`.  The connection is
+    closed once the body has been read to the end, or by calling `response.close()` (responses
+    can also be used as a context manager).  Accessing `response.raw_body` or `response.data()`
+    on a streamed response reads the remaining body into memory.
+
+    If *max_body_bytes* is provided, reading stops as soon as the response body grows past
+    this many bytes, and an [ignition.ErrorResponse](#ignitionerrorresponse) with status
+    `ignition.RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE` is returned instead.  (For a
+    streamed response, reading past the limit raises `ignition.exceptions.ResponseBodyTooLarge`.)
+    Response header lines longer than the Gemini specification allows are always rejected
+    with `ignition.RESPONSE_STATUSDETAIL_ERROR_PROTOCOL`, without reading the rest of the line.
+
+    ```python
+    with ignition.request('//geminiprotocol.net/large-file.zip', stream=True) as response:
+        for chunk in response.iter_content(65536):
+            handle(chunk)
+    ```
+
     Depending on the response from the server, as per Gemini specification, the
     corresponding response type will be returned.
 
@@ -155,6 +499,197 @@ def request(request_url, referer=None, timeout=None, raise_errors=False, ca_cert
     * timeout: `float` (optional)
     * raise_errors: `bool` (optional)
     * ca_cert: `Tuple(cert_file, key_file)` (optional)
+    * reuse_tls_session: `bool` (optional)
+    * stream: `bool` (optional)
+    * max_body_bytes: `int` (optional)
+    * total_timeout: `float` (optional)
+    * hooks: `Dict[string, Callable]` (optional)
+    * cache_dns: `bool` (optional)
+    * follow_redirects: `int` (optional)
+    * use_cache: `bool` (optional)
+
+    Returns: `[ignition.BaseResponse](#ignitionbaseresponse)`
+    """
+
+    def create_request(request_url, referer=None):
+        return Request(
+            request_url,
+            cert_store=__cert_store,
+            request_timeout=__timeout.get_timeout(timeout),
+            referer=referer,
+            ca_cert=ca_cert,
+            raise_errors=raise_errors,
+            ssl_context_cache=__ssl_context_cache,
+            ssl_session_cache=__ssl_session_cache if reuse_tls_session else None,
+            stream=stream,
+            max_body_bytes=max_body_bytes,
+            timeout_budget=__timeout.get_budget(timeout, total_timeout),
+            hooks=__hooks.merged(hooks),
+            dns_cache=__dns_cache if cache_dns else None,
+            connector=__connector,
+            scheduler=__scheduler,
+            response_cache=__response_cache if use_cache else None,
+        )
+
+    if follow_redirects:
+        # A client certificate is only ever presented to the host it was passed for
+        follower = RedirectFollower(
+            create_request,
+            follow_redirects,
+            __redirect_cache if ca_cert is None else None,
+            same_host_only=ca_cert is not None,
+        )
+        return follower.send(str(URL(request_url, referer_url=referer)))
+    return create_request(request_url, referer=referer).send()
+
+
+def request_many(
+    request_urls,
+    concurrency=DEFAULT_BATCH_CONCURRENCY,
+    per_host_concurrency=DEFAULT_BATCH_PER_HOST_CONCURRENCY,
+    ordered=False,
+    referer=None,
+    timeout=None,
+    raise_errors=False,
+    ca_cert=None,
+    reuse_tls_session=False,
+    max_body_bytes=None,
+    total_timeout=None,
+    hooks=None,
+    cache_dns=False,
+):
+    """
+    Given an iterable of *urls* to Gemini capsules, this performs the requests
+    concurrently on a managed thread pool and yields a response (as a subclass of
+    [ignition.BaseResponse](#ignitionbaseresponse)) for each one.  Use `response.url`
+    to match a response back to its request.
+
+    At most *concurrency* requests are in flight at once, and at most
+    *per_host_concurrency* of them target the same host (set to `None` to remove the
+    per-host limit).  Urls are consumed lazily, so *urls* may be a generator.
+
+    Responses are yielded as soon as they complete.  If *ordered* is `True`,
+    responses are yielded in the same order as the passed *urls* instead; while an
+    earlier request is still running, at most a few times *concurrency* later responses
+    are buffered before new urls stop being started.
+
+    *referer*, *timeout*, *raise_errors*, *ca_cert*, *reuse_tls_session*, *max_body_bytes*,
+    *total_timeout*, *hooks* and *cache_dns* apply to every request and behave as in
+    `ignition.request()`.  If *raise_errors* is `True`, the first error raised by any
+    request stops iteration.
+
+    ```python
+    for response in ignition.request_many(urls, concurrency=32):
+        print(response.url, response.status)
+    ```
+
+    Parameters:
+    * urls: `Iterable[string]`
+    * concurrency: `int` (optional)
+    * per_host_concurrency: `int` (optional)
+    * ordered: `bool` (optional)
+    * referer: `string` (optional)
+    * timeout: `float` (optional)
+    * raise_errors: `bool` (optional)
+    * ca_cert: `Tuple(cert_file, key_file)` (optional)
+    * reuse_tls_session: `bool` (optional)
+    * max_body_bytes: `int` (optional)
+    * total_timeout: `float` (optional)
+    * hooks: `Dict[string, Callable]` (optional)
+    * cache_dns: `bool` (optional)
+
+    Returns: `Iterator[ignition.BaseResponse]`
+    """
+
+    request_timeout = __timeout.get_timeout(timeout)
+    timeout_budget = __timeout.get_budget(timeout, total_timeout)
+    request_hooks = __hooks.merged(hooks)
+
+    def create_request(request_url):
+        return Request(
+            request_url,
+            cert_store=__cert_store,
+            request_timeout=request_timeout,
+            referer=referer,
+            ca_cert=ca_cert,
+            raise_errors=raise_errors,
+            ssl_context_cache=__ssl_context_cache,
+            ssl_session_cache=__ssl_session_cache if reuse_tls_session else None,
+            max_body_bytes=max_body_bytes,
+            timeout_budget=timeout_budget,
+            hooks=request_hooks,
+            dns_cache=__dns_cache if cache_dns else None,
+            connector=__connector,
+            scheduler=__scheduler,
+        )
+
+    batch = BatchRequest(
+        create_request,
+        concurrency=concurrency,
+        per_host_concurrency=per_host_concurrency,
+        ordered=ordered,
+    )
+    return batch.run(request_urls)
+
+
+def download(
+    request_url,
+    path_or_fileobj,
+    referer=None,
+    timeout=None,
+    raise_errors=False,
+    ca_cert=None,
+    reuse_tls_session=False,
+    max_body_bytes=None,
+    total_timeout=None,
+    hooks=None,
+    cache_dns=False,
+    chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+    digest_algorithm=DEFAULT_DOWNLOAD_DIGEST,
+):
+    """
+    Given a *url* to a Gemini capsule, this performs a request and writes the body of a
+    success response to *path_or_fileobj* instead of holding it in memory.  The body is
+    copied in chunks of *chunk_size* bytes through a single reused buffer, so memory use
+    does not grow with the size of the download.
+
+    If *path_or_fileobj* is a path, the body is written to a temporary file in the same
+    directory, which replaces the destination only once the download is complete.  The file
+    keeps the permissions of the destination it replaces, or gets the default permissions
+    for the current umask.  If it is a file object opened in binary mode, the body is
+    written to it as it is received.
+
+    On success, this returns an [ignition.DownloadResponse](#ignitiondownloadresponse)
+    with the response header, the number of bytes written (`size`) and a hex digest of the
+    body (`digest`, computed with the hashlib *digest_algorithm*).  Any other response is
+    returned as it would be by `ignition.request()`, and nothing is written.
+
+    *referer*, *timeout*, *raise_errors*, *ca_cert*, *reuse_tls_session*, *max_body_bytes*,
+    *total_timeout*, *hooks* and *cache_dns* behave as in `ignition.request()`.  The
+    `on_complete` hook is called once the response header is received, before the body is
+    written.  A download that exceeds *max_body_bytes* returns an
+    [ignition.ErrorResponse](#ignitionerrorresponse) and leaves the destination path untouched.
+
+    ```python
+    response = ignition.download('//geminiprotocol.net/large-file.zip', 'large-file.zip')
+    if response.success():
+        print(response.size, response.digest)
+    ```
+
+    Parameters:
+    * url: `string`
+    * path_or_fileobj: `string` or binary file object
+    * referer: `string` (optional)
+    * timeout: `float` (optional)
+    * raise_errors: `bool` (optional)
+    * ca_cert: `Tuple(cert_file, key_file)` (optional)
+    * reuse_tls_session: `bool` (optional)
+    * max_body_bytes: `int` (optional)
+    * total_timeout: `float` (optional)
+    * hooks: `Dict[string, Callable]` (optional)
+    * cache_dns: `bool` (optional)
+    * chunk_size: `int` (optional)
+    * digest_algorithm: `string` (optional)
 
     Returns: `[ignition.BaseResponse](#ignitionbaseresponse)`
     """
@@ -166,23 +701,66 @@ def request(request_url, referer=None, timeout=None, raise_errors=False, ca_cert
         referer=referer,
         ca_cert=ca_cert,
         raise_errors=raise_errors,
+        ssl_context_cache=__ssl_context_cache,
+        ssl_session_cache=__ssl_session_cache if reuse_tls_session else None,
+        stream=True,
+        max_body_bytes=max_body_bytes,
+        timeout_budget=__timeout.get_budget(timeout, total_timeout),
+        hooks=__hooks.merged(hooks),
+        dns_cache=__dns_cache if cache_dns else None,
+        connector=__connector,
+        scheduler=__scheduler,
     )
 
-    return req.send()
+    return Download(
+        req,
+        path_or_fileobj,
+        chunk_size=chunk_size,
+        digest_algorithm=digest_algorithm,
+        raise_errors=raise_errors,
+    ).send()
 
 
 __all__ = [
     "set_default_hosts_file",
     "set_default_timeout",
+    "set_default_response_cache",
     "url",
     "request",
+    "request_many",
+    "download",
+    "add_hook",
+    "remove_hook",
+    "set_host_limits",
+    "pre_resolve",
+    "get_dns_cache_stats",
+    "get_redirect_cache_stats",
+    "get_response_cache_stats",
+    "get_tls_session_stats",
     "ClientCertRequiredResponse",
+    "DownloadResponse",
     "ErrorResponse",
     "InputResponse",
     "PermFailureResponse",
     "RedirectResponse",
     "SuccessResponse",
     "TempFailureResponse",
+    "HOOK_ON_CONNECT",
+    "HOOK_ON_HANDSHAKE",
+    "HOOK_ON_TOFU_RESULT",
+    "HOOK_ON_HEADER",
+    "HOOK_ON_COMPLETE",
+    "TOFU_RESULT_TRUSTED",
+    "TOFU_RESULT_ADDED",
+    "TOFU_RESULT_UPDATED",
+    "TOFU_RESULT_REJECTED",
+    "TOFU_RESULT_EXPIRED",
+    "CERT_STORE_MODE_DEFAULT",
+    "CERT_STORE_MODE_INDEXED",
+    "CERT_STORE_MODE_JOURNAL",
+    "CERT_STORE_MODE_SQLITE",
+    "FINGERPRINT_MODE_OPENSSH",
+    "FINGERPRINT_MODE_SHA256",
     "RESPONSE_STATUS_ERROR",
     "RESPONSE_STATUS_INPUT",
     "RESPONSE_STATUS_SUCCESS",
@@ -195,6 +773,7 @@ __all__ = [
     "RESPONSE_STATUSDETAIL_ERROR_HOST",
     "RESPONSE_STATUSDETAIL_ERROR_TLS",
     "RESPONSE_STATUSDETAIL_ERROR_PROTOCOL",
+    "RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE",
     "RESPONSE_STATUSDETAIL_INPUT",
     "RESPONSE_STATUSDETAIL_INPUT_SENSITIVE",
     "RESPONSE_STATUSDETAIL_SUCCESS",
@@ -0,0 +1,477 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import logging
+import re
+import ssl
+from socket import gaierror as SocketGaiErrorException
+from socket import herror as SocketHErrorException
+from socket import timeout as SocketTimeoutException
+
+from . import defaults
+from .exceptions import (
+    GeminiResponseParseError,
+    RemoteCertificateExpired,
+    TofuCertificateRejection,
+)
+from .globals import (
+    CRLF,
+    GEMINI_DEFAULT_ENCODING,
+    GEMINI_RESPONSE_HEADER_MAXLENGTH,
+    GEMINI_RESPONSE_HEADER_META_MAXLENGTH,
+    GEMINI_RESPONSE_HEADER_SEPARATOR,
+    RESPONSE_STATUSDETAIL_ERROR_DNS,
+    RESPONSE_STATUSDETAIL_ERROR_HOST,
+    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+    RESPONSE_STATUSDETAIL_ERROR_TLS,
+)
+from .response import BaseResponse, ResponseFactory
+from .ssl.cert_wrapper import CertWrapper
+from .ssl.context_cache import create_ssl_context
+from .url import URL
+from .util import TimeoutBudget
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 65536
+
+
+class AsyncRequest:
+    """
+    Handles a single request to a Gemini Server on an asyncio event loop.
+
+    This has the same responsibilities as `ignition.request.Request`, but the
+    connection, TLS handshake, and response transport are driven by asyncio
+    streams so that a single thread can keep many requests in flight.
+    The request timeout applies to each network operation, as it does for
+    the blocking socket in `Request`, and every operation is capped by the
+    total deadline of the timeout budget, if it has one.
+
+    TOFU validation takes a lock and may read & write the hosts file, so it
+    runs in the loop's default executor rather than on the event loop.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        raise_errors=False,
+        referer=None,
+        request_timeout=None,
+        cert_store=None,
+        ca_cert=None,
+        ssl_context_cache=None,
+        max_body_bytes=None,
+        timeout_budget: TimeoutBudget = None,
+    ):
+        """
+        Initializes AsyncRequest with a url, referer, and timeout
+        """
+
+        self.__url = URL(url, referer_url=referer)
+        self.__raise_errors = raise_errors
+        self.__timeout_budget = timeout_budget or TimeoutBudget(request_timeout)
+        self.__deadline = None
+        self.__cert_store = cert_store
+        self.__ca_cert = ca_cert  # This should be a tuple
+        self.__ssl_context_cache = ssl_context_cache
+        self.__max_body_bytes = max_body_bytes
+
+    def get_url(self):
+        """
+        Fetch the generated URL for the request (based on referer, if present)
+        """
+
+        return str(self.__url)
+
+    def get_netloc(self):
+        """
+        Fetch the host:port the request will be sent to
+        """
+
+        return self.__url.netloc()
+
+    async def send(self):
+        """
+        Performs network communication and returns a Response object
+        """
+
+        self.__deadline = self.__timeout_budget.start()
+
+        logger.debug(f"Attempting to open a secure connection to {self.__url.netloc()}")
+        connection_result = await self.__open_connection()
+        if isinstance(connection_result, BaseResponse):
+            return connection_result
+
+        reader, writer = connection_result
+        try:
+            logger.debug(f"Validating server certificate to {self.__url.netloc()}")
+            ssl_certificate_result = await self.__validate_ssl_certificate(writer)
+            if isinstance(ssl_certificate_result, BaseResponse):
+                return ssl_certificate_result
+
+            logger.debug(f"Sending request header: {self.__url}")
+            transport_result = await self.__transport_payload(
+                reader, writer, self.__url
+            )
+            if isinstance(transport_result, BaseResponse):
+                return transport_result
+        finally:
+            writer.close()
+
+        header, raw_body = transport_result
+        logger.debug(
+            f"Received response header: [{header}] and payload of length {len(raw_body)} bytes"
+        )
+        return self.__handle_response(
+            header, raw_body, ssl_certificate_result.certificate
+        )
+
+    async def __open_connection(self):
+        """
+        Opens the connection & negotiates the SSL handshake, and manages exceptions.
+        asyncio completes both steps in a single call.
+        """
+
+        try:
+            context = self.__get_ssl_context()
+            connect_timeout = self.__deadline.connect()
+            handshake_timeout = self.__deadline.handshake()
+            timeout = None
+            if connect_timeout is not None and handshake_timeout is not None:
+                timeout = connect_timeout + handshake_timeout
+                remaining = self.__deadline.remaining()
+                if remaining is not None:
+                    timeout = min(timeout, remaining)
+
+            return await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.__url.host(),
+                    self.__url.port(),
+                    ssl=context,
+                    server_hostname=self.__url.host(),
+                    ssl_handshake_timeout=handshake_timeout,
+                ),
+                timeout,
+            )
+        except ConnectionRefusedError as err:
+            logger.debug(
+                f"ConnectionRefusedError: Connection to {self.__url.netloc()} was refused. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Connection refused"
+            )
+        except ConnectionResetError as err:
+            logger.debug(
+                f"ConnectionResetError: Connection to {self.__url.netloc()} was reset. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Connection reset"
+            )
+        except SocketHErrorException as err:
+            logger.debug(
+                f"socket.herror: socket.gethostbyaddr returned for {self.__url.host()}. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Host error"
+            )
+        except SocketGaiErrorException as err:
+            logger.debug(
+                f"socket.gaierror: socket.getaddrinfo returned unknown host for {self.__url.host()}. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_DNS, "Unknown host"
+            )
+        except ssl.SSLZeroReturnError as err:
+            logger.debug(f"ssl.SSLZeroReturnError for {self.__url.host()} - {err}")
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_TLS, "SSL Zero Return Error"
+            )
+        except ssl.SSLEOFError as err:
+            logger.debug(f"ssl.SSLEOFError for {self.__url.host()} - {err}")
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_TLS, "SSL EOF Error"
+            )
+        except ssl.SSLCertVerificationError as err:
+            logger.debug(
+                f"ssl.SSLCertVerificationError for {self.__url.host()} - {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url,
+                RESPONSE_STATUSDETAIL_ERROR_TLS,
+                "SSL Certificate Verification Error",
+            )
+        except ssl.SSLError as err:
+            logger.debug(f"ssl.SSLError for {self.__url.host()} - {err}")
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_TLS, "SSL Error"
+            )
+        except (
+            asyncio.TimeoutError,
+            SocketTimeoutException,
+            ConnectionAbortedError,
+        ) as err:
+            logger.debug(
+                f"asyncio.TimeoutError: timed out connecting to {self.__url.host()}. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Socket timeout"
+            )
+        except Exception as err:
+            logger.error(
+                f"Unknown exception encountered when connecting to {self.__url.netloc()} - {err}"
+            )
+            raise err
+
+    async def __validate_ssl_certificate(self, writer) -> CertWrapper:
+        """
+        Trust-on-first-use (TOFU) validation on SSL certificate or throws exception
+        The cert store is called in the default executor, so its file access never blocks the event loop.
+        """
+
+        try:
+            ssl_object = writer.get_extra_info("ssl_object")
+            certificate_wrapper = CertWrapper.parse(ssl_object.getpeercert(True))
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.__cert_store.validate_tofu_or_add,
+                ssl_object.server_hostname,
+                certificate_wrapper,
+            )
+            return certificate_wrapper
+        except ValueError as err:
+            logger.debug(f"ValueError: {self.__url.netloc()}. {err}")
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_TLS, err
+            )
+        except RemoteCertificateExpired as err:
+            logger.debug(
+                f"RemoteCertificateExpired: {self.__url.netloc()} has an expired certificate. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_TLS, "Certificate expired"
+            )
+        except TofuCertificateRejection as err:
+            logger.debug(
+                f"TofuCertificateRejection: {self.__url.netloc()} has an untrusted, unknown certificate. {err}"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                self.__url,
+                RESPONSE_STATUSDETAIL_ERROR_TLS,
+                "Untrusted certificate (TOFU rejection)",
+            )
+        except Exception as err:
+            logger.error(
+                f"Unknown exception encountered when validating ssl certificate on {self.__url.netloc()} - {err}"
+            )
+            raise err
+
+    def is_using_ca_cert(self):
+        """
+        Returns if the request is using ca_cert
+        """
+        return self.__ca_cert is not None
+
+    def __get_ssl_context(self):
+        """
+        Fetch a prepared SSL context from the context cache, or setup a new one
+        """
+        if self.__ssl_context_cache is not None:
+            return self.__ssl_context_cache.get_context(self.__ca_cert)
+        return create_ssl_context(self.__ca_cert)
+
+    async def __transport_payload(self, reader, writer, payload):
+        """
+        Handles Gemini protocol negotiation over the stream
+        The body is read in chunks so that the timeout applies per read, not to the full body,
+        and every read is capped by the time left until the request deadline.
+        """
+
+        try:
+            writer.write((f"{payload}{CRLF}").encode(GEMINI_DEFAULT_ENCODING))
+            await asyncio.wait_for(writer.drain(), self.__deadline.first_byte())
+
+            header = await asyncio.wait_for(
+                self.__read_header(reader), self.__deadline.first_byte()
+            )
+            if header is None:
+                return ResponseFactory.create(
+                    self.__url,
+                    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+                    "Header line is too long",
+                )
+
+            chunks = []
+            body_length = 0
+            while True:
+                chunk = await asyncio.wait_for(
+                    reader.read(READ_CHUNK_SIZE), self.__deadline.read()
+                )
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                body_length += len(chunk)
+                if (
+                    self.__max_body_bytes is not None
+                    and body_length > self.__max_body_bytes
+                ):
+                    logger.debug(
+                        f"Response body from {self.__url.netloc()} exceeds {self.__max_body_bytes} bytes"
+                    )
+                    return ResponseFactory.create(
+                        self.__url,
+                        RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+                        f"Response body exceeds the maximum of {self.__max_body_bytes} bytes",
+                    )
+
+            return header.decode(GEMINI_DEFAULT_ENCODING).strip(), b"".join(chunks)
+        except (asyncio.TimeoutError, SocketTimeoutException):
+            logger.debug(
+                f"asyncio.TimeoutError: timed out reading from {self.__url.host()}"
+            )
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Socket timeout"
+            )
+        except Exception as err:
+            logger.error(
+                f"Unknown exception encountered when transporting data to {self.__url.netloc()} - {err}"
+            )
+            raise err
+
+    async def __read_header(self, reader):
+        """
+        Reads the response header line, or returns None if it is longer than a Gemini header can be
+        """
+        try:
+            header = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as err:
+            header = err.partial
+        except asyncio.LimitOverrunError:
+            return None
+
+        if len(header) > GEMINI_RESPONSE_HEADER_MAXLENGTH:
+            return None
+        return header
+
+    def __handle_response(self, header, raw_body, certificate):
+        """
+        Handles basic response data from the remote server and hands off to the Response object
+        """
+        try:
+            status, meta = re.split(
+                GEMINI_RESPONSE_HEADER_SEPARATOR, header, maxsplit=1
+            )
+
+            if not re.match(r"^\d{2}$", status):
+                raise GeminiResponseParseError(
+                    "Response status is not a two-digit code"
+                )
+
+            if len(meta) > GEMINI_RESPONSE_HEADER_META_MAXLENGTH:
+                raise GeminiResponseParseError("Header meta text is too long")
+
+            return ResponseFactory.create(
+                self.__url, status, meta.strip(), raw_body, certificate
+            )
+        except GeminiResponseParseError as err:
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_PROTOCOL, err
+            )
+
+
+async def request(
+    request_url,
+    referer=None,
+    timeout=None,
+    raise_errors=False,
+    ca_cert=None,
+    max_body_bytes=None,
+    total_timeout=None,
+):
+    """
+    Coroutine version of `ignition.request()`.
+
+    Given a *url* to a Gemini capsule, this performs a request to the specified
+    url on the running asyncio event loop and returns a response (as a subclass of
+    [ignition.BaseResponse](#ignitionbaseresponse)).  The arguments it supports
+    (*referer*, *timeout*, *raise_errors*, *ca_cert*, *max_body_bytes* and
+    *total_timeout*) and the response types behave as in `ignition.request()`,
+    and the default timeouts and hosts file set via `ignition.set_default_timeout()`
+    and `ignition.set_default_hosts_file()` are shared.  Streaming, hooks, DNS and
+    response caching, host limits and redirect following are not supported.
+
+    Set a *total_timeout* (or a default one) to bound the whole request: otherwise
+    a server that drips its body slowly is only limited by the timeout per read.
+
+    ```python
+    import asyncio
+    import ignition.aio
+
+    async def main():
+        responses = await asyncio.gather(
+            ignition.aio.request('//geminiprotocol.net'),
+            ignition.aio.request('//gus.guru'),
+        )
+
+    asyncio.run(main())
+    ```
+
+    Parameters:
+    * url: `string`
+    * referer: `string` (optional)
+    * timeout: `float` (optional)
+    * raise_errors: `bool` (optional)
+    * ca_cert: `Tuple(cert_file, key_file)` (optional)
+    * max_body_bytes: `int` (optional)
+    * total_timeout: `float` (optional)
+
+    Returns: `[ignition.BaseResponse](#ignitionbaseresponse)`
+    """
+
+    req = AsyncRequest(
+        request_url,
+        cert_store=defaults.cert_store,
+        request_timeout=defaults.timeout_manager.get_timeout(timeout),
+        timeout_budget=defaults.timeout_manager.get_budget(timeout, total_timeout),
+        referer=referer,
+        ca_cert=ca_cert,
+        raise_errors=raise_errors,
+        ssl_context_cache=defaults.ssl_context_cache,
+        max_body_bytes=max_body_bytes,
+    )
+
+    return await req.send()
+
+
+__all__ = [
+    "request",
+]
@@ -0,0 +1,145 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+from collections import deque
+
+from .globals import DEFAULT_BATCH_ORDERED_WINDOW_FACTOR
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRequest:
+    """
+    Runs many requests concurrently on a bounded thread pool.
+
+    Requests are created lazily from the input urls via `request_factory`,
+    so that at most `concurrency` requests are in flight at any time and
+    at most `per_host_concurrency` of those target the same host.
+    Requests for a host that is at capacity are held back (without
+    occupying a worker) until a slot for that host frees up.
+
+    In ordered mode, finished responses are buffered until every earlier
+    response has been yielded.  Once that buffer holds a window of
+    `DEFAULT_BATCH_ORDERED_WINDOW_FACTOR` times `concurrency` responses,
+    no new urls are pulled until the oldest pending request completes.
+    """
+
+    def __init__(
+        self,
+        request_factory,
+        concurrency: int,
+        per_host_concurrency=None,
+        ordered=False,
+    ):
+        """
+        Initializes the batch with a factory that turns a url into a Request,
+        the overall and per-host concurrency limits, and result ordering
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if per_host_concurrency is not None and per_host_concurrency < 1:
+            raise ValueError("per_host_concurrency must be at least 1")
+
+        self.__request_factory = request_factory
+        self.__concurrency = concurrency
+        self.__per_host_concurrency = per_host_concurrency
+        self.__ordered = ordered
+        self.__ordered_window = concurrency * DEFAULT_BATCH_ORDERED_WINDOW_FACTOR
+
+    def run(self, request_urls):
+        """
+        Generator yielding a response for each of the passed urls.
+        Responses are yielded as they complete, or in input order if the
+        batch is ordered.
+        """
+        from concurrent.futures import (  # pylint:disable=import-outside-toplevel
+            ThreadPoolExecutor,
+        )
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.__concurrency, thread_name_prefix="ignition"
+        )
+        try:
+            yield from self.__dispatch(executor, enumerate(request_urls))
+        finally:
+            # Only running requests are ever submitted, so nothing is queued
+            executor.shutdown(wait=False)
+
+    def __dispatch(self, executor, indexed_urls):
+        """
+        Keeps the pool filled from the input and collects finished requests
+        """
+        from concurrent.futures import (  # pylint:disable=import-outside-toplevel
+            FIRST_COMPLETED,
+            wait,
+        )
+
+        in_flight = {}
+        host_counts = {}
+        deferred = deque()
+        completed = {}
+        next_index = 0
+        exhausted = False
+
+        while True:
+            while len(in_flight) < self.__concurrency:
+                item = self.__next_deferred(deferred, host_counts)
+                if item is None:
+                    if exhausted or len(deferred) >= self.__concurrency:
+                        break
+                    # Stalled head in ordered mode: don't let the buffer grow
+                    if len(completed) >= self.__ordered_window:
+                        break
+                    try:
+                        index, request_url = next(indexed_urls)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    request = self.__request_factory(request_url)
+                    item = (index, request, request.get_netloc())
+                    if not self.__has_capacity(item[2], host_counts):
+                        deferred.append(item)
+                        continue
+
+                index, request, host = item
+                host_counts[host] = host_counts.get(host, 0) + 1
+                in_flight[executor.submit(request.send)] = (index, host)
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, host = in_flight.pop(future)
+                host_counts[host] -= 1
+                if self.__ordered:
+                    completed[index] = future.result()
+                else:
+                    yield future.result()
+
+            while next_index in completed:
+                yield completed.pop(next_index)
+                next_index += 1
+
+    def __next_deferred(self, deferred, host_counts):
+        """
+        Pops the first held-back request whose host has a free slot
+        """
+        for item in deferred:
+            if self.__has_capacity(item[2], host_counts):
+                deferred.remove(item)
+                return item
+        return None
+
+    def __has_capacity(self, host, host_counts):
+        """
+        Returns true if another request may be started against the host
+        """
+        if self.__per_host_concurrency is None:
+            return True
+        return host_counts.get(host, 0) < self.__per_host_concurrency
@@ -0,0 +1,166 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import errno
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from socket import timeout as SocketTimeoutException
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS_ERRORS = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN)
+
+
+class HappyEyeballsConnector:
+    """
+    Dual-stack connection strategy in the style of Happy Eyeballs (RFC 8305).
+
+    Resolved addresses are interleaved by address family, and connection attempts
+    are started `delay` seconds apart without waiting for earlier attempts to fail,
+    so a broken IPv6 (or IPv4) route costs at most `delay` instead of the full
+    timeout.  The first attempt to connect wins and the others are closed.
+
+    The address family that connected is remembered per host (for up to `max_hosts`
+    hosts, least-recently-used), and tried first on later connections to that host.
+    """
+
+    def __init__(self, delay: float, max_hosts: int):
+        """
+        Initializes the connector with the delay between attempts (seconds) and the number of hosts to remember
+        """
+        self.__delay = delay
+        self.__max_hosts = max_hosts
+        self.__families = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def connect(self, host: str, addresses, timeout=None) -> socket.socket:
+        """
+        Connects to one of the `socket.getaddrinfo` *addresses* of the host, racing the attempts.
+        Raises socket.timeout if no attempt connects within *timeout*, or the last connection error.
+        """
+        addresses = self.__sort_addresses(addresses, self.get_family(host))
+
+        if len(addresses) == 1:
+            # Nothing to race
+            family, socktype, proto, _, address = addresses[0]
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(address)
+            except BaseException:
+                sock.close()
+                raise
+        else:
+            sock = self.__race(addresses, timeout)
+
+        self.__set_family(host, sock.family)
+        return sock
+
+    def get_family(self, host: str):
+        """
+        Returns the address family that last connected to the host, or None
+        """
+        with self.__lock:
+            return self.__families.get(host)
+
+    def clear(self):
+        """
+        Forgets the address families of all hosts
+        """
+        with self.__lock:
+            self.__families.clear()
+
+    def __set_family(self, host, family):
+        with self.__lock:
+            self.__families[host] = family
+            self.__families.move_to_end(host)
+            while len(self.__families) > self.__max_hosts:
+                self.__families.popitem(last=False)
+
+    def __sort_addresses(self, addresses, preferred_family):
+        """
+        Interleaves the addresses by family, starting with the preferred family (or the resolver's first choice)
+        """
+        addresses = list(addresses)
+        if not addresses:
+            return addresses
+
+        first_family = preferred_family
+        if first_family is None or all(a[0] != first_family for a in addresses):
+            first_family = addresses[0][0]
+
+        first = [a for a in addresses if a[0] == first_family]
+        rest = [a for a in addresses if a[0] != first_family]
+        interleaved = []
+        for index in range(max(len(first), len(rest))):
+            interleaved.extend(first[index : index + 1])
+            interleaved.extend(rest[index : index + 1])
+        return interleaved
+
+    def __race(self, addresses, timeout):
+        """
+        Starts a non-blocking connection attempt every `delay` seconds (or as soon as an attempt fails),
+        and returns the first socket to connect
+        """
+        import selectors  # pylint:disable=import-outside-toplevel
+
+        now = time.monotonic()
+        deadline = None if timeout is None else now + timeout
+        pending = list(addresses)
+        next_attempt_at = now
+        last_error = None
+        selector = selectors.DefaultSelector()
+        try:
+            while pending or selector.get_map():
+                now = time.monotonic()
+                if pending and now >= next_attempt_at:
+                    family, socktype, proto, _, address = pending.pop(0)
+                    sock = socket.socket(family, socktype, proto)
+                    sock.setblocking(False)
+                    error = sock.connect_ex(address)
+                    if error not in IN_PROGRESS_ERRORS:
+                        sock.close()
+                        last_error = OSError(error, os.strerror(error))
+                        continue
+                    logger.debug(f"Connection attempt started to {address}")
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    next_attempt_at = now + self.__delay
+
+                if deadline is not None and now >= deadline:
+                    raise SocketTimeoutException("timed out")
+
+                wait = None
+                if pending:
+                    wait = max(next_attempt_at - now, 0)
+                if deadline is not None:
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+
+                for key, _ in selector.select(wait):
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if error == 0:
+                        sock.setblocking(True)
+                        sock.settimeout(timeout)
+                        return sock
+
+                    sock.close()
+                    last_error = OSError(error, os.strerror(error))
+                    # Start the next attempt right away
+                    next_attempt_at = time.monotonic()
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+
+        if last_error is None:
+            raise OSError("getaddrinfo returns an empty list")
+        raise last_error
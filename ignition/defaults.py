@@ -0,0 +1,17 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+from .globals import DEFAULT_HOSTS_FILE, DEFAULT_REQUEST_TIMEOUT
+from .ssl.cert_store import CertStore
+from .ssl.context_cache import SSLContextCache
+from .util import TimeoutManager
+
+# Process-wide state shared by ignition.request() and ignition.aio.request(),
+# configured through ignition.set_default_timeout() and ignition.set_default_hosts_file()
+timeout_manager = TimeoutManager(DEFAULT_REQUEST_TIMEOUT)
+cert_store = CertStore(DEFAULT_HOSTS_FILE)
+ssl_context_cache = SSLContextCache()
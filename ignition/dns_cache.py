@@ -0,0 +1,132 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from socket import gaierror as SocketGaiErrorException
+
+logger = logging.getLogger(__name__)
+
+# Lookup errors that mean the host does not exist; any other error (such as a
+# resolver timeout) may be transient, so it is never cached
+NEGATIVE_CACHE_ERRORS = frozenset(
+    code
+    for code in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None))
+    if code is not None
+)
+
+
+class DNSCache:
+    """
+    Bounded in-process cache of resolved addresses per host & port, so repeat
+    requests to the same capsule skip the resolver round trip.
+
+    Successful lookups are kept for `ttl` seconds, and lookups of unknown hosts
+    are kept for `negative_ttl` seconds and raise the same error again without
+    asking the resolver.  Other lookup failures (e.g. a resolver timeout) are
+    not cached.  Entries are evicted least-recently-used once
+    `max_size` hosts are stored.  The system resolver does not expose record
+    TTLs, so the same lifetime applies to every host.
+
+    `hits` counts lookups answered from the cache (including cached failures),
+    and `misses` counts lookups that went to the resolver.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float):
+        """
+        Initializes an empty cache with a maximum number of hosts and positive & negative lifetimes (seconds)
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__negative_ttl = negative_ttl
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int):
+        """
+        Returns the `socket.getaddrinfo` results for a TCP connection to host & port,
+        from the cache if present, or raises socket.gaierror for an unknown host
+        """
+        key = (host, port)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                del self.__entries[key]
+                entry = None
+
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                result, _ = entry
+                if isinstance(result, SocketGaiErrorException):
+                    raise SocketGaiErrorException(*result.args)
+                return result
+
+            self.misses += 1
+
+        try:
+            addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        except SocketGaiErrorException as err:
+            if err.errno in NEGATIVE_CACHE_ERRORS:
+                logger.debug(f"Caching failed lookup for {host}:{port} - {err}")
+                self.__store(key, err, self.__negative_ttl)
+            raise err
+
+        self.__store(key, addresses, self.__ttl)
+        return addresses
+
+    def pre_resolve(self, hosts):
+        """
+        Resolves an iterable of (host, port) pairs into the cache ahead of requests.
+        Returns a dictionary of (host, port) to whether the host resolved.
+        """
+        resolved = {}
+        for host, port in hosts:
+            try:
+                self.resolve(host, port)
+                resolved[(host, port)] = True
+            except SocketGaiErrorException:
+                resolved[(host, port)] = False
+        return resolved
+
+    def stats(self):
+        """
+        Returns the lookup counters and the number of stored hosts
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.__entries),
+            }
+
+    def clear(self):
+        """
+        Drops all stored lookups and resets the counters
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __store(self, key, result, ttl):
+        """
+        Stores a lookup result, evicting the least recently used hosts beyond the maximum size
+        """
+        with self.__lock:
+            self.__entries[key] = (result, time.monotonic() + ttl)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
@@ -0,0 +1,215 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from socket import timeout as SocketTimeoutException
+
+from .exceptions import ResponseBodyTooLarge
+from .globals import (
+    CRLF,
+    DEFAULT_DOWNLOAD_DIGEST,
+    DEFAULT_STREAM_CHUNK_SIZE,
+    RESPONSE_STATUSDETAIL_ERROR_HOST,
+    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+)
+from .response import ErrorResponse, ResponseFactory, SuccessResponse
+
+logger = logging.getLogger(__name__)
+
+
+def get_default_file_mode():
+    """
+    Returns the mode a newly created file gets under the process umask,
+    which can only be read by setting it
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class DownloadResponse(SuccessResponse):
+    """
+    DownloadResponse
+    A SuccessResponse whose body was written to a file instead of being held in memory.
+
+    In place of the body, the response holds:
+    * path (the written file, or None when downloaded into a file object)
+    * size (the number of bytes written)
+    * digest (hex digest of the body)
+    * digest_algorithm
+    """
+
+    __slots__ = ("path", "size", "digest", "digest_algorithm")
+
+    path: str
+    size: int
+    digest: str
+    digest_algorithm: str
+
+    def __init__(
+        self,
+        response: SuccessResponse,
+        path: str,
+        size: int,
+        digest: str,
+        digest_algorithm: str,
+    ):
+        """
+        Initializes a DownloadResponse from the streamed response that was downloaded
+        """
+        super().__init__(
+            response.url, response.status, response.meta, None, response.certificate
+        )
+        self.timings = response.timings
+        self.path = path
+        self.size = size
+        self.digest = digest
+        self.digest_algorithm = digest_algorithm
+
+    def data(self):
+        """
+        The body is not held in memory, so this returns the path it was written to
+        """
+        return self.path
+
+    def __str__(self):
+        return (
+            f"{self.status} {self.meta}{CRLF}{self.size} bytes written to {self.path}"
+        )
+
+
+class Download:
+    """
+    Downloads the body of a streamed request to a file with bounded memory.
+
+    The body is read into a single reused buffer of `chunk_size` bytes and written
+    out chunk by chunk.  When downloading to a path, the body is written to a
+    temporary file next to the destination which is renamed over it once complete,
+    so the destination never holds a partial download.
+    """
+
+    def __init__(
+        self,
+        request,
+        path_or_fileobj,
+        chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+        digest_algorithm=DEFAULT_DOWNLOAD_DIGEST,
+        raise_errors=False,
+    ):
+        """
+        Initializes the download with a Request created with `stream=True`, and the destination path or binary file object
+        """
+        self.__request = request
+        self.__path_or_fileobj = path_or_fileobj
+        self.__chunk_size = chunk_size
+        self.__digest_algorithm = digest_algorithm
+        self.__raise_errors = raise_errors
+
+    def send(self):
+        """
+        Performs the request and writes a success response body to the destination.
+        Any other response is returned as is, and nothing is written.
+        """
+
+        response = self.__request.send()
+        if not isinstance(response, SuccessResponse) or response.stream is None:
+            return response
+
+        with response:
+            if isinstance(self.__path_or_fileobj, (str, os.PathLike)):
+                result = self.__download_to_path(response, self.__path_or_fileobj)
+            else:
+                result = self.__download_to_fileobj(
+                    response, self.__path_or_fileobj, None
+                )
+
+        if result.is_a(ErrorResponse) and response.timings is not None:
+            response.timings.mark_failed()
+            result.timings = response.timings
+        return result
+
+    def __download_to_path(self, response, path):
+        """
+        Writes the body to a temporary file in the destination directory, and renames it into place once complete
+        """
+
+        path = os.fspath(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_file = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".part"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                result = self.__download_to_fileobj(response, f, path)
+                if isinstance(result, DownloadResponse):
+                    f.flush()
+                    os.fsync(f.fileno())
+            if not isinstance(result, DownloadResponse):
+                os.unlink(temp_file)
+                return result
+
+            try:
+                # Keep the permissions of an existing destination file
+                os.chmod(temp_file, os.stat(path).st_mode)
+            except FileNotFoundError:
+                os.chmod(temp_file, get_default_file_mode())
+            os.replace(temp_file, path)
+            return result
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.unlink(temp_file)
+            raise
+
+    def __download_to_fileobj(self, response, fileobj, path):
+        """
+        Copies the body into the file object through a single reused buffer
+        """
+
+        buffer = bytearray(self.__chunk_size)
+        view = memoryview(buffer)
+        digest = hashlib.new(self.__digest_algorithm)
+        size = 0
+
+        try:
+            length = response.stream.readinto(view)
+            while length:
+                chunk = view[:length]
+                fileobj.write(chunk)
+                digest.update(chunk)
+                size += length
+                length = response.stream.readinto(view)
+        except SocketTimeoutException as err:
+            logger.debug(
+                f"socket.timeout: socket timed out downloading {response.url} after {size} bytes"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                response.url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Socket timeout"
+            )
+        except ResponseBodyTooLarge as err:
+            logger.debug(f"ResponseBodyTooLarge: {response.url}. {err}")
+            return ResponseFactory.create(
+                response.url, RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE, str(err)
+            )
+        except ConnectionResetError as err:
+            logger.debug(
+                f"ConnectionResetError: Connection reset downloading {response.url} after {size} bytes"
+            )
+            if self.__raise_errors:
+                raise err
+            return ResponseFactory.create(
+                response.url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Connection reset"
+            )
+
+        logger.debug(f"Downloaded {size} bytes from {response.url}")
+        return DownloadResponse(
+            response, path, size, digest.hexdigest(), self.__digest_algorithm
+        )
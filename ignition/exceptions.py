@@ -29,3 +29,15 @@ class GeminiResponseParseError(Exception):
     """
     Raised when the gemini protocol data response cannot be parsed.
     """
+
+
+class ResponseStreamConsumed(Exception):
+    """
+    Raised when the full body of a streamed response is requested after part of it has already been read.
+    """
+
+
+class ResponseBodyTooLarge(Exception):
+    """
+    Raised when a streamed response body exceeds the maximum body size of the request.
+    """
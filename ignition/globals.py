@@ -16,6 +16,8 @@ GEMINI_DEFAULT_ENCODING = "utf-8"
 GEMINI_RESPONSE_HEADER_SEPARATOR = "\\s+"
 GEMINI_URL_MAXLENGTH = 1024
 GEMINI_RESPONSE_HEADER_META_MAXLENGTH = 1024
+# <STATUS><SPACE><META><CR><LF>
+GEMINI_RESPONSE_HEADER_MAXLENGTH = 3 + GEMINI_RESPONSE_HEADER_META_MAXLENGTH + len(CRLF)
 
 # One-character response codes
 RESPONSE_STATUS_ERROR = "0"
@@ -32,6 +34,7 @@ RESPONSE_STATUSDETAIL_ERROR_DNS = "01"
 RESPONSE_STATUSDETAIL_ERROR_HOST = "02"
 RESPONSE_STATUSDETAIL_ERROR_TLS = "03"
 RESPONSE_STATUSDETAIL_ERROR_PROTOCOL = "04"
+RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE = "05"
 RESPONSE_STATUSDETAIL_INPUT = "10"
 RESPONSE_STATUSDETAIL_INPUT_SENSITIVE = "11"
 RESPONSE_STATUSDETAIL_SUCCESS = "20"
@@ -51,6 +54,55 @@ RESPONSE_STATUSDETAIL_CLIENTCERT_REQUIRED = "60"
 RESPONSE_STATUSDETAIL_CLIENTCERT_REQUIRED_NOT_AUTHORIZED = "61"
 RESPONSE_STATUSDETAIL_CLIENTCERT_REQUIRED_NOT_VALID = "62"
 
+# Request pipeline hook events
+HOOK_ON_CONNECT = "on_connect"
+HOOK_ON_HANDSHAKE = "on_handshake"
+HOOK_ON_TOFU_RESULT = "on_tofu_result"
+HOOK_ON_HEADER = "on_header"
+HOOK_ON_COMPLETE = "on_complete"
+
+# TOFU validation results
+TOFU_RESULT_TRUSTED = "trusted"
+TOFU_RESULT_ADDED = "added"
+TOFU_RESULT_UPDATED = "updated"
+TOFU_RESULT_REJECTED = "rejected"
+TOFU_RESULT_EXPIRED = "expired"
+
+# Certificate store modes
+CERT_STORE_MODE_DEFAULT = "default"
+CERT_STORE_MODE_INDEXED = "indexed"
+CERT_STORE_MODE_JOURNAL = "journal"
+CERT_STORE_MODE_SQLITE = "sqlite"
+
+# Certificate fingerprint modes
+FINGERPRINT_MODE_OPENSSH = "openssh"
+FINGERPRINT_MODE_SHA256 = "sha256"
+
 # ignition application defaults
 DEFAULT_REQUEST_TIMEOUT = 30
 DEFAULT_HOSTS_FILE = ".known_hosts"
+DEFAULT_BATCH_CONCURRENCY = 16
+DEFAULT_BATCH_PER_HOST_CONCURRENCY = 4
+DEFAULT_BATCH_ORDERED_WINDOW_FACTOR = 4
+DEFAULT_TLS_SESSION_CACHE_SIZE = 1024
+DEFAULT_TLS_SESSION_TTL = 3600
+DEFAULT_JOURNAL_COMPACTION_THRESHOLD = 1000
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+DEFAULT_DOWNLOAD_DIGEST = "sha256"
+DEFAULT_DNS_CACHE_SIZE = 1024
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_DNS_CACHE_NEGATIVE_TTL = 30
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+DEFAULT_HAPPY_EYEBALLS_HOSTS = 1024
+DEFAULT_SLOW_DOWN_MAX_PAUSE = 300
+DEFAULT_REDIRECT_CACHE_SIZE = 1024
+DEFAULT_URL_CACHE_SIZE = 4096
+DEFAULT_CERTIFICATE_CACHE_SIZE = 1024
+DEFAULT_META_CACHE_SIZE = 256
+DEFAULT_RESPONSE_CACHE_DIR = ".ignition_cache"
+DEFAULT_RESPONSE_CACHE_TTL = 3600
+DEFAULT_RESPONSE_CACHE_SIZE = 64 * 1024 * 1024
+DEFAULT_RESPONSE_CACHE_STATUSES = (
+    RESPONSE_STATUS_SUCCESS,
+    RESPONSE_STATUS_PERM_FAILURE,
+)
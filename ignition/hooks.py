@@ -0,0 +1,156 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import threading
+
+from .globals import (
+    HOOK_ON_COMPLETE,
+    HOOK_ON_CONNECT,
+    HOOK_ON_HANDSHAKE,
+    HOOK_ON_HEADER,
+    HOOK_ON_TOFU_RESULT,
+)
+
+logger = logging.getLogger(__name__)
+
+HOOK_EVENTS = (
+    HOOK_ON_CONNECT,
+    HOOK_ON_HANDSHAKE,
+    HOOK_ON_TOFU_RESULT,
+    HOOK_ON_HEADER,
+    HOOK_ON_COMPLETE,
+)
+
+
+class HookEvent:
+    """
+    Data passed to a hook callback.
+
+    * event: the hook event name
+    * url: the request url
+    * host: the host:port of the request
+    * timings: the RequestTimings of the request so far
+    * status: the response status (on_header & on_complete)
+    * meta: the response meta (on_header & on_complete)
+    * bytes_read: the raw header line length (on_header) or body length (on_complete), in bytes
+    * tofu_result: the outcome of certificate validation (on_tofu_result)
+    * response: the response returned by the request (on_complete)
+    """
+
+    def __init__(
+        self,
+        event,
+        url,
+        host,
+        timings,
+        status=None,
+        meta=None,
+        bytes_read=0,
+        tofu_result=None,
+        response=None,
+    ):
+        self.event = event
+        self.url = url
+        self.host = host
+        self.timings = timings
+        self.status = status
+        self.meta = meta
+        self.bytes_read = bytes_read
+        self.tofu_result = tofu_result
+        self.response = response
+
+    def __repr__(self):
+        return f"<HookEvent {self.event} {self.host} status={self.status}>"
+
+
+class Hooks:
+    """
+    Registry of callbacks for events in the request pipeline.
+
+    A Hooks registry is falsy while it has no callbacks, so the request pipeline
+    can skip building events entirely.  Callbacks are stored as tuples that are
+    replaced (not mutated) on change, so events can be emitted from many threads
+    while callbacks are added or removed.
+    """
+
+    def __init__(self, hooks=None):
+        """
+        Initializes the registry, optionally from a dict of event name to callback (or list of callbacks)
+        """
+        self.__callbacks = {}
+        self.__lock = threading.Lock()
+        self.__add_all(hooks or {})
+
+    def add(self, event: str, callback):
+        """
+        Registers a callback for an event
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event: {event}")
+        with self.__lock:
+            self.__callbacks[event] = self.__callbacks.get(event, ()) + (callback,)
+
+    def remove(self, event: str, callback):
+        """
+        Unregisters a callback for an event, if it is registered
+        """
+        with self.__lock:
+            callbacks = tuple(
+                c for c in self.__callbacks.get(event, ()) if c != callback
+            )
+            if callbacks:
+                self.__callbacks[event] = callbacks
+            else:
+                self.__callbacks.pop(event, None)
+
+    def clear(self):
+        """
+        Unregisters all callbacks
+        """
+        with self.__lock:
+            self.__callbacks = {}
+
+    def has(self, event: str) -> bool:
+        """
+        Returns if any callback is registered for the event
+        """
+        return event in self.__callbacks
+
+    def merged(self, hooks=None):
+        """
+        Returns a registry with the callbacks of this registry followed by the passed hooks.
+        Returns this registry itself when there is nothing to merge.
+        """
+        if not hooks:
+            return self
+
+        merged = Hooks(self.__callbacks)
+        merged.__add_all(hooks.__callbacks if isinstance(hooks, Hooks) else hooks)
+        return merged
+
+    def __add_all(self, hooks):
+        """
+        Registers every callback in a dict of event name to callback (or iterable of callbacks)
+        """
+        for event, callbacks in hooks.items():
+            for callback in [callbacks] if callable(callbacks) else callbacks:
+                self.add(event, callback)
+
+    def emit(self, hook_event: HookEvent):
+        """
+        Calls each callback registered for the event.
+        Errors raised by a callback are logged, and never interrupt the request.
+        """
+        for callback in self.__callbacks.get(hook_event.event, ()):
+            try:
+                callback(hook_event)
+            except Exception as err:  # pylint:disable=broad-except
+                logger.warning(f"Hook {callback} failed on {hook_event.event}: {err}")
+
+    def __bool__(self):
+        return bool(self.__callbacks)
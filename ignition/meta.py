@@ -0,0 +1,76 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from .globals import DEFAULT_META_CACHE_SIZE, GEMINI_DEFAULT_MIME_TYPE
+
+ParsedMeta = namedtuple("ParsedMeta", ["mime_type", "params"])
+ParsedMeta.__doc__ = """
+Immutable record of a parsed success response meta: the lowercased mime type,
+and a read-only mapping of its parameters (charset, lang...) by lowercased name
+"""
+
+
+@lru_cache(maxsize=DEFAULT_META_CACHE_SIZE)
+def parse_meta(meta: str) -> ParsedMeta:
+    """
+    Parses the meta of a success response (a MIME type, as in RFC-2045) into a ParsedMeta.
+    An empty meta is parsed as the default Gemini MIME type.
+
+    Parameters are parsed as `cgi.parse_header` did: names are lowercased, and
+    quoted values are unquoted.  Results are cached, as a crawl only sees a
+    handful of distinct metas.
+
+    Example:
+      text/gemini; charset=utf-8; lang=en
+      -> ParsedMeta(mime_type="text/gemini", params={"charset": "utf-8", "lang": "en"})
+    """
+
+    meta = meta or GEMINI_DEFAULT_MIME_TYPE
+    if '"' in meta:
+        parts = split_quoted_params(meta)
+    else:
+        parts = [part.strip() for part in meta.split(";")]
+
+    params = {}
+    for part in parts[1:]:
+        name, separator, value = part.partition("=")
+        if not separator:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1].replace("\\\\", "\\").replace('\\"', '"')
+        params[name.strip().lower()] = value
+
+    return ParsedMeta(parts[0].lower(), MappingProxyType(params))
+
+
+def split_quoted_params(meta: str):
+    """
+    Splits a meta on the semicolons that are outside of quoted parameter values
+    """
+
+    parts = []
+    start = 0
+    end = meta.find(";")
+    while end >= 0:
+        # A semicolon after an odd number of unescaped quotes is quoted
+        while (
+            end >= 0
+            and (meta.count('"', start, end) - meta.count('\\"', start, end)) % 2
+        ):
+            end = meta.find(";", end + 1)
+        if end < 0:
+            break
+        parts.append(meta[start:end].strip())
+        start = end + 1
+        end = meta.find(";", start)
+    parts.append(meta[start:].strip())
+    return parts
@@ -10,13 +10,14 @@ import sys
 # Polyfill to include gemini in urllib parsing
 if sys.version_info > (3, 13):
     raise Exception("Python versions > 3.12.x are not supported at this time.")
+# Exactly one vendored copy is imported, for the running version
 if sys.version_info > (3, 12):
     from .python3_12.Lib import urllib
-if sys.version_info > (3, 11):
+elif sys.version_info > (3, 11):
     from .python3_11.Lib import urllib
-if sys.version_info > (3, 10):
+elif sys.version_info > (3, 10):
     from .python3_10.Lib import urllib
-if sys.version_info > (3, 9):
+elif sys.version_info > (3, 9):
     from .python3_9.Lib import urllib
 elif sys.version_info > (3, 8):
     from .python3_8.Lib import urllib
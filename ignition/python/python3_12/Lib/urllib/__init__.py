@@ -0,0 +1 @@
+from .parse import *
@@ -0,0 +1,180 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from .globals import (
+    GEMINI_SCHEME,
+    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+    RESPONSE_STATUSDETAIL_REDIRECT_PERMANENT,
+)
+from .response import RedirectResponse, ResponseFactory
+from .url import URL
+
+logger = logging.getLogger(__name__)
+
+
+class RedirectCache:
+    """
+    Bounded in-process map of permanently redirected (31) urls to their targets,
+    so that later requests for a moved url go straight to its new location.
+
+    Entries are evicted least-recently-used once `max_size` urls are stored.
+
+    `hits` counts requests that skipped at least one redirect through the cache,
+    and `misses` counts requests for urls that were not known to have moved.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int):
+        """
+        Initializes an empty cache with a maximum number of urls
+        """
+        self.__max_size = max_size
+        self.__targets = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, url: str, target: str):
+        """
+        Records that the url has permanently moved to the target url
+        """
+        with self.__lock:
+            self.__targets[url] = target
+            self.__targets.move_to_end(url)
+            while len(self.__targets) > self.__max_size:
+                self.__targets.popitem(last=False)
+
+    def resolve(self, url: str) -> str:
+        """
+        Returns the final target of the url after following known permanent redirects,
+        or the url itself if it has not moved.  Cached loops are never followed twice.
+        """
+        with self.__lock:
+            seen = {url}
+            while url in self.__targets:
+                self.__targets.move_to_end(url)
+                target = self.__targets[url]
+                if target in seen:
+                    break
+                seen.add(target)
+                url = target
+
+            if len(seen) > 1:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return url
+
+    def stats(self):
+        """
+        Returns the lookup counters and the number of stored urls
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.__targets),
+            }
+
+    def clear(self):
+        """
+        Drops all stored redirects and resets the counters
+        """
+        with self.__lock:
+            self.__targets.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class RedirectFollower:
+    """
+    Sends a request and follows up to `max_redirects` redirect responses.
+
+    Redirect targets are resolved relative to the redirecting url.  Permanent
+    redirects are recorded in the redirect cache (if passed), and urls known to
+    have moved are requested at their new location directly.  A redirect back to
+    a url already visited, or to a malformed url, returns an ErrorResponse, and a
+    redirect to another protocol (or past the maximum) is returned as is, for the
+    caller to handle.  If `same_host_only` is set, so is a redirect to another host.
+    """
+
+    def __init__(
+        self,
+        request_factory,
+        max_redirects: int,
+        redirect_cache=None,
+        same_host_only=False,
+    ):
+        """
+        Initializes the follower with a factory that turns a url into a Request, the maximum number of redirects
+        to follow, the cache of permanent redirects, and whether redirects may leave the requested host
+        """
+        self.__request_factory = request_factory
+        self.__max_redirects = max_redirects
+        self.__redirect_cache = redirect_cache
+        self.__same_host_only = same_host_only
+
+    def send(self, request_url: str):
+        """
+        Performs the request, following redirects, and returns the final response
+        """
+
+        if self.__redirect_cache is not None:
+            request_url = self.__redirect_cache.resolve(request_url)
+
+        netloc = URL(request_url).netloc()
+        visited = {request_url}
+        redirects = 0
+        while True:
+            response = self.__request_factory(request_url).send()
+            if not isinstance(response, RedirectResponse):
+                return response
+            if redirects >= self.__max_redirects:
+                logger.debug(f"Not following more than {redirects} redirects")
+                return response
+
+            try:
+                target = URL(response.meta, referer_url=request_url)
+            except ValueError as err:
+                logger.debug(f"Invalid redirect target {response.meta}: {err}")
+                return ResponseFactory.create(
+                    response.url,
+                    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+                    "Invalid redirect target",
+                )
+            if target.protocol() != f"{GEMINI_SCHEME}://":
+                logger.debug(f"Not following redirect to {target.protocol()} url")
+                return response
+            if self.__same_host_only and target.netloc() != netloc:
+                logger.debug(
+                    f"Not following redirect to another host {target.netloc()}"
+                )
+                return response
+
+            target_url = str(target)
+            if (
+                self.__redirect_cache is not None
+                and response.status == RESPONSE_STATUSDETAIL_REDIRECT_PERMANENT
+            ):
+                self.__redirect_cache.add(request_url, target_url)
+
+            if target_url in visited:
+                logger.debug(f"Redirect loop detected at {target_url}")
+                return ResponseFactory.create(
+                    response.url, RESPONSE_STATUSDETAIL_ERROR_PROTOCOL, "Redirect loop"
+                )
+
+            logger.debug(f"Following redirect from {request_url} to {target_url}")
+            visited.add(target_url)
+            request_url = target_url
+            redirects += 1
@@ -12,27 +12,46 @@ import ssl
 from socket import gaierror as SocketGaiErrorException
 from socket import herror as SocketHErrorException
 from socket import timeout as SocketTimeoutException
+from typing import TYPE_CHECKING
 
-import cryptography
-
+from .connect import HappyEyeballsConnector
+from .dns_cache import DNSCache
 from .exceptions import (
     GeminiResponseParseError,
     RemoteCertificateExpired,
+    ResponseBodyTooLarge,
     TofuCertificateRejection,
 )
 from .globals import (
     CRLF,
     GEMINI_DEFAULT_ENCODING,
+    GEMINI_RESPONSE_HEADER_MAXLENGTH,
     GEMINI_RESPONSE_HEADER_META_MAXLENGTH,
     GEMINI_RESPONSE_HEADER_SEPARATOR,
+    HOOK_ON_COMPLETE,
+    HOOK_ON_CONNECT,
+    HOOK_ON_HANDSHAKE,
+    HOOK_ON_HEADER,
+    HOOK_ON_TOFU_RESULT,
     RESPONSE_STATUSDETAIL_ERROR_DNS,
     RESPONSE_STATUSDETAIL_ERROR_HOST,
     RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
     RESPONSE_STATUSDETAIL_ERROR_TLS,
 )
-from .response import BaseResponse, ResponseFactory
+from .hooks import HookEvent, Hooks
+from .response import BaseResponse, ErrorResponse, ResponseFactory
+from .response_cache import ResponseCache
+from .scheduler import HostScheduler
 from .ssl.cert_wrapper import CertWrapper
+from .ssl.context_cache import create_ssl_context
+from .stream import ResponseStream
+from .timings import RequestTimings
 from .url import URL
+from .util import TimeoutBudget
+
+if TYPE_CHECKING:
+    from cryptography.x509 import Certificate
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +81,16 @@ class Request:
         request_timeout=None,
         cert_store=None,
         ca_cert=None,
+        ssl_context_cache=None,
+        ssl_session_cache=None,
+        stream=False,
+        max_body_bytes=None,
+        timeout_budget: TimeoutBudget = None,
+        hooks: Hooks = None,
+        dns_cache: DNSCache = None,
+        connector: HappyEyeballsConnector = None,
+        scheduler: HostScheduler = None,
+        response_cache: ResponseCache = None,
     ):
         """
         Initializes Response with a url, referer, and timeout
@@ -69,9 +98,22 @@ class Request:
 
         self.__url = URL(url, referer_url=referer)
         self.__raise_errors = raise_errors
-        self.__timeout = request_timeout
         self.__cert_store = cert_store
         self.__ca_cert = ca_cert  # This should be a tuple
+        self.__ssl_context_cache = ssl_context_cache
+        self.__ssl_session_cache = ssl_session_cache
+        self.__stream = stream
+        self.__max_body_bytes = max_body_bytes
+        self.__timeout_budget = timeout_budget or TimeoutBudget(request_timeout)
+        self.__deadline = None
+        self.__timings = None
+        # Requests without hooks skip building hook events entirely
+        self.__hooks = hooks or None
+        self.__dns_cache = dns_cache
+        self.__connector = connector
+        self.__scheduler = scheduler
+        self.__slot_held = False
+        self.__response_cache = response_cache
 
     def get_url(self):
         """
@@ -80,15 +122,100 @@ class Request:
 
         return str(self.__url)
 
+    def get_netloc(self):
+        """
+        Fetch the host:port the request will be sent to
+        """
+
+        return self.__url.netloc()
+
     def send(self):
         """
         Performes network communication and returns a Response object
+        The response carries the timings of each phase of the request.
+        A response served from the response cache has no timings.
+        """
+
+        # Streamed bodies are not held in memory, and responses to requests made
+        # with a client certificate may be private to it, so neither is cached
+        use_cache = (
+            self.__response_cache is not None
+            and not self.__stream
+            and self.__ca_cert is None
+        )
+        response = None
+        if use_cache:
+            response = self.__response_cache.get(
+                str(self.__url), max_body_bytes=self.__max_body_bytes
+            )
+
+        if response is None:
+            if self.__scheduler is not None:
+                # Time spent waiting for the host is not part of the request deadline
+                self.__scheduler.acquire(self.__url.netloc())
+                self.__slot_held = True
+                try:
+                    response = self.__start()
+                    # Pause the host before any request waiting on its slot can start
+                    self.__scheduler.observe(self.__url.netloc(), response)
+                finally:
+                    # A streamed body holds the slot until its stream is closed
+                    if response is None or response.stream is None:
+                        self.__release_slot()
+            else:
+                response = self.__start()
+
+            if use_cache:
+                self.__response_cache.put(str(self.__url), response)
+
+        if self.__hooks is not None:
+            bytes_read = (
+                response.stream.bytes_read
+                if response.stream is not None
+                else len(response.raw_body or b"")
+            )
+            self.__emit(
+                HOOK_ON_COMPLETE,
+                status=response.status,
+                meta=response.meta,
+                bytes_read=bytes_read,
+                response=response,
+            )
+        return response
+
+    def __release_slot(self):
+        """
+        Releases the host slot held by the request, if it still holds it
+        """
+        if self.__slot_held:
+            self.__slot_held = False
+            self.__scheduler.release(self.__url.netloc())
+
+    def __start(self):
+        """
+        Starts the deadline & timings of the request and sends it
+        """
+
+        self.__deadline = self.__timeout_budget.start()
+        self.__timings = RequestTimings()
+
+        response = self.__send()
+        if response.is_a(ErrorResponse):
+            self.__timings.mark_failed()
+        response.timings = self.__timings
+        return response
+
+    def __send(self):
+        """
+        Runs each phase of the request, returning early with an ErrorResponse if any phase fails
         """
 
         logger.debug(f"Attempting to create a connection to {self.__url.netloc()}")
         socket_result = self.__get_socket()
         if isinstance(socket_result, BaseResponse):
             return socket_result
+        if self.__hooks is not None:
+            self.__emit(HOOK_ON_CONNECT)
 
         logger.debug(
             f"Attempting to negotiate SSL handshake with {self.__url.netloc()}"
@@ -96,23 +223,59 @@ class Request:
         secure_socket_result = self.__negotiate_ssl(socket_result)
         if isinstance(secure_socket_result, BaseResponse):
             return secure_socket_result
+        if self.__hooks is not None:
+            self.__emit(HOOK_ON_HANDSHAKE)
 
         logger.debug(f"Validating server certificate to {self.__url.netloc()}")
         ssl_certificate_result = self.__validate_ssl_certificate(secure_socket_result)
         if isinstance(ssl_certificate_result, BaseResponse):
+            secure_socket_result.close()
             return ssl_certificate_result
 
         logger.debug(f"Sending request header: {self.__url}")
         transport_result = self.__transport_payload(secure_socket_result, self.__url)
         if isinstance(transport_result, BaseResponse):
+            secure_socket_result.close()
             return transport_result
 
-        header, raw_body = transport_result
-        logger.debug(
-            f"Received response header: [{header}] and payload of length {len(raw_body)} bytes"
-        )
+        # TLS 1.3 session tickets are sent right after the handshake, so they have arrived with the header
+        self.__store_ssl_session(secure_socket_result)
+
+        header, fd, header_length = transport_result
+        logger.debug(f"Received response header: [{header}]")
+        if self.__hooks is not None:
+            status, _, meta = header.partition(" ")
+            self.__emit(
+                HOOK_ON_HEADER, status=status, meta=meta, bytes_read=header_length
+            )
+
+        if self.__stream and header.startswith("2"):
+            # Only success responses carry a body; the socket stays open until the stream is consumed or closed
+            return self.__handle_response(
+                header,
+                None,
+                ssl_certificate_result.certificate,
+                ResponseStream(
+                    secure_socket_result,
+                    fd,
+                    max_bytes=self.__max_body_bytes,
+                    deadline=self.__deadline,
+                    timings=self.__timings,
+                    on_close=(
+                        self.__release_slot if self.__scheduler is not None else None
+                    ),
+                ),
+            )
+
+        raw_body_result = self.__read_body(secure_socket_result, fd)
+        fd.close()
+        secure_socket_result.close()
+        if isinstance(raw_body_result, BaseResponse):
+            return raw_body_result
+
+        logger.debug(f"Received payload of length {len(raw_body_result)} bytes")
         return self.__handle_response(
-            header, raw_body, ssl_certificate_result.certificate
+            header, raw_body_result, ssl_certificate_result.certificate
         )
 
     def __get_socket(self):
@@ -121,9 +284,17 @@ class Request:
         """
 
         try:
-            sock = socket.create_connection(
-                (self.__url.host(), self.__url.port()), timeout=self.__timeout
-            )
+            self.__deadline.connect()
+            addresses = self.__resolve()
+            self.__timings.mark(RequestTimings.DNS)
+
+            if self.__connector is not None:
+                sock = self.__connector.connect(
+                    self.__url.host(), addresses, self.__deadline.connect()
+                )
+            else:
+                sock = self.__connect(addresses, self.__deadline.connect())
+            self.__timings.mark(RequestTimings.CONNECT)
             logger.debug(f"Created socket connection: {sock}")
             return sock
         except ConnectionRefusedError as err:
@@ -177,20 +348,63 @@ class Request:
             )
             raise err
 
+    def __resolve(self):
+        """
+        Resolves the host addresses through the DNS cache, or the system resolver
+        """
+
+        if self.__dns_cache is not None:
+            return self.__dns_cache.resolve(self.__url.host(), self.__url.port())
+        return socket.getaddrinfo(
+            self.__url.host(), self.__url.port(), 0, socket.SOCK_STREAM
+        )
+
+    def __connect(self, addresses, timeout):
+        """
+        Connects to the first reachable resolved address (as `socket.create_connection` does)
+        """
+
+        last_error = None
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(address)
+                return sock
+            except OSError as err:
+                sock.close()
+                last_error = err
+
+        if last_error is None:
+            raise OSError("getaddrinfo returns an empty list")
+        raise last_error
+
     def __negotiate_ssl(self, socket_obj) -> ssl.SSLSocket:
         """
         Negotiates a SSL handshake on the passed socket connection and returns the secure socket
         """
 
         try:
-            context = self.__setup_ssl_default_context()
-
-            if self.is_using_ca_cert():
-                self.__setup_ssl_client_certificate_context(context)
+            socket_obj.settimeout(self.__deadline.handshake())
+            context = self.__get_ssl_context()
+            session = None
+            if self.__ssl_session_cache is not None:
+                session = self.__ssl_session_cache.get_session(
+                    self.__url.netloc(), context
+                )
 
             secure_socket_result = context.wrap_socket(
-                socket_obj, server_hostname=self.__url.host()
+                socket_obj, server_hostname=self.__url.host(), session=session
             )
+            self.__timings.mark(RequestTimings.HANDSHAKE)
+
+            if self.__ssl_session_cache is not None:
+                logger.debug(
+                    f"TLS session resumed for {self.__url.netloc()}: {secure_socket_result.session_reused}"
+                )
+                self.__ssl_session_cache.record_handshake(
+                    secure_socket_result.session_reused
+                )
             return secure_socket_result
         except ssl.SSLZeroReturnError as err:
             logger.debug(f"ssl.SSLZeroReturnError for {self.__url.host()} - {err}")
@@ -268,8 +482,13 @@ class Request:
         try:
             certificate_wrapper = CertWrapper.parse(secure_socket.getpeercert(True))
             self.__cert_store.validate_tofu_or_add(
-                secure_socket.server_hostname, certificate_wrapper
+                secure_socket.server_hostname,
+                certificate_wrapper,
+                on_result=(
+                    self.__emit_tofu_result if self.__hooks is not None else None
+                ),
             )
+            self.__timings.mark(RequestTimings.TOFU)
             return certificate_wrapper
         except ValueError as err:
             logger.debug(f"ValueError: {self.__url.netloc()}. {err}")
@@ -304,42 +523,74 @@ class Request:
             )
             raise err
 
+    def __emit(self, event, **fields):
+        """
+        Calls the hooks registered for the event with the current state of the request
+        """
+        if self.__hooks.has(event):
+            self.__hooks.emit(
+                HookEvent(
+                    event,
+                    str(self.__url),
+                    self.__url.netloc(),
+                    self.__timings,
+                    **fields,
+                )
+            )
+
+    def __emit_tofu_result(self, tofu_result):
+        """
+        Receives the outcome of the TOFU validation from the cert store
+        """
+        self.__emit(HOOK_ON_TOFU_RESULT, tofu_result=tofu_result)
+
     def is_using_ca_cert(self):
         """
         Returns if the request is using ca_cert
         """
         return self.__ca_cert is not None
 
-    def __setup_ssl_default_context(self):
+    def __get_ssl_context(self):
         """
-        Setup an SSL default context (without a client certificate)
-        This will bypass certificate validation against a CA.
-        TOFU validation will be completed after the request is completed.
+        Fetch a prepared SSL context from the context cache, or setup a new one
         """
+        if self.__ssl_context_cache is not None:
+            return self.__ssl_context_cache.get_context(self.__ca_cert)
+        return create_ssl_context(self.__ca_cert)
 
-        context = ssl.create_default_context()
-        context.minimum_version = ssl.TLSVersion.TLSv1_2
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        return context
-
-    def __setup_ssl_client_certificate_context(self, context):
+    def __store_ssl_session(self, secure_socket):
         """
-        Load cert chain for client certificate
-        TODO: Better error handling here?
+        Keep the negotiated TLS session for resumption on the next request to this host.
+        TLS 1.3 session tickets arrive after the handshake, so this runs once the response header is read.
         """
-        cert, key = self.__ca_cert
-        context.load_cert_chain(cert, key)
+        if self.__ssl_session_cache is not None:
+            self.__ssl_session_cache.set_session(
+                self.__url.netloc(), secure_socket.context, secure_socket.session
+            )
 
     def __transport_payload(self, socket_obj, payload):
         """
-        Handles Gemini protocol negotiation over the socket
+        Handles Gemini protocol negotiation over the socket.
+        Returns the response header, the open file object positioned at the start of the body,
+        and the length of the raw header line in bytes.
         """
 
         try:
+            socket_obj.settimeout(self.__deadline.first_byte())
             socket_obj.sendall((f"{payload}{CRLF}").encode(GEMINI_DEFAULT_ENCODING))
             fd = socket_obj.makefile("rb")
-            return fd.readline().decode(GEMINI_DEFAULT_ENCODING).strip(), fd.read()
+            header = fd.readline(GEMINI_RESPONSE_HEADER_MAXLENGTH)
+            if len(header) == GEMINI_RESPONSE_HEADER_MAXLENGTH and not header.endswith(
+                b"\n"
+            ):
+                fd.close()
+                return ResponseFactory.create(
+                    self.__url,
+                    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+                    "Header line is too long",
+                )
+            self.__timings.mark(RequestTimings.FIRST_BYTE)
+            return header.decode(GEMINI_DEFAULT_ENCODING).strip(), fd, len(header)
         except SocketTimeoutException:
             logger.debug(
                 f"socket.timeout: socket timed out connecting to {self.__url.host()}"
@@ -353,8 +604,43 @@ class Request:
             )
             raise err
 
+    def __read_body(self, secure_socket, fd):
+        """
+        Reads the full response body into memory, up to the maximum body size and within the request deadline
+        """
+
+        try:
+            return ResponseStream(
+                secure_socket,
+                fd,
+                max_bytes=self.__max_body_bytes,
+                deadline=self.__deadline,
+                timings=self.__timings,
+            ).read()
+        except ResponseBodyTooLarge as err:
+            logger.debug(f"ResponseBodyTooLarge: {self.__url.netloc()}. {err}")
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE, str(err)
+            )
+        except SocketTimeoutException:
+            logger.debug(
+                f"socket.timeout: socket timed out reading from {self.__url.host()}"
+            )
+            return ResponseFactory.create(
+                self.__url, RESPONSE_STATUSDETAIL_ERROR_HOST, "Socket timeout"
+            )
+        except Exception as err:
+            logger.error(
+                f"Unknown exception encountered when reading data from {self.__url.netloc()} - {err}"
+            )
+            raise err
+
     def __handle_response(
-        self, header, raw_body, certificate: cryptography.x509.Certificate
+        self,
+        header,
+        raw_body,
+        certificate: "Certificate",
+        stream: ResponseStream = None,
     ):
         """
         Handles basic response data from the remote server and hands off to the Response object
@@ -373,9 +659,11 @@ class Request:
                 raise GeminiResponseParseError("Header meta text is too long")
 
             return ResponseFactory.create(
-                self.__url, status, meta.strip(), raw_body, certificate
+                self.__url, status, meta.strip(), raw_body, certificate, stream
             )
         except GeminiResponseParseError as err:
+            if stream is not None:
+                stream.close()
             return ResponseFactory.create(
                 self.__url, RESPONSE_STATUSDETAIL_ERROR_PROTOCOL, err
             )
@@ -5,17 +5,22 @@ was not distributed with this file, You can obtain one
 at http://mozilla.org/MPL/2.0/.
 """
 
-import cgi
 import logging
+from typing import TYPE_CHECKING
 
-from cryptography.x509 import Certificate
-
+from .exceptions import ResponseStreamConsumed
 from .globals import (
     CRLF,
+    DEFAULT_STREAM_CHUNK_SIZE,
     GEMINI_DEFAULT_ENCODING,
-    GEMINI_DEFAULT_MIME_TYPE,
     RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
 )
+from .meta import parse_meta
+from .stream import ResponseStream
+from .timings import RequestTimings
+
+if TYPE_CHECKING:
+    from cryptography.x509 import Certificate
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,15 @@ class ResponseFactory:
     """
 
     @classmethod
-    def create(cls, url: str, status: str, meta=None, raw_body=None, certificate=None):
+    def create(
+        cls,
+        url: str,
+        status: str,
+        meta=None,
+        raw_body=None,
+        certificate=None,
+        stream: ResponseStream = None,
+    ):
         """
         Given a url, status, and response data, generates the appropriate response type
         """
@@ -46,6 +59,8 @@ class ResponseFactory:
         factory_class = factories.get(basic_status_code, None)
 
         if factory_class is None:
+            if stream is not None:
+                stream.close()
             return ErrorResponse(
                 url,
                 RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
@@ -54,7 +69,7 @@ class ResponseFactory:
                 None,
             )
 
-        return factory_class(url, status, meta, raw_body, certificate)
+        return factory_class(url, status, meta, raw_body, certificate, stream)
 
 
 class BaseResponse:
@@ -67,14 +82,31 @@ class BaseResponse:
     * meta
     * raw_body
     * certificate
+    * stream
+    * timings
+
+    Responses are slotted, as crawls may hold very many of them in memory; response
+    types add their own attributes to `__slots__`.
     """
 
+    __slots__ = (
+        "url",
+        "basic_status",
+        "status",
+        "meta",
+        "__raw_body",
+        "certificate",
+        "stream",
+        "timings",
+    )
+
     url: str
     basic_status: str
     status: str
     meta: str
-    raw_body: bytes
-    certificate: Certificate
+    certificate: "Certificate"
+    stream: ResponseStream
+    timings: RequestTimings
 
     def __init__(
         self,
@@ -82,17 +114,72 @@ class BaseResponse:
         status: str,
         meta: str,
         raw_body: bytes,
-        certificate: Certificate,
+        certificate: "Certificate",
+        stream: ResponseStream = None,
     ):
         """
-        Initializes a BaseResponse with the request url, status code, metadata, raw body string, and remote certificate
+        Initializes a BaseResponse with the request url, status code, metadata, raw body string, and remote certificate.
+        A streamed response is initialized with the open body stream instead of the raw body.
         """
         self.url = str(url)
         self.basic_status = status[0]
         self.status = status
         self.meta = meta
-        self.raw_body = raw_body
+        self.__raw_body = raw_body
         self.certificate = certificate
+        self.stream = stream
+        self.timings = None
+
+    @property
+    def raw_body(self) -> bytes:
+        """
+        The raw response body.  For a streamed response, accessing this reads the rest of the
+        body from the stream into memory, which is only possible if none of it was read yet.
+        """
+        if self.__raw_body is None and self.stream is not None:
+            if self.stream.bytes_read > 0:
+                raise ResponseStreamConsumed(
+                    "The response body has already been partially read from the stream"
+                )
+            self.__raw_body = self.stream.read()
+        return self.__raw_body
+
+    @raw_body.setter
+    def raw_body(self, raw_body: bytes):
+        self.__raw_body = raw_body
+
+    def raw_body_view(self) -> memoryview:
+        """
+        A zero-copy view of the raw response body, for binary consumers.
+        As with `raw_body`, a streamed response is read into memory first.
+        """
+        return memoryview(self.raw_body or b"")
+
+    def iter_content(self, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+        """
+        Generator yielding the response body in chunks of at most *chunk_size* bytes.
+        Streamed responses are read from the socket as they are iterated.
+        """
+        if self.stream is not None and self.__raw_body is None:
+            yield from self.stream.iter_content(chunk_size)
+            return
+
+        raw_body = self.__raw_body or b""
+        for offset in range(0, len(raw_body), chunk_size):
+            yield raw_body[offset : offset + chunk_size]
+
+    def close(self):
+        """
+        Closes the body stream of a streamed response; this has no effect on other responses
+        """
+        if self.stream is not None:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def is_a(self, response_class_type):
         """
@@ -148,8 +235,13 @@ class ErrorResponse(BaseResponse):
     04: RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
     Any errors where a secure message is received from the server, but it does not conform to the
     Gemini protocol requirements and cannot be processed.
+
+    05: RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE
+    The response body exceeded the maximum body size of the request, and was not read to the end.
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Fetch data relevant to the ErrorResponse; in this case the metadata message from the response
@@ -169,6 +261,8 @@ class InputResponse(BaseResponse):
     gemini://hostname/path?query
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Returns the related instructions for the InputResponse.
@@ -183,30 +277,77 @@ class SuccessResponse(BaseResponse):
     Meets Gemini specification: 3.2.2 2x (SUCCESS)
 
     Status codes beginning with 2 are SUCCESS status codes.
+
+    The metadata is parsed once, when the response is created, and the body is
+    decoded on first access to `data()` and then reused.
     """
 
+    __slots__ = ("__parsed_meta", "__decoded_body")
+
+    def __init__(
+        self,
+        url: str,
+        status: str,
+        meta: str,
+        raw_body: bytes,
+        certificate: "Certificate",
+        stream: ResponseStream = None,
+    ):
+        """
+        Initializes a SuccessResponse, and parses the MIME type & parameters from the metadata
+        """
+        super().__init__(url, status, meta, raw_body, certificate, stream)
+        self.__parsed_meta = parse_meta(meta)
+        self.__decoded_body = None
+
+    @property
+    def mime_type(self) -> str:
+        """
+        The lowercased MIME type of the body, from the metadata
+        """
+        return self.__parsed_meta.mime_type
+
+    @property
+    def params(self):
+        """
+        Read-only mapping of the MIME type parameters (charset, lang...) from the metadata
+        """
+        return self.__parsed_meta.params
+
+    @property
+    def encoding(self) -> str:
+        """
+        The body encoding, from the charset parameter of the metadata
+        """
+        return self.__parsed_meta.params.get("charset", GEMINI_DEFAULT_ENCODING)
+
     def data(self):
         """
-        Decode the success message body using metadata in the appropriate encoding type
+        Decode the success message body using metadata in the appropriate encoding type.
+        The decoded body is cached, until the raw body is replaced.
         """
+        raw_body = self.raw_body
+        if self.__decoded_body is None or self.__decoded_body[0] is not raw_body:
+            self.__decoded_body = (raw_body, self.__decode(raw_body))
+        return self.__decoded_body[1]
 
-        meta = self.meta or GEMINI_DEFAULT_MIME_TYPE
-        _, options = cgi.parse_header(meta)
-        encoding = (
-            options["charset"] if "charset" in options else GEMINI_DEFAULT_ENCODING
-        )
+    def __decode(self, raw_body: bytes):
+        """
+        Decodes the raw body, or returns it as is if it cannot be decoded
+        """
+        encoding = self.encoding
         try:
-            return self.raw_body.decode(encoding)
+            return raw_body.decode(encoding)
         except LookupError:
             logger.warning(
                 f"Could not decode response body using invalid encoding {encoding}"
             )
-            return self.raw_body
+            return raw_body
         except UnicodeDecodeError:
             logger.warning(
                 f"Could not decode response body via encoding {encoding}, returning raw data"
             )
-            return self.raw_body
+            return raw_body
 
     def __str__(self):
         """
@@ -225,6 +366,8 @@ class RedirectResponse(BaseResponse):
     The server is redirecting the client to a new location for the requested resource
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Returns the new destination for redirection from the server
@@ -242,6 +385,8 @@ class TempFailureResponse(BaseResponse):
     The request has failed, but an identical request may success in the future.
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Returns the data from the server in the META field, which may provide additional information to the user.
@@ -259,6 +404,8 @@ class PermFailureResponse(BaseResponse):
     The request has failed, identical requests will likely fail in the future.
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Returns the data from the server in the META field, which may provide additional information to the user.
@@ -276,6 +423,8 @@ class ClientCertRequiredResponse(BaseResponse):
     The request should be retried with a client certificate.
     """
 
+    __slots__ = ()
+
     def data(self):
         """
         Return additional information from the server on certificate requirements
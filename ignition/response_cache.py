@@ -0,0 +1,257 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from .globals import RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE
+from .response import ResponseFactory
+from .ssl.cert_wrapper import CertWrapper
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENTRY_SUFFIX = ".entry"
+
+
+class ResponseCache:
+    """
+    Bounded on-disk cache of responses, keyed by the normalized request url.
+
+    Each response is stored in its own file in `directory`, as a single JSON
+    header line (url, status, meta, certificate, and the time it was stored)
+    followed by the raw body.  Hits are read back from the file and rebuilt
+    with ResponseFactory, without touching the network.
+
+    Only responses whose basic status is in `statuses` are stored.  Entries
+    expire `ttl` seconds after they are stored, and the least recently used
+    entries are evicted once the stored files exceed `max_size` bytes.  The
+    directory is only read (or created) on first use.
+
+    `hits` counts requests answered from the cache, and `misses` counts
+    requests that were sent to the server.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str, ttl: float, max_size: int, statuses):
+        """
+        Initializes the cache with its directory, entry lifetime (seconds), maximum size (bytes) and cacheable basic statuses
+        """
+        self.__lock = threading.Lock()
+        self.configure(directory, ttl, max_size, statuses)
+
+    def configure(self, directory: str, ttl: float, max_size: int, statuses):
+        """
+        Changes the directory, entry lifetime, maximum size and cacheable statuses, and resets the counters.
+        Responses stored in the previous directory are left in place.
+        """
+        with self.__lock:
+            self.__directory = directory
+            self.__ttl = ttl
+            self.__max_size = max_size
+            self.__statuses = tuple(statuses)
+            self.__entries = None
+            self.__size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, url: str, max_body_bytes: int = None):
+        """
+        Returns the stored response for the url, or None if it is not stored or has expired.
+        If the stored body exceeds *max_body_bytes*, this returns the ErrorResponse a request would.
+        """
+        key = self.__key(url)
+        with self.__lock:
+            self.__load()
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] < time.time():
+                self.__remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            try:
+                response = self.__read(self.__path(key), max_body_bytes)
+            except (OSError, ValueError, KeyError) as err:
+                logger.debug(f"Dropping unreadable cache entry for {url}: {err}")
+                self.__remove(key)
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, url: str, response):
+        """
+        Stores the response for the url, if its status is cacheable
+        """
+        if response.basic_status not in self.__statuses:
+            return
+        if not isinstance(response.meta, str):
+            # Error responses may carry the exception as their meta
+            logger.debug(f"Not caching response for {url} with non-text meta")
+            return
+
+        header = {
+            "url": url,
+            "status": response.status,
+            "meta": response.meta,
+            "stored_at": time.time(),
+            "has_body": response.raw_body is not None,
+        }
+        if response.certificate is not None:
+            # Imported on first use, like the rest of the certificate handling
+            from cryptography.hazmat.primitives.serialization import (  # pylint:disable=import-outside-toplevel
+                Encoding,
+            )
+
+            header["certificate"] = base64.b64encode(
+                response.certificate.public_bytes(Encoding.DER)
+            ).decode("ascii")
+        data = json.dumps(header).encode("utf-8") + b"\n" + (response.raw_body or b"")
+
+        key = self.__key(url)
+        with self.__lock:
+            self.__load()
+            os.makedirs(self.__directory, exist_ok=True)
+            fd, temp_file = tempfile.mkstemp(
+                dir=self.__directory, prefix=".", suffix=".part"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_file, self.__path(key))
+            except OSError as err:
+                logger.warning(f"Could not cache response for {url}: {err}")
+                if os.path.exists(temp_file):
+                    os.unlink(temp_file)
+                return
+
+            if key in self.__entries:
+                self.__size -= self.__entries[key][0]
+            self.__entries[key] = (len(data), header["stored_at"] + self.__ttl)
+            self.__entries.move_to_end(key)
+            self.__size += len(data)
+            while self.__size > self.__max_size and self.__entries:
+                self.__remove(next(iter(self.__entries)))
+
+    def stats(self):
+        """
+        Returns the lookup counters, the number of stored responses and their size in bytes
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.__entries or ()),
+                "bytes": self.__size,
+            }
+
+    def clear(self):
+        """
+        Deletes all stored responses and resets the counters
+        """
+        with self.__lock:
+            self.__load()
+            for key in list(self.__entries):
+                self.__remove(key)
+            self.hits = 0
+            self.misses = 0
+
+    def __load(self):
+        """
+        Indexes the entries already in the cache directory, oldest first, on first use
+        """
+        if self.__entries is not None:
+            return
+
+        self.__entries = OrderedDict()
+        try:
+            names = os.listdir(self.__directory)
+        except FileNotFoundError:
+            return
+
+        found = []
+        for name in names:
+            if not name.endswith(CACHE_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.__directory, name)
+            try:
+                with open(path, "rb") as f:
+                    header = json.loads(f.readline())
+                size = os.path.getsize(path)
+                found.append(
+                    (
+                        os.path.getmtime(path),
+                        name[: -len(CACHE_ENTRY_SUFFIX)],
+                        size,
+                        header["stored_at"] + self.__ttl,
+                    )
+                )
+            except (OSError, ValueError, KeyError) as err:
+                logger.debug(f"Ignoring unreadable cache entry {path}: {err}")
+
+        for _, key, size, expires_at in sorted(found):
+            self.__entries[key] = (size, expires_at)
+            self.__size += size
+
+    def __read(self, path, max_body_bytes=None):
+        """
+        Rebuilds a response from a stored entry.  The body size is checked before the body is read.
+        """
+        with open(path, "rb") as f:
+            header_line = f.readline()
+            if not header_line.endswith(b"\n"):
+                raise ValueError("Missing cache entry header")
+            header = json.loads(header_line)
+            body_size = os.fstat(f.fileno()).st_size - len(header_line)
+            if max_body_bytes is not None and body_size > max_body_bytes:
+                return ResponseFactory.create(
+                    header["url"],
+                    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+                    f"Response body exceeds the maximum of {max_body_bytes} bytes",
+                )
+            raw_body = f.read() if header["has_body"] else None
+
+        certificate = None
+        if "certificate" in header:
+            certificate = CertWrapper.parse(
+                base64.b64decode(header["certificate"])
+            ).certificate
+
+        return ResponseFactory.create(
+            header["url"], header["status"], header["meta"], raw_body, certificate
+        )
+
+    def __remove(self, key):
+        """
+        Deletes an entry from the index and the directory
+        """
+        size, _ = self.__entries.pop(key)
+        self.__size -= size
+        try:
+            os.unlink(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+    def __path(self, key):
+        return os.path.join(self.__directory, key + CACHE_ENTRY_SUFFIX)
+
+    @staticmethod
+    def __key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
@@ -0,0 +1,188 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from .globals import RESPONSE_STATUSDETAIL_TEMP_FAILURE_SLOW_DOWN
+
+logger = logging.getLogger(__name__)
+
+
+class HostState:
+    """
+    Politeness state of a single host
+    """
+
+    def __init__(self, tokens: float):
+        self.tokens = tokens
+        self.updated_at = time.monotonic()
+        self.in_flight = 0
+        self.paused_until = 0.0
+
+
+class HostScheduler:
+    """
+    Politeness scheduler shared by requests, keyed by host:port.
+
+    Each host gets a token bucket refilled at `rate` requests per second up to
+    `burst` requests, and at most `max_in_flight` concurrent requests.  Either
+    limit is disabled when set to None.  A request waits in `acquire()` until its
+    host has both a token and a free slot.
+
+    A `44 SLOW DOWN` response pauses its host for the number of seconds in the
+    response meta (capped at `max_pause`), holding back every request to that
+    host until the pause ends.
+    """
+
+    def __init__(self, rate=None, burst=1, max_in_flight=None, max_pause=None):
+        """
+        Initializes the scheduler with the per-host request rate (per second), burst size, concurrency and longest pause
+        """
+        self.__condition = threading.Condition()
+        self.__hosts = {}
+        self.set_limits(rate, burst, max_in_flight, max_pause)
+
+    def set_limits(self, rate=None, burst=1, max_in_flight=None, max_pause=None):
+        """
+        Changes the per-host limits. Requests already waiting are re-evaluated against the new limits.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        with self.__condition:
+            self.__rate = rate
+            self.__burst = burst
+            self.__max_in_flight = max_in_flight
+            self.__max_pause = max_pause
+            self.__condition.notify_all()
+
+    def acquire(self, host: str):
+        """
+        Blocks until a request may be sent to the host, and counts it as in flight
+        """
+        with self.__condition:
+            while True:
+                # Idle hosts may be dropped while waiting, so fetch the state each time
+                state = self.__get_state(host)
+                wait = self.__wait_time(state)
+                if wait == 0:
+                    break
+                logger.debug(f"Waiting to send request to {host}")
+                self.__condition.wait(wait)
+
+            if self.__rate is not None:
+                state.tokens -= 1
+            state.in_flight += 1
+
+    def release(self, host: str):
+        """
+        Marks a request to the host as finished
+        """
+        with self.__condition:
+            state = self.__hosts[host]
+            state.in_flight -= 1
+            self.__refill(state)
+            if (
+                state.in_flight == 0
+                and state.tokens >= self.__burst
+                and state.paused_until <= time.monotonic()
+            ):
+                # Idle hosts hold no state beyond a full bucket
+                del self.__hosts[host]
+            self.__condition.notify_all()
+
+    @contextmanager
+    def slot(self, host: str):
+        """
+        Context manager that holds a request slot for the host
+        """
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def pause(self, host: str, seconds: float):
+        """
+        Holds back requests to the host for a number of seconds
+        """
+        if self.__max_pause is not None:
+            seconds = min(seconds, self.__max_pause)
+
+        with self.__condition:
+            state = self.__get_state(host)
+            state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+            logger.debug(f"Pausing requests to {host} for {seconds} seconds")
+
+    def paused_for(self, host: str) -> float:
+        """
+        Returns the number of seconds requests to the host are still paused for
+        """
+        with self.__condition:
+            state = self.__hosts.get(host)
+            if state is None:
+                return 0.0
+            return max(state.paused_until - time.monotonic(), 0.0)
+
+    def observe(self, host: str, response):
+        """
+        Pauses the host when the response asks the client to slow down
+        """
+        if response.status != RESPONSE_STATUSDETAIL_TEMP_FAILURE_SLOW_DOWN:
+            return
+
+        try:
+            seconds = int(response.meta.strip())
+        except (AttributeError, ValueError):
+            logger.debug(f"Ignoring invalid slow down delay from {host}")
+            return
+        self.pause(host, seconds)
+
+    def __get_state(self, host: str) -> HostState:
+        """
+        Returns the state of the host, starting with a full bucket
+        """
+        state = self.__hosts.get(host)
+        if state is None:
+            state = self.__hosts[host] = HostState(self.__burst)
+        return state
+
+    def __wait_time(self, state: HostState):
+        """
+        Returns how long (in seconds) a request to the host must wait, 0 if it may be sent now,
+        or None to wait until a request to the host finishes
+        """
+        now = time.monotonic()
+        if state.paused_until > now:
+            return state.paused_until - now
+        if self.__max_in_flight is not None and state.in_flight >= self.__max_in_flight:
+            return None
+        if self.__rate is not None:
+            self.__refill(state)
+            if state.tokens < 1:
+                return (1 - state.tokens) / self.__rate
+        return 0
+
+    def __refill(self, state: HostState):
+        """
+        Adds the tokens earned since the last refill to the host bucket
+        """
+        now = time.monotonic()
+        if self.__rate is None:
+            state.tokens = self.__burst
+        else:
+            state.tokens = min(
+                self.__burst, state.tokens + (now - state.updated_at) * self.__rate
+            )
+        state.updated_at = now
@@ -6,21 +6,35 @@ at http://mozilla.org/MPL/2.0/.
 """
 
 import datetime
+from typing import Union
 
 from ..exceptions import CertRecordParseException
 from ..globals import EOL
 
+# Prefix of hex-encoded SHA-256 fingerprints in the hosts file
+SHA256_FINGERPRINT_PREFIX = "sha256:"
+
 
 class CertRecord:
     """
     Manages a single Certificate Record with a hostfile, signature, and expiration
+
+    The fingerprint is either the OpenSSH public key string, or the 32-byte
+    SHA-256 digest of the SubjectPublicKeyInfo as `bytes`.
     """
 
+    __slots__ = ("hostname", "fingerprint", "expiration")
+
     hostname: str
-    fingerprint: str
+    fingerprint: Union[str, bytes]
     expiration: datetime.datetime
 
-    def __init__(self, hostname: str, fingerprint: str, expiration: datetime.datetime):
+    def __init__(
+        self,
+        hostname: str,
+        fingerprint: Union[str, bytes],
+        expiration: datetime.datetime,
+    ):
         """
         Generate a CertRecord from logic; passing in the hostname, fingerprint, and expiration
         """
@@ -33,6 +47,8 @@ class CertRecord:
         """
         Generate a CertRecord from a string in the format:
         [HOSTNAME] [SSH-ALGORITHM PUBLIC_KEY];EXPIRES=[YYYY-MM-DDTHH:mm:ss.SSSZ]
+        or:
+        [HOSTNAME] sha256:[HEX DIGEST];EXPIRES=[YYYY-MM-DDTHH:mm:ss.SSSZ]
         """
         try:
             hostname, fingerprint_with_expiration = host_string.strip().split(
@@ -41,7 +57,9 @@ class CertRecord:
             fingerprint, expiration = fingerprint_with_expiration.split(";EXPIRES=")
             expiration_datetime = datetime.datetime.fromisoformat(expiration)
 
-            return CertRecord(hostname, fingerprint, expiration_datetime)
+            return CertRecord(
+                hostname, parse_fingerprint(fingerprint), expiration_datetime
+            )
         except Exception as e:
             raise CertRecordParseException() from e
 
@@ -49,11 +67,13 @@ class CertRecord:
         """
         Converts a CertRecord to a string in the format:
         [HOSTNAME] [SSH-ALGORITHM PUBLIC_KEY];EXPIRES=[YYYY-MM-DDTHH:mm:ss.SSSZ]
+        or:
+        [HOSTNAME] sha256:[HEX DIGEST];EXPIRES=[YYYY-MM-DDTHH:mm:ss.SSSZ]
         """
         return (
             self.hostname
             + " "
-            + self.fingerprint
+            + format_fingerprint(self.fingerprint)
             + ";EXPIRES="
             + self.expiration.isoformat()
             + EOL
@@ -71,3 +91,25 @@ class CertRecord:
         Returns datetime
         """
         return datetime.datetime.now()
+
+
+def parse_fingerprint(fingerprint: str) -> Union[str, bytes]:
+    """
+    Converts a stored fingerprint string to its in-memory form:
+    SHA-256 fingerprints are decoded to bytes, OpenSSH fingerprints are kept as is
+    """
+    if fingerprint.startswith(SHA256_FINGERPRINT_PREFIX):
+        digest = bytes.fromhex(fingerprint[len(SHA256_FINGERPRINT_PREFIX) :])
+        if len(digest) != 32:
+            raise ValueError(f"Invalid SHA-256 fingerprint: {fingerprint}")
+        return digest
+    return fingerprint
+
+
+def format_fingerprint(fingerprint: Union[str, bytes]) -> str:
+    """
+    Converts an in-memory fingerprint to its stored string form
+    """
+    if isinstance(fingerprint, bytes):
+        return SHA256_FINGERPRINT_PREFIX + fingerprint.hex()
+    return fingerprint
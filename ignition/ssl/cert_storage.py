@@ -0,0 +1,391 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import datetime
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from ..exceptions import CertRecordParseException
+from ..globals import (
+    CERT_STORE_MODE_DEFAULT,
+    CERT_STORE_MODE_INDEXED,
+    CERT_STORE_MODE_JOURNAL,
+    CERT_STORE_MODE_SQLITE,
+    EOL,
+)
+from .cert_record import CertRecord, format_fingerprint, parse_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cert_record(file_line: str) -> Optional[CertRecord]:
+    """
+    Parses a single hosts file line, or returns None (with a warning) if it is invalid
+    """
+    try:
+        return CertRecord.from_string(file_line)
+    except CertRecordParseException:
+        logger.warning(
+            f"Invalid TOFU record encountered: '{file_line.strip()}'. This record has been skipped."
+        )
+        return None
+
+
+def write_cert_records(hosts_file: str, cert_records: Iterable[CertRecord]):
+    """
+    Writes the full set of host records to file.
+    The records are written to a temporary file which then replaces the hosts file,
+    so an interrupted write never truncates the hosts file.
+    """
+    hosts_directory = os.path.dirname(os.path.abspath(hosts_file))
+    fd, temp_file = tempfile.mkstemp(
+        dir=hosts_directory, prefix=".known_hosts.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for c in cert_records:
+                f.write(c.to_string())
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            # Keep the permissions of an existing hosts file
+            os.chmod(temp_file, os.stat(hosts_file).st_mode)
+        except FileNotFoundError:
+            os.chmod(temp_file, 0o644)
+        os.replace(temp_file, hosts_file)
+    except BaseException:
+        os.unlink(temp_file)
+        raise
+
+
+class CertStorage(ABC):
+    """
+    Interface for the persistent storage of certificate records behind a CertStore.
+
+    Implementations need not be thread-safe; the CertStore serializes access.
+    Storage shared between processes should make `transaction()` exclusive
+    across processes, as the CertStore lock only covers its own process.
+    """
+
+    @abstractmethod
+    def get_record(self, hostname: str) -> Optional[CertRecord]:
+        """
+        Fetch the stored CertRecord for the hostname, or None
+        """
+
+    @abstractmethod
+    def put_record(self, cert_record: CertRecord):
+        """
+        Store the CertRecord, replacing any record for the same hostname
+        """
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups the lookup of a record with the write that depends on it, so that
+        a TOFU check & update is atomic.  By default this does nothing.
+        """
+        yield self
+
+    def close(self):
+        """
+        Release any resources held by the storage
+        """
+
+
+class FileCertStorage(CertStorage):
+    """
+    Hosts file storage (CERT_STORE_MODE_DEFAULT).
+    The hosts file is re-read on every lookup and fully rewritten on every write.
+    """
+
+    __hosts_file: str
+    __cert_store_data: Dict[str, CertRecord]
+
+    def __init__(self, hosts_file: str):
+        self.__hosts_file = hosts_file
+        self.__cert_store_data = {}
+
+    def get_record(self, hostname: str) -> Optional[CertRecord]:
+        self.__load()
+        return self.__cert_store_data.get(hostname, None)
+
+    def put_record(self, cert_record: CertRecord):
+        self.__cert_store_data[cert_record.hostname] = cert_record
+        write_cert_records(self.__hosts_file, self.__cert_store_data.values())
+        return self
+
+    def __load(self):
+        """
+        Reloads the hosts file from storage and copies that into memory
+        """
+        file_lines = []
+        try:
+            with open(self.__hosts_file, "r", encoding="utf-8") as f:
+                file_lines = f.readlines()
+        except FileNotFoundError:
+            file_lines = []
+
+        for file_line in file_lines:
+            cert_record = parse_cert_record(file_line)
+            if cert_record is not None:
+                self.__cert_store_data[cert_record.hostname] = cert_record
+
+        return self
+
+
+class IndexedFileCertStorage(CertStorage):
+    """
+    Hosts file storage with an in-memory index (CERT_STORE_MODE_INDEXED).
+    The hosts file is loaded once, and only re-read when its inode, size or mtime changes.
+    """
+
+    __hosts_file: str
+    __cert_store_data: Dict[str, CertRecord]
+
+    def __init__(self, hosts_file: str):
+        self.__hosts_file = hosts_file
+        self.__cert_store_data = {}
+        self.__file_signature = None
+
+    def get_record(self, hostname: str) -> Optional[CertRecord]:
+        self.__reload_if_changed()
+        return self.__cert_store_data.get(hostname, None)
+
+    def put_record(self, cert_record: CertRecord):
+        self.__cert_store_data[cert_record.hostname] = cert_record
+        write_cert_records(self.__hosts_file, self.__cert_store_data.values())
+        # Our own write should not trigger a reload
+        self.__file_signature = self.__read_file_signature()
+        return self
+
+    def __reload_if_changed(self):
+        """
+        Reloads the in-memory index only if the hosts file changed since it was last read
+        """
+        file_signature = self.__read_file_signature()
+        if (
+            self.__file_signature is not None
+            and file_signature == self.__file_signature
+        ):
+            return self
+
+        logger.debug(f"Loading TOFU index from {self.__hosts_file}")
+        cert_store_data = {}
+        try:
+            with open(self.__hosts_file, "r", encoding="utf-8") as f:
+                for file_line in f:
+                    cert_record = parse_cert_record(file_line)
+                    if cert_record is not None:
+                        cert_store_data[cert_record.hostname] = cert_record
+        except FileNotFoundError:
+            pass
+
+        self.__cert_store_data = cert_store_data
+        self.__file_signature = file_signature
+        return self
+
+    def __read_file_signature(self):
+        """
+        Cheap change detection for the hosts file, or None if it does not exist
+        """
+        try:
+            stat = os.stat(self.__hosts_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class JournalFileCertStorage(CertStorage):
+    """
+    Append-only hosts file storage (CERT_STORE_MODE_JOURNAL).
+
+    Records are appended to the hosts file as single lines, and the last line per
+    hostname wins.  Only lines appended since the last lookup are read.  Once the
+    file holds more than `compaction_threshold` stale lines, it is compacted by
+    atomically replacing it with the latest record per hostname.
+    """
+
+    __hosts_file: str
+    __cert_store_data: Dict[str, CertRecord]
+
+    def __init__(self, hosts_file: str, compaction_threshold: int):
+        self.__hosts_file = hosts_file
+        self.__compaction_threshold = compaction_threshold
+        self.__cert_store_data = {}
+        self.__reset_position()
+
+    def get_record(self, hostname: str) -> Optional[CertRecord]:
+        self.__read_journal()
+        return self.__cert_store_data.get(hostname, None)
+
+    def put_record(self, cert_record: CertRecord):
+        """
+        Appends a single record to the journal, and compacts the journal once it holds too many stale lines
+        """
+        self.__cert_store_data[cert_record.hostname] = cert_record
+        with open(self.__hosts_file, "a", encoding="utf-8") as f:
+            if self.__partial:
+                # Terminate an interrupted append so it cannot corrupt this record
+                f.write(EOL)
+            f.write(cert_record.to_string())
+        self.__partial = False
+
+        stale_lines = self.__lines - len(self.__cert_store_data)
+        if stale_lines > self.__compaction_threshold:
+            self.__compact()
+        return self
+
+    def __reset_position(self):
+        """
+        Forces the next journal read to start from the beginning of the file
+        """
+        self.__inode = None
+        self.__offset = 0
+        self.__lines = 0
+        self.__partial = False
+
+    def __read_journal(self):
+        """
+        Reads the journal lines appended since the last read into memory.
+        The journal is read from the start if the file was replaced (e.g. compacted) or truncated.
+        A trailing line without a newline (an interrupted append) is left for the next read.
+        """
+        try:
+            with open(self.__hosts_file, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_ino != self.__inode or stat.st_size < self.__offset:
+                    self.__cert_store_data = {}
+                    self.__reset_position()
+                    self.__inode = stat.st_ino
+
+                if stat.st_size == self.__offset:
+                    return self
+
+                f.seek(self.__offset)
+                appended = f.read()
+        except FileNotFoundError:
+            self.__cert_store_data = {}
+            self.__reset_position()
+            return self
+
+        complete_length = appended.rfind(b"\n") + 1
+        self.__partial = complete_length < len(appended)
+        for file_line in appended[:complete_length].decode("utf-8").splitlines():
+            self.__lines += 1
+            cert_record = parse_cert_record(file_line)
+            if cert_record is not None:
+                self.__cert_store_data[cert_record.hostname] = cert_record
+
+        self.__offset += complete_length
+        return self
+
+    def __compact(self):
+        """
+        Atomically rewrites the journal with only the latest record per hostname
+        """
+        self.__read_journal()
+        logger.debug(
+            f"Compacting TOFU journal {self.__hosts_file} from {self.__lines} to {len(self.__cert_store_data)} lines"
+        )
+        write_cert_records(self.__hosts_file, self.__cert_store_data.values())
+        self.__reset_position()
+        return self
+
+
+class SQLiteCertStorage(CertStorage):
+    """
+    SQLite database storage (CERT_STORE_MODE_SQLITE).
+
+    Records are kept in a table keyed (and indexed) by hostname and upserted on
+    write.  The database runs in WAL mode with a busy timeout, so it can be shared
+    by many processes with concurrent readers and writers.  Transactions take
+    the database write lock up front (BEGIN IMMEDIATE), so two processes can
+    never both trust a different first certificate for the same host.
+    """
+
+    __database_file: str
+
+    def __init__(self, database_file: str, timeout: float = 30):
+        import sqlite3  # pylint:disable=import-outside-toplevel
+
+        self.__database_file = database_file
+        self.__connection = sqlite3.connect(
+            database_file,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS cert_records ("
+            "hostname TEXT PRIMARY KEY, "
+            "fingerprint TEXT NOT NULL, "
+            "expiration TEXT NOT NULL"
+            ")"
+        )
+
+    def get_record(self, hostname: str) -> Optional[CertRecord]:
+        row = self.__connection.execute(
+            "SELECT fingerprint, expiration FROM cert_records WHERE hostname = ?",
+            (hostname,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        fingerprint, expiration = row
+        return CertRecord(
+            hostname,
+            parse_fingerprint(fingerprint),
+            datetime.datetime.fromisoformat(expiration),
+        )
+
+    def put_record(self, cert_record: CertRecord):
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO cert_records (hostname, fingerprint, expiration) VALUES (?, ?, ?)",
+            (
+                cert_record.hostname,
+                format_fingerprint(cert_record.fingerprint),
+                cert_record.expiration.isoformat(),
+            ),
+        )
+        return self
+
+    @contextmanager
+    def transaction(self):
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+        self.__connection.execute("COMMIT")
+
+    def close(self):
+        self.__connection.close()
+
+
+def create_cert_storage(
+    hosts_file: str, mode: str, journal_compaction_threshold: int
+) -> CertStorage:
+    """
+    Creates the storage backend for a cert store mode
+    """
+    if mode == CERT_STORE_MODE_DEFAULT:
+        return FileCertStorage(hosts_file)
+    if mode == CERT_STORE_MODE_INDEXED:
+        return IndexedFileCertStorage(hosts_file)
+    if mode == CERT_STORE_MODE_JOURNAL:
+        return JournalFileCertStorage(hosts_file, journal_compaction_threshold)
+    if mode == CERT_STORE_MODE_SQLITE:
+        return SQLiteCertStorage(hosts_file)
+    raise ValueError(f"Unknown cert store mode: {mode}")
@@ -5,15 +5,24 @@ was not distributed with this file, You can obtain one
 at http://mozilla.org/MPL/2.0/.
 """
 
+import hmac
 import logging
-from typing import Dict
-
-from ..exceptions import (
-    CertRecordParseException,
-    RemoteCertificateExpired,
-    TofuCertificateRejection,
+import threading
+
+from ..exceptions import RemoteCertificateExpired, TofuCertificateRejection
+from ..globals import (
+    CERT_STORE_MODE_DEFAULT,
+    DEFAULT_JOURNAL_COMPACTION_THRESHOLD,
+    FINGERPRINT_MODE_OPENSSH,
+    FINGERPRINT_MODE_SHA256,
+    TOFU_RESULT_ADDED,
+    TOFU_RESULT_EXPIRED,
+    TOFU_RESULT_REJECTED,
+    TOFU_RESULT_TRUSTED,
+    TOFU_RESULT_UPDATED,
 )
 from .cert_record import CertRecord
+from .cert_storage import CertStorage, create_cert_storage
 from .cert_wrapper import CertWrapper
 
 logger = logging.getLogger(__name__)
@@ -22,23 +31,106 @@ logger = logging.getLogger(__name__)
 class CertStore:
     """
     Data structure to store the certificates across visited hosts
+    Validation is serialized with a lock, so a store may be shared across threads.
+
+    Records are persisted by a storage backend, selected by mode:
+    * CERT_STORE_MODE_DEFAULT: the hosts file is re-read on every lookup and
+      fully rewritten on every change.
+    * CERT_STORE_MODE_INDEXED: the hosts file is loaded once into an in-memory
+      index, and only re-read when its inode, size or mtime changes.
+    * CERT_STORE_MODE_JOURNAL: changed records are appended to the hosts file
+      as single lines, and the last line per hostname wins.  Only lines appended
+      since the last lookup are read.  Once the file holds more than
+      `journal_compaction_threshold` stale lines, it is compacted by atomically
+      replacing it with the latest record per hostname.
+    * CERT_STORE_MODE_SQLITE: the hosts file is a SQLite database in WAL mode,
+      which may be shared by many processes.
+
+    Any other storage may be plugged in by passing a `CertStorage` implementation.
+    Records are only written when they are new or different.
+
+    New records are fingerprinted by fingerprint mode:
+    * FINGERPRINT_MODE_OPENSSH: the OpenSSH public key string.
+    * FINGERPRINT_MODE_SHA256: the 32-byte SHA-256 digest of the
+      SubjectPublicKeyInfo, stored as hex.
+    Stored records are always checked against the fingerprint they were stored
+    with, and a matching record in the other format is rewritten in the current
+    one, so existing hosts files migrate as hosts are revisited.
     """
 
     __hosts_file: str
-    __cert_store_data: Dict[str, CertRecord]
-
-    def __init__(self, hosts_file):
+    __mode: str
+    __fingerprint_mode: str
+    __storage: CertStorage
+
+    def __init__(
+        self,
+        hosts_file,
+        mode=CERT_STORE_MODE_DEFAULT,
+        journal_compaction_threshold=DEFAULT_JOURNAL_COMPACTION_THRESHOLD,
+        storage: CertStorage = None,
+        fingerprint_mode=FINGERPRINT_MODE_OPENSSH,
+    ):
         """
         Initializes a new cert store with a specified file to store the certificate fingerprint & expiration dates
         """
-        self.__cert_store_data = {}
         self.__hosts_file = hosts_file
+        self.__mode = mode
+        self.__fingerprint_mode = validate_fingerprint_mode(fingerprint_mode)
+        self.__journal_compaction_threshold = journal_compaction_threshold
+        self.__storage = storage or create_cert_storage(
+            hosts_file, mode, journal_compaction_threshold
+        )
+        self.__lock = threading.Lock()
 
-    def set_hosts_file(self, hosts_file):
+    def set_hosts_file(self, hosts_file, mode=None, fingerprint_mode=None):
         """
-        Updates the specified file for certificate fingerprint storage
+        Updates the specified file for certificate fingerprint storage, and optionally the store & fingerprint modes
         """
-        self.__hosts_file = hosts_file
+        mode = mode if mode is not None else self.__mode
+        fingerprint_mode = validate_fingerprint_mode(
+            fingerprint_mode
+            if fingerprint_mode is not None
+            else self.__fingerprint_mode
+        )
+        storage = create_cert_storage(
+            hosts_file, mode, self.__journal_compaction_threshold
+        )
+        with self.__lock:
+            self.__storage.close()
+            self.__hosts_file = hosts_file
+            self.__mode = mode
+            self.__fingerprint_mode = fingerprint_mode
+            self.__storage = storage
+
+    def set_storage(self, storage: CertStorage):
+        """
+        Replaces the storage backend with a custom CertStorage implementation
+        """
+        with self.__lock:
+            self.__storage.close()
+            self.__hosts_file = None
+            self.__mode = None
+            self.__storage = storage
+
+    def close(self):
+        """
+        Releases the resources held by the storage backend
+        """
+        with self.__lock:
+            self.__storage.close()
+
+    def get_mode(self):
+        """
+        Returns the current store mode
+        """
+        return self.__mode
+
+    def get_fingerprint_mode(self):
+        """
+        Returns the fingerprint mode used for new records
+        """
+        return self.__fingerprint_mode
 
     def get_hosts_file(self):
         """
@@ -46,7 +138,9 @@ class CertStore:
         """
         return self.__hosts_file
 
-    def validate_tofu_or_add(self, hostname: str, cert: CertWrapper) -> bool:
+    def validate_tofu_or_add(
+        self, hostname: str, cert: CertWrapper, on_result=None
+    ) -> bool:
         """
         Given the hostname & correspoding certificate, this function:
         1. Checks to see if the certificate is expired (if so, it throws a RemoteCertificateExpired exception)
@@ -56,74 +150,65 @@ class CertStore:
           c. If there is a local cert record, but it's expired, save the certificate record locally, and return success
           d. If there is a local cert record, and it's not expired, but it does not match the passed certificate,
              throw TofuCertificateRejection
+
+        If an *on_result* callback is passed, it is called with the outcome (one of the TOFU_RESULT_* constants).
         """
-        remote_cert_record = CertRecord(hostname, cert.fingerprint(), cert.expiration())
+        if self.__fingerprint_mode == FINGERPRINT_MODE_SHA256:
+            fingerprint = cert.fingerprint_digest()
+        else:
+            fingerprint = cert.fingerprint()
+        remote_cert_record = CertRecord(hostname, fingerprint, cert.expiration())
 
         if remote_cert_record.is_expired():
+            if on_result is not None:
+                on_result(TOFU_RESULT_EXPIRED)
             raise RemoteCertificateExpired
 
-        local_cert_record = self.__get_cert_record(hostname)
-
-        if (
-            local_cert_record
-            and not local_cert_record.is_expired()
-            and local_cert_record.fingerprint != remote_cert_record.fingerprint
-        ):
-            raise TofuCertificateRejection
+        with self.__lock, self.__storage.transaction():
+            local_cert_record = self.__storage.get_record(hostname)
+            matches = local_cert_record is not None and fingerprint_matches(
+                local_cert_record, cert
+            )
 
-        self.__add_cert_record(remote_cert_record)
+            if local_cert_record and not local_cert_record.is_expired() and not matches:
+                if on_result is not None:
+                    on_result(TOFU_RESULT_REJECTED)
+                raise TofuCertificateRejection
+
+            result = TOFU_RESULT_TRUSTED
+            if local_cert_record is None:
+                self.__storage.put_record(remote_cert_record)
+                result = TOFU_RESULT_ADDED
+            elif (
+                not matches
+                or local_cert_record.expiration != remote_cert_record.expiration
+            ):
+                self.__storage.put_record(remote_cert_record)
+                result = TOFU_RESULT_UPDATED
+            elif isinstance(local_cert_record.fingerprint, bytes) != isinstance(
+                remote_cert_record.fingerprint, bytes
+            ):
+                # Same certificate, stored in the other fingerprint format
+                self.__storage.put_record(remote_cert_record)
+
+        if on_result is not None:
+            on_result(result)
         return True
 
-    def __get_cert_record(self, hostname: str) -> CertRecord:
-        """
-        Fetch the corresponding CertRecord for passed hostname from the local storage (file)
-        TODO: smarter loading logic
-        """
-        self.__load()
-        return self.__cert_store_data.get(hostname, None)
-
-    def __add_cert_record(self, cert_record: CertRecord):
-        """
-        Add a CertRecord for the corresponding hostname to local storage (file) and save to file
-        TODO: smarter saving logic
-        """
-        self.__cert_store_data[cert_record.hostname] = cert_record
-        self.__save()
-        return self
-
-    def __load(self):
-        """
-        Reloads the hosts file from storage and copies that into memory
-        """
-        file_lines = []
-        try:
-            with open(self.__hosts_file, "r", encoding="utf-8") as f:
-                file_lines = f.readlines()
-        except FileNotFoundError:
-            file_lines = []
-
-        for file_line in file_lines:
-            cert_record = self.__load_record(file_line)
-            if cert_record is not None:
-                self.__cert_store_data[cert_record.hostname] = cert_record
 
-        return self
-
-    def __load_record(self, file_line):
-        try:
-            return CertRecord.from_string(file_line)
-        except CertRecordParseException:
-            logger.warning(
-                f"Invalid TOFU record encountered: '{file_line.strip()}'. This record has been skipped."
-            )
-            return None
+def fingerprint_matches(cert_record: CertRecord, cert: CertWrapper) -> bool:
+    """
+    Compares the certificate against the fingerprint in the format the record was stored with
+    """
+    if isinstance(cert_record.fingerprint, bytes):
+        return hmac.compare_digest(cert_record.fingerprint, cert.fingerprint_digest())
+    return cert_record.fingerprint == cert.fingerprint()
 
-    def __save(self):
-        """
-        Saves the full set of host records back to file
-        """
-        with open(self.__hosts_file, "w", encoding="utf-8") as f:
-            for c in self.__cert_store_data.values():
-                f.write(c.to_string())
 
-        return self
+def validate_fingerprint_mode(fingerprint_mode: str) -> str:
+    """
+    Returns the fingerprint mode, or raises a ValueError if it is unknown
+    """
+    if fingerprint_mode not in (FINGERPRINT_MODE_OPENSSH, FINGERPRINT_MODE_SHA256):
+        raise ValueError(f"Unknown fingerprint mode: {fingerprint_mode}")
+    return fingerprint_mode
@@ -5,55 +5,154 @@ was not distributed with this file, You can obtain one
 at http://mozilla.org/MPL/2.0/.
 """
 
-import cryptography
-from cryptography import x509
-from cryptography.hazmat.backends import default_backend
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from ..globals import DEFAULT_CERTIFICATE_CACHE_SIZE
+
+if TYPE_CHECKING:
+    import cryptography.x509
 
 
 class CertWrapper:
     """
     Certificate as defined by x509
-    """
 
-    certificate: cryptography.x509.Certificate
+    The fingerprints & expiration date are computed once per certificate.
     """
-  Certificate fingerprint, to be used in TOFU handling and response
-  """
-    public_key_fingerprint: str
 
-    def __init__(self, certificate: cryptography.x509.Certificate):
+    __slots__ = (
+        "certificate",
+        "__fingerprint",
+        "__fingerprint_digest",
+        "__expiration",
+    )
+
+    certificate: "cryptography.x509.Certificate"
+
+    def __init__(self, certificate: "cryptography.x509.Certificate"):
         """
         Constructor
         """
         self.certificate = certificate
+        self.__fingerprint = None
+        self.__fingerprint_digest = None
+        self.__expiration = None
 
     def expiration(self) -> str:
         """
         Access function for certificate expiration date
         """
-        return self.certificate.not_valid_after
+        if self.__expiration is None:
+            self.__expiration = self.certificate.not_valid_after
+        return self.__expiration
 
     def fingerprint(self) -> str:
         """
         Extracts the public key & expiration date from the cert,
         and returns the public key openssh fingerprint
         """
-        return (
-            self.certificate.public_key()
-            .public_bytes(
-                cryptography.hazmat.primitives.serialization.Encoding.OpenSSH,
-                cryptography.hazmat.primitives.serialization.PublicFormat.OpenSSH,
+        if self.__fingerprint is None:
+            from cryptography.hazmat.primitives.serialization import (  # pylint:disable=import-outside-toplevel
+                Encoding,
+                PublicFormat,
             )
-            .decode("utf-8")
-        )
+
+            self.__fingerprint = (
+                self.certificate.public_key()
+                .public_bytes(Encoding.OpenSSH, PublicFormat.OpenSSH)
+                .decode("utf-8")
+            )
+        return self.__fingerprint
+
+    def fingerprint_digest(self) -> bytes:
+        """
+        Returns the 32-byte SHA-256 digest of the DER-encoded SubjectPublicKeyInfo,
+        a compact fingerprint of the public key
+        """
+        if self.__fingerprint_digest is None:
+            from cryptography.hazmat.primitives.serialization import (  # pylint:disable=import-outside-toplevel
+                Encoding,
+                PublicFormat,
+            )
+
+            self.__fingerprint_digest = hashlib.sha256(
+                self.certificate.public_key().public_bytes(
+                    Encoding.DER, PublicFormat.SubjectPublicKeyInfo
+                )
+            ).digest()
+        return self.__fingerprint_digest
 
     @classmethod
     def parse(cls, raw_certificate: bytes):
         """
         Takes as input the raw certificate (originally from the TCP socket)
-        Returns a certificate wrapper
+        Returns a certificate wrapper, shared with earlier parses of the same certificate
+        """
+        key = hashlib.sha256(raw_certificate).digest()
+        cert_wrapper = certificate_cache.get(key)
+        if cert_wrapper is None:
+            # cryptography is imported on first use, so that importing ignition stays fast
+            from cryptography import x509  # pylint:disable=import-outside-toplevel
+            from cryptography.hazmat.backends import (  # pylint:disable=import-outside-toplevel
+                default_backend,
+            )
+
+            x509_certificate = x509.load_der_x509_certificate(
+                raw_certificate, default_backend()
+            )
+            cert_wrapper = CertWrapper(x509_certificate)
+            certificate_cache.add(key, cert_wrapper)
+        return cert_wrapper
+
+
+class CertWrapperCache:
+    """
+    Bounded cache of parsed certificates, keyed by the SHA-256 digest of the raw
+    certificate, so repeat handshakes with a capsule skip the ASN.1 parse and the
+    public key serialization.  Entries are evicted least-recently-used once
+    `max_size` certificates are stored.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initializes an empty cache with a maximum number of certificates
         """
-        x509_certificate = x509.load_der_x509_certificate(
-            raw_certificate, default_backend()
-        )
-        return CertWrapper(x509_certificate)
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: bytes):
+        """
+        Returns the certificate wrapper stored for the digest, or None
+        """
+        with self.__lock:
+            cert_wrapper = self.__entries.get(key)
+            if cert_wrapper is not None:
+                self.__entries.move_to_end(key)
+            return cert_wrapper
+
+    def add(self, key: bytes, cert_wrapper: CertWrapper):
+        """
+        Stores the certificate wrapper for the digest, evicting the least recently used beyond the maximum size
+        """
+        with self.__lock:
+            self.__entries[key] = cert_wrapper
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops all stored certificates
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+certificate_cache = CertWrapperCache(DEFAULT_CERTIFICATE_CACHE_SIZE)
@@ -0,0 +1,94 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import os
+import ssl
+import threading
+
+logger = logging.getLogger(__name__)
+
+MINIMUM_TLS_VERSION = ssl.TLSVersion.TLSv1_2
+
+
+def create_ssl_context(ca_cert=None) -> ssl.SSLContext:
+    """
+    Setup an SSL default context, loading the cert chain for a client certificate if passed.
+    This will bypass certificate validation against a CA.
+    TOFU validation will be completed after the handshake is completed.
+    """
+
+    context = ssl.create_default_context()
+    context.minimum_version = MINIMUM_TLS_VERSION
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+
+    if ca_cert is not None:
+        cert, key = ca_cert
+        context.load_cert_chain(cert, key)
+
+    return context
+
+
+class SSLContextCache:
+    """
+    Cache of prepared SSL contexts, so that repeat requests do not pay for
+    context creation and loading client certificates from disk.
+
+    Contexts are keyed by the TLS settings and the client certificate identity
+    (the cert & key paths).  The size, mtime and inode of the cert & key files
+    are checked on each lookup, and the context is rebuilt if either changed.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty context cache
+        """
+        self.__contexts = {}
+        self.__lock = threading.Lock()
+
+    def get_context(self, ca_cert=None) -> ssl.SSLContext:
+        """
+        Returns the prepared SSL context for the client certificate (or no certificate)
+        """
+        identity = (MINIMUM_TLS_VERSION, tuple(ca_cert) if ca_cert else None)
+        try:
+            file_signature = self.__file_signature(ca_cert)
+        except OSError:
+            # Let the context setup raise the appropriate error for a missing file
+            return create_ssl_context(ca_cert)
+
+        with self.__lock:
+            cached = self.__contexts.get(identity)
+        if cached is not None and cached[0] == file_signature:
+            return cached[1]
+
+        logger.debug(f"Creating SSL context for client certificate {ca_cert}")
+        context = create_ssl_context(ca_cert)
+        with self.__lock:
+            self.__contexts[identity] = (file_signature, context)
+        return context
+
+    def clear(self):
+        """
+        Drops all cached contexts
+        """
+        with self.__lock:
+            self.__contexts.clear()
+
+    def __file_signature(self, ca_cert):
+        """
+        Cheap change detection for the client certificate files
+        """
+        if ca_cert is None:
+            return None
+
+        signature = []
+        for filename in ca_cert:
+            stat = os.stat(filename)
+            signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
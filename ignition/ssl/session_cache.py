@@ -0,0 +1,104 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import ssl
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class SSLSessionCache:
+    """
+    Bounded store of TLS sessions per host, used to resume sessions
+    and skip a full handshake on repeat requests to the same capsule.
+
+    Sessions are evicted least-recently-used once `max_size` hosts are stored,
+    and expire after `ttl` seconds (or the server's session lifetime, if shorter).
+    A session can only be resumed with the SSL context that created it, so
+    sessions created with a different context are never offered.
+
+    `hits` counts handshakes that resumed a cached session and `misses`
+    counts handshakes that needed a full negotiation.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Initializes an empty session cache with a maximum number of hosts and session lifetime (seconds)
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__sessions = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_session(self, netloc: str, context: ssl.SSLContext):
+        """
+        Returns a resumable session for the host & context, or None
+        """
+        with self.__lock:
+            entry = self.__sessions.get(netloc)
+            if entry is None:
+                return None
+
+            session, session_context, expires_at = entry
+            if session_context is not context or expires_at < time.monotonic():
+                del self.__sessions[netloc]
+                return None
+
+            self.__sessions.move_to_end(netloc)
+            return session
+
+    def set_session(self, netloc: str, context: ssl.SSLContext, session):
+        """
+        Stores the session negotiated with the host for later resumption
+        """
+        if session is None:
+            return
+
+        expires_at = time.monotonic() + min(self.__ttl, session.timeout or self.__ttl)
+        with self.__lock:
+            self.__sessions[netloc] = (session, context, expires_at)
+            self.__sessions.move_to_end(netloc)
+            while len(self.__sessions) > self.__max_size:
+                self.__sessions.popitem(last=False)
+
+    def record_handshake(self, resumed: bool):
+        """
+        Counts a completed handshake as a resumption hit or miss
+        """
+        with self.__lock:
+            if resumed:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Returns the resumption counters and the number of stored sessions
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.__sessions),
+            }
+
+    def clear(self):
+        """
+        Drops all stored sessions and resets the counters
+        """
+        with self.__lock:
+            self.__sessions.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,164 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+
+from .exceptions import ResponseBodyTooLarge
+from .globals import DEFAULT_STREAM_CHUNK_SIZE
+from .timings import RequestTimings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseStream:
+    """
+    Response body that is read on demand from the open TLS socket,
+    instead of being buffered in memory before the response is returned.
+
+    The socket is closed once the body has been read to the end, or when
+    `close()` is called.  If `max_bytes` is set, reading more than `max_bytes`
+    closes the socket and raises ResponseBodyTooLarge.  If a request `deadline`
+    is set, every read is bounded by the time left until the deadline.
+    If request `timings` are passed, the end of the body is recorded on them.
+    If an `on_close` callback is passed, it is called once when the socket is closed.
+    """
+
+    bytes_read: int
+
+    def __init__(
+        self,
+        secure_socket,
+        fd,
+        max_bytes=None,
+        deadline=None,
+        timings=None,
+        on_close=None,
+    ):
+        """
+        Initializes the stream with the TLS socket and the buffered reader the header was read from
+        """
+        self.__secure_socket = secure_socket
+        self.__fd = fd
+        self.__max_bytes = max_bytes
+        self.__deadline = deadline
+        self.__timings = timings
+        self.__on_close = on_close
+        self.__closed = False
+        self.bytes_read = 0
+
+    @property
+    def closed(self):
+        """
+        True once the stream has been read to the end or closed
+        """
+        return self.__closed
+
+    def read(self, size=-1) -> bytes:
+        """
+        Reads up to *size* bytes from the body, or the rest of the body if *size* is negative.
+        Returns an empty bytestring at the end of the body.
+        """
+        if self.__closed or size == 0:
+            return b""
+
+        if size < 0:
+            chunks = []
+            chunk = self.read(DEFAULT_STREAM_CHUNK_SIZE)
+            while chunk:
+                chunks.append(chunk)
+                chunk = self.read(DEFAULT_STREAM_CHUNK_SIZE)
+            return b"".join(chunks)
+
+        if self.__max_bytes is not None:
+            # Never read further than one byte past the limit
+            size = min(size, self.__max_bytes - self.bytes_read + 1)
+
+        self.__set_read_timeout()
+        data = self.__fd.read1(size)
+        self.bytes_read += len(data)
+        self.__check_max_bytes()
+        if not data:
+            self.__end()
+        return data
+
+    def readinto(self, buffer) -> int:
+        """
+        Reads body bytes directly into a pre-allocated, writable buffer (e.g. a `bytearray` or `memoryview`).
+        Returns the number of bytes read, or 0 at the end of the body.
+        """
+        if self.__closed:
+            return 0
+
+        if self.__max_bytes is not None:
+            buffer = memoryview(buffer)[: self.__max_bytes - self.bytes_read + 1]
+
+        self.__set_read_timeout()
+        length = self.__fd.readinto1(buffer)
+        self.bytes_read += length
+        self.__check_max_bytes()
+        if not length:
+            self.__end()
+        return length
+
+    def iter_content(self, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+        """
+        Generator yielding the body in chunks of at most *chunk_size* bytes.
+        The socket is closed when iteration ends, including if it is abandoned early.
+        """
+        try:
+            while True:
+                chunk = self.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            self.close()
+
+    def __end(self):
+        """
+        Closes the stream once the body has been read to the end
+        """
+        if self.__timings is not None:
+            self.__timings.mark(RequestTimings.BODY)
+        self.close()
+
+    def __set_read_timeout(self):
+        """
+        Bounds the next socket read by the request deadline
+        """
+        if self.__deadline is not None:
+            self.__secure_socket.settimeout(self.__deadline.read())
+
+    def __check_max_bytes(self):
+        """
+        Stops reading once the body grows past the maximum body size
+        """
+        if self.__max_bytes is not None and self.bytes_read > self.__max_bytes:
+            self.close()
+            raise ResponseBodyTooLarge(
+                f"Response body exceeds the maximum of {self.__max_bytes} bytes"
+            )
+
+    def close(self):
+        """
+        Closes the underlying socket
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        logger.debug(f"Closing response stream after {self.bytes_read} bytes")
+        self.__fd.close()
+        self.__secure_socket.close()
+        if self.__on_close is not None:
+            self.__on_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,87 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class RequestTimings:
+    """
+    Monotonic timestamps for the phases of a single request.
+
+    The phases, in order, are:
+    * dns: resolving the host
+    * connect: establishing the TCP connection
+    * handshake: negotiating TLS
+    * tofu: validating the server certificate
+    * first_byte: sending the request and receiving the response header
+    * body: reading the response body
+
+    `timestamps` maps each completed phase to the `time.monotonic()` value at which
+    it completed, and `started_at` is the value when the request started.  If the
+    request failed, `failed_phase` is the first phase that did not complete.
+    """
+
+    DNS = "dns"
+    CONNECT = "connect"
+    HANDSHAKE = "handshake"
+    TOFU = "tofu"
+    FIRST_BYTE = "first_byte"
+    BODY = "body"
+    PHASES = (DNS, CONNECT, HANDSHAKE, TOFU, FIRST_BYTE, BODY)
+
+    started_at: float
+    timestamps: Dict[str, float]
+    failed_phase: Optional[str]
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.timestamps = {}
+        self.failed_phase = None
+
+    def mark(self, phase: str):
+        """
+        Records that a phase completed now
+        """
+        self.timestamps[phase] = time.monotonic()
+
+    def mark_failed(self):
+        """
+        Records the first phase that did not complete as the failed phase
+        """
+        for phase in self.PHASES:
+            if phase not in self.timestamps:
+                self.failed_phase = phase
+                return
+
+    def durations(self) -> Dict[str, float]:
+        """
+        Returns the duration (in seconds) of each completed phase, in phase order
+        """
+        durations = {}
+        previous = self.started_at
+        for phase in self.PHASES:
+            if phase not in self.timestamps:
+                break
+            durations[phase] = self.timestamps[phase] - previous
+            previous = self.timestamps[phase]
+        return durations
+
+    def total(self) -> float:
+        """
+        Returns the time (in seconds) from the start of the request until the last completed phase
+        """
+        if not self.timestamps:
+            return 0.0
+        return max(self.timestamps.values()) - self.started_at
+
+    def __repr__(self):
+        durations = ", ".join(
+            f"{phase}={duration * 1000:.1f}ms"
+            for phase, duration in self.durations().items()
+        )
+        return f"<RequestTimings {durations}>"
@@ -6,13 +6,31 @@ at http://mozilla.org/MPL/2.0/.
 """
 
 import logging
+import string
+from collections import namedtuple
+from functools import lru_cache
 
-from .globals import GEMINI_PORT, GEMINI_SCHEME
-from .python import urllib
+from .globals import DEFAULT_URL_CACHE_SIZE, GEMINI_PORT, GEMINI_SCHEME
 from .util import normalize_path
 
 logger = logging.getLogger(__name__)
 
+GEMINI_PREFIX = f"{GEMINI_SCHEME}://"
+
+# Characters the fast path parses directly.  Urls with any other character
+# (whitespace, userinfo, IPv6 literals, path parameters, non-ascii...) go
+# through the vendored urllib instead, which handles their edge cases.
+FAST_PATH_CHARACTERS = frozenset(
+    string.ascii_letters + string.digits + "-._~/?#!$&'()*+,=%:"
+)
+
+ParsedURL = namedtuple(
+    "ParsedURL", ["scheme", "netloc", "host", "port", "path", "query", "url"]
+)
+ParsedURL.__doc__ = """
+Immutable record of a parsed url, with the normalized path and the full url string
+"""
+
 
 class URL:
     """
@@ -20,36 +38,25 @@ class URL:
 
     This logic prepares the URL to be passed via the socket connector,
     as well as for the data payload for Gemini.
+
+    Urls are parsed once into an immutable record, which is shared between URL
+    objects constructed from the same url & referer.
     """
 
+    __slots__ = ("__parsed_url",)
+
     def __init__(self, url, referer_url=None):
         """
         Construct a protocool-safe URL based on the passed string.
         """
-        self.__parsed_url = self.__url_constructor(url, referer_url)
+        self.__parsed_url = parse_url(url, referer_url)
 
-        logger.debug(
-            (
-                f"Recieved url {url} for parsing, {f'with referer {referer_url}, ' if referer_url else ''} generated gemini url: {self}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                (
+                    f"Recieved url {url} for parsing, {f'with referer {referer_url}, ' if referer_url else ''} generated gemini url: {self}"
+                )
             )
-        )
-
-    def __url_constructor(self, url, referer_url):
-        """
-        Constructs a protocol-safe URL based on the passed string.
-
-        If referer_url is included (which should be the constructed
-        URL from the last time this ran), the new url is joined onto
-        the referer.  This allows the user to pass in paths without a
-        hostname.
-        """
-
-        url = url.lstrip()
-        base_url = url
-        if referer_url:
-            base_url = urllib.parse.urljoin(referer_url, url, False)
-
-        return urllib.parse.urlsplit(base_url, GEMINI_SCHEME, False)
 
     def __str__(self):
         """
@@ -57,15 +64,7 @@ class URL:
         TODO url = 'about:blank', 'example:test' RFC-6694 and RFC-7585
         """
 
-        return "".join(
-            [
-                self.protocol(),
-                self.host(),
-                (f":{self.port()}" if self.port() != GEMINI_PORT else ""),
-                self.path(),
-                (f"?{self.query()}" if self.query() else ""),
-            ]
-        )
+        return self.__parsed_url.url
 
     def path(self):
         """
@@ -73,7 +72,7 @@ class URL:
         URL Schema: scheme://host:port/path?query
         """
 
-        return normalize_path(self.__parsed_url.path or "")
+        return self.__parsed_url.path
 
     def host(self):
         """
@@ -81,7 +80,7 @@ class URL:
         URL Schema: scheme://host:port/path?query
         """
 
-        return self.__parsed_url.hostname or ""
+        return self.__parsed_url.host
 
     def port(self):
         """
@@ -89,14 +88,7 @@ class URL:
         URL Schema: scheme://host:port/path?query
         """
 
-        try:
-            return self.__parsed_url.port or GEMINI_PORT
-        except ValueError:
-            # https://docs.python.org/3/library/urllib.parse.html#urllib.parse.urlsplit
-            logger.warning(
-                f"There was an error reading the port from the url. Defaulting to {GEMINI_PORT}"
-            )
-            return GEMINI_PORT
+        return self.__parsed_url.port
 
     def netloc(self):
         """
@@ -120,3 +112,197 @@ class URL:
         URL Schema: scheme://host:port/path?query
         """
         return self.__parsed_url.query
+
+
+@lru_cache(maxsize=DEFAULT_URL_CACHE_SIZE)
+def parse_url(url, referer_url=None) -> ParsedURL:
+    """
+    Parses a url, joined onto the referer url if passed, into a ParsedURL.
+
+    If referer_url is included (which should be the constructed
+    URL from the last time this ran), the new url is joined onto
+    the referer.  This allows the user to pass in paths without a
+    hostname.
+
+    Plain Gemini urls are parsed directly, and anything else falls back to the
+    vendored urllib.  Results are cached, so repeated links are parsed once.
+    """
+
+    url = url.lstrip()
+    if referer_url:
+        parsed_url = join_gemini_url(referer_url, url)
+    else:
+        parsed_url = split_gemini_url(url)
+
+    if parsed_url is None:
+        parsed_url = split_url(url, referer_url)
+    return parsed_url
+
+
+def split_url(url, referer_url):
+    """
+    Parses a url through the vendored urllib, which supports any url
+    """
+    # Imported on first use, so plain Gemini urls never load it
+    from .python import urllib  # pylint:disable=import-outside-toplevel
+
+    base_url = url
+    if referer_url:
+        base_url = urllib.parse.urljoin(referer_url, url, False)
+
+    parsed_url = urllib.parse.urlsplit(base_url, GEMINI_SCHEME, False)
+
+    try:
+        port = parsed_url.port or GEMINI_PORT
+    except ValueError:
+        # https://docs.python.org/3/library/urllib.parse.html#urllib.parse.urlsplit
+        logger.warning(
+            f"There was an error reading the port from the url. Defaulting to {GEMINI_PORT}"
+        )
+        port = GEMINI_PORT
+
+    return create_parsed_url(
+        parsed_url.scheme,
+        parsed_url.netloc,
+        parsed_url.hostname or "",
+        port,
+        parsed_url.path or "",
+        parsed_url.query,
+    )
+
+
+def split_gemini_url(url):
+    """
+    Parses an absolute (or scheme-relative) Gemini url directly,
+    or returns None if the url needs the vendored urllib
+    """
+
+    parts = split_gemini_parts(url)
+    if parts is None:
+        return None
+    return create_parsed_url(GEMINI_SCHEME, *parts)
+
+
+def split_gemini_parts(url):
+    """
+    Splits an absolute (or scheme-relative) Gemini url into its netloc, host, port, raw path and query,
+    or returns None if the url needs the vendored urllib
+    """
+
+    if url.startswith(GEMINI_PREFIX):
+        rest = url[len(GEMINI_PREFIX) :]
+    elif url.startswith("//"):
+        rest = url[2:]
+    else:
+        return None
+    if not FAST_PATH_CHARACTERS.issuperset(url):
+        return None
+
+    netloc_end = len(rest)
+    for delimiter in "/?#":
+        index = rest.find(delimiter)
+        if 0 <= index < netloc_end:
+            netloc_end = index
+    netloc = rest[:netloc_end]
+    path, _, query = rest[netloc_end:].partition("?")
+
+    host, separator, port = netloc.partition(":")
+    if not host:
+        return None
+    if separator:
+        if not port.isdigit() or len(port) > 5 or int(port) > 65535:
+            return None
+        port = int(port) or GEMINI_PORT
+    else:
+        port = GEMINI_PORT
+
+    return netloc, host.lower(), port, path, query
+
+
+def join_gemini_url(referer_url, url):
+    """
+    Joins a url onto a Gemini referer url (as `urllib.parse.urljoin` does),
+    or returns None if either url needs the vendored urllib
+    """
+
+    base = split_gemini_parts(referer_url)
+    if base is None or not FAST_PATH_CHARACTERS.issuperset(url):
+        return None
+    if not url:
+        return create_parsed_url(GEMINI_SCHEME, *base)
+    if url.startswith(GEMINI_PREFIX) and not referer_url.startswith(GEMINI_PREFIX):
+        # A scheme-relative referer has no scheme to join with, so the url is taken as is
+        return split_gemini_url(url)
+
+    if url.startswith(GEMINI_PREFIX) or url.startswith("//"):
+        parts = split_gemini_parts(url)
+        if parts is None:
+            return None
+        netloc, host, port, path, query = parts
+    else:
+        path, _, query = url.partition("?")
+        if ":" in path.partition("/")[0]:
+            # The url may have a scheme of its own
+            return None
+        netloc, host, port, base_path, base_query = base
+        if path:
+            path = merge_paths(base_path, path)
+        else:
+            path = base_path
+            query = query or base_query
+
+    # Urls with a host always have an absolute path once re-joined
+    if path and path[0] != "/":
+        path = "/" + path
+    return create_parsed_url(GEMINI_SCHEME, netloc, host, port, path, query)
+
+
+def merge_paths(base_path, path):
+    """
+    Resolves a path relative to the base path, as `urllib.parse.urljoin` does
+    """
+
+    base_parts = base_path.split("/")
+    if base_parts[-1] != "":
+        # the last item is not a directory, so will not be taken into account
+        # in resolving the relative path
+        del base_parts[-1]
+
+    if path[:1] == "/":
+        segments = path.split("/")
+    else:
+        segments = base_parts + path.split("/")
+        # filter out elements that would cause redundant slashes on re-joining
+        # the resolved_path
+        segments[1:-1] = filter(None, segments[1:-1])
+
+    resolved_path = []
+    for segment in segments:
+        if segment == "..":
+            if resolved_path:
+                resolved_path.pop()
+        elif segment != ".":
+            resolved_path.append(segment)
+
+    if segments[-1] in (".", ".."):
+        resolved_path.append("")
+
+    return "/".join(resolved_path) or "/"
+
+
+def create_parsed_url(scheme, netloc, host, port, path, query) -> ParsedURL:
+    """
+    Builds a ParsedURL with the normalized path and the full url string
+    """
+
+    path = normalize_path(path)
+    url = "".join(
+        [
+            f"{scheme}://",
+            host,
+            (f":{port}" if port != GEMINI_PORT else ""),
+            path,
+            (f"?{query}" if query else ""),
+        ]
+    )
+    return ParsedURL(scheme, netloc, host, port, path, query, url)
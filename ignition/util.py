@@ -6,6 +6,8 @@ at http://mozilla.org/MPL/2.0/.
 """
 
 import logging
+import time
+from socket import timeout as SocketTimeoutException
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,100 @@ def normalize_path(path: str) -> str:
     return unescaped_path.replace("//", "/")
 
 
+class TimeoutBudget:
+    """
+    Time budgets (in seconds) for the phases of a single request:
+    * timeout: applies to each socket operation, unless a phase has its own budget
+    * connect_timeout: TCP connection
+    * handshake_timeout: TLS handshake
+    * first_byte_timeout: from sending the request until the response header arrives
+    * total_timeout: deadline for the whole request, including reading the body
+
+    A budget of None falls back to `timeout` (or, for `total_timeout`, no deadline).
+    The budget can be shared across requests; `start()` begins the clock for one request.
+    """
+
+    def __init__(
+        self,
+        timeout,
+        connect_timeout=None,
+        handshake_timeout=None,
+        first_byte_timeout=None,
+        total_timeout=None,
+    ):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.handshake_timeout = handshake_timeout
+        self.first_byte_timeout = first_byte_timeout
+        self.total_timeout = total_timeout
+
+    def start(self):
+        """
+        Starts the deadline for a request now
+        """
+        return RequestDeadline(self)
+
+
+class RequestDeadline:
+    """
+    Running deadline for a single request.
+
+    Each phase method returns the socket timeout for the next operation of that
+    phase: the phase budget, capped by the time left until the total deadline.
+    Once the total deadline has passed, these raise socket.timeout so the request
+    fails the same way as any other socket timeout.
+    """
+
+    def __init__(self, budget: TimeoutBudget):
+        self.__budget = budget
+        self.__started_at = time.monotonic()
+
+    def connect(self):
+        """
+        Timeout for establishing the TCP connection
+        """
+        return self.__cap(self.__phase_timeout(self.__budget.connect_timeout))
+
+    def handshake(self):
+        """
+        Timeout for the TLS handshake
+        """
+        return self.__cap(self.__phase_timeout(self.__budget.handshake_timeout))
+
+    def first_byte(self):
+        """
+        Timeout for sending the request and receiving the response header
+        """
+        return self.__cap(self.__phase_timeout(self.__budget.first_byte_timeout))
+
+    def read(self):
+        """
+        Timeout for each read of the response body
+        """
+        return self.__cap(self.__budget.timeout)
+
+    def remaining(self):
+        """
+        Seconds left until the total deadline, or None if there is no total deadline
+        """
+        if self.__budget.total_timeout is None:
+            return None
+        return self.__budget.total_timeout - (time.monotonic() - self.__started_at)
+
+    def __phase_timeout(self, phase_timeout):
+        return phase_timeout if phase_timeout is not None else self.__budget.timeout
+
+    def __cap(self, timeout):
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise SocketTimeoutException("Request deadline exceeded")
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+
 class TimeoutManager:
     """
     Timeout Manager for global timeout management at the top-level
@@ -59,6 +155,7 @@ class TimeoutManager:
         Sets a default timeout on initialization
         """
         self.set_default_timeout(default_timeout)
+        self.set_default_budgets()
 
     def set_default_timeout(self, default_timeout):
         """
@@ -73,3 +170,34 @@ class TimeoutManager:
         if timeout is not None:
             return timeout
         return self.default_timeout
+
+    def set_default_budgets(
+        self,
+        connect_timeout=None,
+        handshake_timeout=None,
+        first_byte_timeout=None,
+        total_timeout=None,
+    ):
+        """
+        Allow the default per-phase budgets to be overwritten
+        """
+        self.default_connect_timeout = connect_timeout
+        self.default_handshake_timeout = handshake_timeout
+        self.default_first_byte_timeout = first_byte_timeout
+        self.default_total_timeout = total_timeout
+
+    def get_budget(self, timeout, total_timeout=None) -> TimeoutBudget:
+        """
+        Takes in a timeout & total deadline and returns a TimeoutBudget, falling back to the defaults
+        """
+        return TimeoutBudget(
+            self.get_timeout(timeout),
+            connect_timeout=self.default_connect_timeout,
+            handshake_timeout=self.default_handshake_timeout,
+            first_byte_timeout=self.default_first_byte_timeout,
+            total_timeout=(
+                total_timeout
+                if total_timeout is not None
+                else self.default_total_timeout
+            ),
+        )
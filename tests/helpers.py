@@ -5,7 +5,17 @@ was not distributed with this file, You can obtain one
 at http://mozilla.org/MPL/2.0/.
 """
 
+import datetime
 import os
+import socket
+import ssl
+import tempfile
+import threading
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
 
 
 def load_fixture_bytes(filename: str) -> bytes:
@@ -15,3 +25,99 @@ def load_fixture_bytes(filename: str) -> bytes:
     fixture_path = os.path.join(os.path.dirname(__file__), "./fixtures", filename)
     with open(fixture_path, "rb") as fixture_handler:
         return fixture_handler.read()
+
+
+def generate_self_signed_cert(directory: str, hostname: str = "localhost"):
+    """
+    Generate a short-lived self-signed certificate & key into the directory
+    Returns a tuple of (cert_file, key_file)
+    """
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostname)])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_file = os.path.join(directory, "cert.pem")
+    key_file = os.path.join(directory, "key.pem")
+    with open(cert_file, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption(),
+            )
+        )
+    return cert_file, key_file
+
+
+class GeminiTestServer:
+    """
+    Minimal threaded Gemini server on localhost for end-to-end tests.
+
+    Every request is answered with the same raw response bytes, and
+    the received request lines are recorded in `requests`.  If `drip_delay`
+    is set, the server then keeps sending one more byte every `drip_delay`
+    seconds, like a slow-drip server that never finishes the body.
+    """
+
+    def __init__(self, response: bytes, drip_delay=None):
+        self.response = response
+        self.drip_delay = drip_delay
+        self.requests = []
+        self.__tempdir = tempfile.TemporaryDirectory()
+        cert_file, key_file = generate_self_signed_cert(self.__tempdir.name)
+        self.__context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.__context.load_cert_chain(cert_file, key_file)
+        self.__listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__listener.bind(("127.0.0.1", 0))
+        self.__listener.listen()
+        self.__listener.settimeout(0.05)
+        self.__stopped = threading.Event()
+        self.port = self.__listener.getsockname()[1]
+        self.__thread = threading.Thread(target=self.__serve, daemon=True)
+
+    @property
+    def url(self):
+        return f"gemini://localhost:{self.port}/"
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.__stopped.set()
+        self.__thread.join(timeout=5)
+        self.__listener.close()
+        self.__tempdir.cleanup()
+
+    def __serve(self):
+        while not self.__stopped.is_set():
+            try:
+                conn, _ = self.__listener.accept()
+            except socket.timeout:
+                continue
+            threading.Thread(target=self.__handle, args=(conn,), daemon=True).start()
+
+    def __handle(self, conn):
+        try:
+            with self.__context.wrap_socket(conn, server_side=True) as tls:
+                self.requests.append(tls.makefile("rb").readline())
+                tls.sendall(self.response)
+                while self.drip_delay is not None and not self.__stopped.wait(
+                    self.drip_delay
+                ):
+                    tls.sendall(b"x")
+                tls.unwrap()
+        except (OSError, ssl.SSLError):
+            pass
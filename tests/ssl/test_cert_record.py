@@ -54,6 +54,31 @@ def test_to_string():
     )
 
 
+def test_sha256_fingerprint_round_trip():
+    digest = bytes(range(32))
+    cert_record = CertRecord("myhostname.sample", digest, test_datetime)
+    host_string = cert_record.to_string()
+
+    assert host_string == (
+        "myhostname.sample sha256:"
+        + digest.hex()
+        + ";EXPIRES=2020-11-15T12:15:02.438000\n"
+    )
+    assert CertRecord.from_string(host_string).fingerprint == digest
+
+
+def test_sha256_fingerprint_invalid():
+    with pytest.raises(CertRecordParseException):
+        CertRecord.from_string(
+            "myhost.com sha256:nothex;EXPIRES=2020-11-15T12:15:02.438000\n"
+        )
+
+    with pytest.raises(CertRecordParseException):
+        CertRecord.from_string(
+            "myhost.com sha256:abcd;EXPIRES=2020-11-15T12:15:02.438000\n"
+        )
+
+
 @mock.patch("ignition.ssl.cert_record.datetime")
 def test_is_expired(datetime_mock):
     mocked_date_value = datetime.datetime(2020, 1, 1, 0, 0, 0, 0)
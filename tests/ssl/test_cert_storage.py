@@ -0,0 +1,183 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import datetime
+import sqlite3
+
+import mock
+import pytest
+
+from ignition.exceptions import TofuCertificateRejection
+from ignition.globals import (
+    CERT_STORE_MODE_DEFAULT,
+    CERT_STORE_MODE_INDEXED,
+    CERT_STORE_MODE_JOURNAL,
+    CERT_STORE_MODE_SQLITE,
+)
+from ignition.ssl.cert_record import CertRecord
+from ignition.ssl.cert_storage import (
+    CertStorage,
+    FileCertStorage,
+    IndexedFileCertStorage,
+    JournalFileCertStorage,
+    SQLiteCertStorage,
+    create_cert_storage,
+)
+from ignition.ssl.cert_store import CertStore
+
+test_datetime = datetime.datetime(2030, 11, 15, 12, 15, 2, 438000)
+
+
+@pytest.mark.parametrize(
+    "mode,storage_class",
+    [
+        (CERT_STORE_MODE_DEFAULT, FileCertStorage),
+        (CERT_STORE_MODE_INDEXED, IndexedFileCertStorage),
+        (CERT_STORE_MODE_JOURNAL, JournalFileCertStorage),
+        (CERT_STORE_MODE_SQLITE, SQLiteCertStorage),
+    ],
+)
+def test_create_cert_storage(tmp_path, mode, storage_class):
+    storage = create_cert_storage(str(tmp_path / "hosts"), mode, 10)
+    assert isinstance(storage, storage_class)
+
+    assert storage.get_record("host") is None
+    storage.put_record(CertRecord("host", "ssh-rsa a", test_datetime))
+    record = storage.get_record("host")
+    assert (record.hostname, record.fingerprint, record.expiration) == (
+        "host",
+        "ssh-rsa a",
+        test_datetime,
+    )
+    storage.close()
+
+
+def test_create_cert_storage_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        create_cert_storage(str(tmp_path / "hosts"), "invalid", 10)
+
+
+@pytest.fixture
+def sqlite_storages():
+    """
+    Closes the SQLite storages a test opens
+    """
+    storages = []
+
+    def open_storage(database_file, **kwargs):
+        storage = SQLiteCertStorage(database_file, **kwargs)
+        storages.append(storage)
+        return storage
+
+    yield open_storage
+    for storage in storages:
+        storage.close()
+
+
+def test_cert_storage_is_abstract():
+    with pytest.raises(TypeError):
+        CertStorage()  # pylint:disable=abstract-class-instantiated
+
+
+def test_sqlite_storage_upserts(tmp_path, sqlite_storages):
+    database_file = str(tmp_path / "hosts.db")
+    storage = sqlite_storages(database_file)
+    storage.put_record(CertRecord("host", "ssh-rsa a", test_datetime))
+    storage.put_record(CertRecord("host", "ssh-rsa b", test_datetime))
+
+    # A second process sees the same records
+    other_storage = sqlite_storages(database_file)
+    assert other_storage.get_record("host").fingerprint == "ssh-rsa b"
+
+    connection = sqlite3.connect(database_file)
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert connection.execute("SELECT COUNT(*) FROM cert_records").fetchone() == (
+            1,
+        )
+    finally:
+        connection.close()
+
+
+def test_sqlite_storage_transaction_is_exclusive(tmp_path, sqlite_storages):
+    database_file = str(tmp_path / "hosts.db")
+    storage = sqlite_storages(database_file)
+    other_storage = sqlite_storages(database_file, timeout=0.1)
+
+    with storage.transaction():
+        assert storage.get_record("host") is None
+        # Another process cannot start its own check until this one is done
+        with pytest.raises(sqlite3.OperationalError):
+            with other_storage.transaction():
+                pass
+        storage.put_record(CertRecord("host", "ssh-rsa a", test_datetime))
+
+    with other_storage.transaction():
+        assert other_storage.get_record("host").fingerprint == "ssh-rsa a"
+
+
+def test_sqlite_storage_transaction_rolls_back(tmp_path, sqlite_storages):
+    storage = sqlite_storages(str(tmp_path / "hosts.db"))
+
+    with pytest.raises(ValueError):
+        with storage.transaction():
+            storage.put_record(CertRecord("host", "ssh-rsa a", test_datetime))
+            raise ValueError
+
+    assert storage.get_record("host") is None
+
+
+def test_sqlite_storage_sha256_fingerprint(tmp_path, sqlite_storages):
+    database_file = str(tmp_path / "hosts.db")
+    digest = bytes(range(32))
+    sqlite_storages(database_file).put_record(CertRecord("host", digest, test_datetime))
+
+    assert sqlite_storages(database_file).get_record("host").fingerprint == digest
+
+
+def test_cert_store_with_sqlite(tmp_path):
+    database_file = str(tmp_path / "hosts.db")
+    cert = mock.Mock(
+        fingerprint=mock.Mock(return_value="ssh-rsa a"),
+        expiration=mock.Mock(return_value=test_datetime),
+    )
+    other_cert = mock.Mock(
+        fingerprint=mock.Mock(return_value="ssh-rsa b"),
+        expiration=mock.Mock(return_value=test_datetime),
+    )
+
+    first_store = CertStore(database_file, mode=CERT_STORE_MODE_SQLITE)
+    store = CertStore(database_file, mode=CERT_STORE_MODE_SQLITE)
+    try:
+        first_store.validate_tofu_or_add("host", cert)
+
+        assert store.validate_tofu_or_add("host", cert)
+        with pytest.raises(TofuCertificateRejection):
+            store.validate_tofu_or_add("host", other_cert)
+    finally:
+        first_store.close()
+        store.close()
+
+
+def test_cert_store_with_custom_storage():
+    storage = mock.MagicMock(spec=CertStorage)
+    storage.get_record.return_value = None
+    cert = mock.Mock(
+        fingerprint=mock.Mock(return_value="ssh-rsa a"),
+        expiration=mock.Mock(return_value=test_datetime),
+    )
+
+    store = CertStore(None)
+    store.set_storage(storage)
+    store.validate_tofu_or_add("host", cert)
+
+    storage.transaction.assert_called_once_with()
+    storage.get_record.assert_called_once_with("host")
+    assert storage.put_record.call_args[0][0].fingerprint == "ssh-rsa a"
+    assert store.get_hosts_file() is None
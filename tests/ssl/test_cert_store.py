@@ -0,0 +1,280 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import datetime
+import hashlib
+import os
+
+import mock
+import pytest
+
+from ignition.exceptions import RemoteCertificateExpired, TofuCertificateRejection
+from ignition.globals import (
+    CERT_STORE_MODE_DEFAULT,
+    CERT_STORE_MODE_INDEXED,
+    CERT_STORE_MODE_JOURNAL,
+    FINGERPRINT_MODE_OPENSSH,
+    FINGERPRINT_MODE_SHA256,
+    TOFU_RESULT_ADDED,
+    TOFU_RESULT_EXPIRED,
+    TOFU_RESULT_REJECTED,
+    TOFU_RESULT_TRUSTED,
+    TOFU_RESULT_UPDATED,
+)
+from ignition.ssl.cert_record import CertRecord
+from ignition.ssl.cert_store import CertStore
+
+future_datetime = datetime.datetime.now() + datetime.timedelta(days=30)
+past_datetime = datetime.datetime(2018, 1, 1, 0, 0, 0, 0)
+
+
+def fake_cert(fingerprint, expiration=future_datetime):
+    return mock.Mock(
+        fingerprint=mock.Mock(return_value=fingerprint),
+        fingerprint_digest=mock.Mock(
+            return_value=hashlib.sha256(fingerprint.encode()).digest()
+        ),
+        expiration=mock.Mock(return_value=expiration),
+    )
+
+
+@pytest.fixture
+def hosts_file(tmp_path):
+    return str(tmp_path / "known_hosts")
+
+
+def read_records(hosts_file):
+    with open(hosts_file, encoding="utf-8") as f:
+        return [CertRecord.from_string(line) for line in f]
+
+
+ALL_MODES = [CERT_STORE_MODE_DEFAULT, CERT_STORE_MODE_INDEXED, CERT_STORE_MODE_JOURNAL]
+
+
+@pytest.mark.parametrize("mode", ALL_MODES)
+def test_trust_on_first_use(hosts_file, mode):
+    store = CertStore(hosts_file, mode=mode)
+
+    assert store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"))
+    assert store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"))
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa second"))
+
+    records = read_records(hosts_file)
+    assert [(r.hostname, r.fingerprint) for r in records] == [("host", "ssh-rsa first")]
+
+
+def test_tofu_results(hosts_file):
+    results = []
+    store = CertStore(hosts_file)
+
+    store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"), results.append)
+    store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"), results.append)
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa second"), results.append)
+    with pytest.raises(RemoteCertificateExpired):
+        store.validate_tofu_or_add(
+            "host", fake_cert("ssh-rsa first", past_datetime), results.append
+        )
+    store.validate_tofu_or_add(
+        "host",
+        fake_cert("ssh-rsa first", future_datetime + datetime.timedelta(days=1)),
+        results.append,
+    )
+
+    assert results == [
+        TOFU_RESULT_ADDED,
+        TOFU_RESULT_TRUSTED,
+        TOFU_RESULT_REJECTED,
+        TOFU_RESULT_EXPIRED,
+        TOFU_RESULT_UPDATED,
+    ]
+
+
+@pytest.mark.parametrize("mode", ALL_MODES)
+def test_rejects_expired_certificate(hosts_file, mode):
+    store = CertStore(hosts_file, mode=mode)
+
+    with pytest.raises(RemoteCertificateExpired):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa first", past_datetime))
+
+
+@pytest.mark.parametrize("mode", ALL_MODES)
+def test_replaces_expired_record(hosts_file, mode):
+    with open(hosts_file, "w", encoding="utf-8") as f:
+        f.write(CertRecord("host", "ssh-rsa old", past_datetime).to_string())
+    store = CertStore(hosts_file, mode=mode)
+
+    assert store.validate_tofu_or_add("host", fake_cert("ssh-rsa new"))
+    assert read_records(hosts_file)[-1].fingerprint == "ssh-rsa new"
+    assert CertStore(hosts_file, mode=mode).validate_tofu_or_add(
+        "host", fake_cert("ssh-rsa new")
+    )
+
+
+def test_indexed_mode_skips_unchanged_writes(hosts_file):
+    store = CertStore(hosts_file, mode=CERT_STORE_MODE_INDEXED)
+    store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"))
+
+    with mock.patch("builtins.open", side_effect=AssertionError("file access")):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"))
+
+
+def test_indexed_mode_reloads_changed_file(hosts_file):
+    store = CertStore(hosts_file, mode=CERT_STORE_MODE_INDEXED)
+    store.validate_tofu_or_add("host", fake_cert("ssh-rsa first"))
+
+    # Another process trusts a different certificate for a second host
+    other_store = CertStore(hosts_file, mode=CERT_STORE_MODE_INDEXED)
+    other_store.validate_tofu_or_add("other", fake_cert("ssh-rsa other"))
+    stat = os.stat(hosts_file)
+    os.utime(hosts_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("other", fake_cert("ssh-rsa mismatch"))
+
+
+def test_journal_mode_appends_records(hosts_file):
+    store = CertStore(hosts_file, mode=CERT_STORE_MODE_JOURNAL)
+    store.validate_tofu_or_add("a", fake_cert("ssh-rsa a"))
+    store.validate_tofu_or_add("b", fake_cert("ssh-rsa b"))
+    store.validate_tofu_or_add("a", fake_cert("ssh-rsa a"))
+    store.validate_tofu_or_add(
+        "a", fake_cert("ssh-rsa a", future_datetime.replace(year=2100))
+    )
+
+    records = read_records(hosts_file)
+    assert [(r.hostname, r.expiration.year) for r in records] == [
+        ("a", future_datetime.year),
+        ("b", future_datetime.year),
+        ("a", 2100),
+    ]
+
+
+def test_journal_mode_reads_appended_lines(hosts_file):
+    store = CertStore(hosts_file, mode=CERT_STORE_MODE_JOURNAL)
+    store.validate_tofu_or_add("a", fake_cert("ssh-rsa a"))
+
+    # Another process appends a record, leaving an interrupted line behind
+    with open(hosts_file, "a", encoding="utf-8") as f:
+        f.write(CertRecord("b", "ssh-rsa b", future_datetime).to_string())
+        f.write("c ssh-rsa")
+
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("b", fake_cert("ssh-rsa other"))
+
+    store.validate_tofu_or_add("d", fake_cert("ssh-rsa d"))
+    with open(hosts_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[-2] == "c ssh-rsa"
+    assert lines[-1].startswith("d ssh-rsa d;")
+
+
+def test_journal_mode_compacts(hosts_file):
+    store = CertStore(
+        hosts_file, mode=CERT_STORE_MODE_JOURNAL, journal_compaction_threshold=3
+    )
+    for year in range(2090, 2096):
+        store.validate_tofu_or_add(
+            "a", fake_cert("ssh-rsa a", future_datetime.replace(year=year))
+        )
+        store.validate_tofu_or_add("b", fake_cert("ssh-rsa b"))
+
+    records = read_records(hosts_file)
+    assert len(records) < 6
+    assert {r.hostname: r.expiration.year for r in records}["a"] == 2095
+
+    with pytest.raises(TofuCertificateRejection):
+        CertStore(hosts_file, mode=CERT_STORE_MODE_JOURNAL).validate_tofu_or_add(
+            "a", fake_cert("ssh-rsa other")
+        )
+
+
+def test_save_keeps_file_on_failure(hosts_file):
+    store = CertStore(hosts_file)
+    store.validate_tofu_or_add("a", fake_cert("ssh-rsa a"))
+
+    with mock.patch("os.fsync", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            store.validate_tofu_or_add("b", fake_cert("ssh-rsa b"))
+
+    assert [r.hostname for r in read_records(hosts_file)] == ["a"]
+    assert os.listdir(os.path.dirname(hosts_file)) == ["known_hosts"]
+
+
+def test_set_hosts_file(hosts_file, tmp_path):
+    store = CertStore(hosts_file)
+    store.set_hosts_file(str(tmp_path / "other_hosts"), mode=CERT_STORE_MODE_INDEXED)
+
+    assert store.get_hosts_file() == str(tmp_path / "other_hosts")
+    assert store.get_mode() == CERT_STORE_MODE_INDEXED
+
+
+def test_invalid_mode(hosts_file):
+    with pytest.raises(ValueError):
+        CertStore(hosts_file, mode="invalid")
+
+
+@pytest.mark.parametrize("mode", ALL_MODES)
+def test_sha256_fingerprint_mode(hosts_file, mode):
+    store = CertStore(hosts_file, mode=mode, fingerprint_mode=FINGERPRINT_MODE_SHA256)
+    cert = fake_cert("ssh-rsa first")
+
+    assert store.validate_tofu_or_add("host", cert)
+    assert store.validate_tofu_or_add("host", cert)
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa second"))
+
+    records = read_records(hosts_file)
+    assert [r.fingerprint for r in records] == [cert.fingerprint_digest()]
+    with open(hosts_file, encoding="utf-8") as f:
+        assert f.read().startswith("host sha256:" + cert.fingerprint_digest().hex())
+
+
+@pytest.mark.parametrize("mode", ALL_MODES)
+def test_sha256_fingerprint_mode_migrates_records(hosts_file, mode):
+    with open(hosts_file, "w", encoding="utf-8") as f:
+        f.write(CertRecord("host", "ssh-rsa first", future_datetime).to_string())
+    results = []
+    store = CertStore(hosts_file, mode=mode, fingerprint_mode=FINGERPRINT_MODE_SHA256)
+    cert = fake_cert("ssh-rsa first")
+
+    assert store.validate_tofu_or_add("host", cert, results.append)
+
+    assert results == [TOFU_RESULT_TRUSTED]
+    assert read_records(hosts_file)[-1].fingerprint == cert.fingerprint_digest()
+    # The migrated record still rejects other certificates, in either mode
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa second"))
+    with pytest.raises(TofuCertificateRejection):
+        CertStore(hosts_file, mode=mode).validate_tofu_or_add(
+            "host", fake_cert("ssh-rsa second")
+        )
+    assert CertStore(hosts_file, mode=mode).validate_tofu_or_add("host", cert)
+
+
+def test_sha256_fingerprint_mode_rejects_legacy_mismatch(hosts_file):
+    with open(hosts_file, "w", encoding="utf-8") as f:
+        f.write(CertRecord("host", "ssh-rsa first", future_datetime).to_string())
+    store = CertStore(hosts_file, fingerprint_mode=FINGERPRINT_MODE_SHA256)
+
+    with pytest.raises(TofuCertificateRejection):
+        store.validate_tofu_or_add("host", fake_cert("ssh-rsa second"))
+    assert read_records(hosts_file)[0].fingerprint == "ssh-rsa first"
+
+
+def test_set_fingerprint_mode(hosts_file):
+    store = CertStore(hosts_file)
+    assert store.get_fingerprint_mode() == FINGERPRINT_MODE_OPENSSH
+
+    store.set_hosts_file(hosts_file, fingerprint_mode=FINGERPRINT_MODE_SHA256)
+
+    assert store.get_fingerprint_mode() == FINGERPRINT_MODE_SHA256
+    with pytest.raises(ValueError):
+        store.set_hosts_file(hosts_file, fingerprint_mode="invalid")
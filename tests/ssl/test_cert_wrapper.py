@@ -9,7 +9,7 @@ at http://mozilla.org/MPL/2.0/.
 
 import datetime
 
-from ignition.ssl.cert_wrapper import CertWrapper
+from ignition.ssl.cert_wrapper import CertWrapper, CertWrapperCache, certificate_cache
 
 from ..helpers import load_fixture_bytes
 
@@ -33,3 +33,41 @@ def test_certificate_parse():
         + "RrAF0Z1htkb3iBFFo2R4MaPwLQtqNXQCdDlUXKHa4bVSQ6B7VBrL5KeDsFuvaWK+gQ9bfnqT+YSWGTVC2RyXtuvR+"
         + "Ee1JFqQckE+x2FGbbp5ZCPl1PdgQqPg5M+vXuLdnXk3T1R6ujQTMYL42gAUktHkApLcOQQ7wYFCB1KNXYxoNGsA0ptMs0fsgcGQ=="
     )
+
+
+def test_certificate_fingerprint_digest():
+    cert_wrapper = CertWrapper.parse(load_fixture_bytes("sample_cert.der"))
+
+    assert (
+        cert_wrapper.fingerprint_digest().hex()
+        == "bdaa823a4f0b794f15c878ef027dc904f734af399999f7165f32cbd81a6d286e"
+    )
+    assert cert_wrapper.fingerprint_digest() is cert_wrapper.fingerprint_digest()
+
+
+def test_certificate_parse_is_cached(mocker):
+    certificate_cache.clear()
+    raw_certificate = load_fixture_bytes("sample_cert.der")
+    cert_wrapper = CertWrapper.parse(raw_certificate)
+    fingerprint = cert_wrapper.fingerprint()
+
+    mock_load = mocker.patch("cryptography.x509.load_der_x509_certificate")
+
+    assert CertWrapper.parse(raw_certificate) is cert_wrapper
+    assert cert_wrapper.fingerprint() is fingerprint
+    mock_load.assert_not_called()
+
+
+def test_certificate_cache_evicts_least_recently_used():
+    cache = CertWrapperCache(max_size=2)
+    wrappers = {key: CertWrapper(None) for key in (b"a", b"b", b"c")}
+
+    cache.add(b"a", wrappers[b"a"])
+    cache.add(b"b", wrappers[b"b"])
+    cache.get(b"a")
+    cache.add(b"c", wrappers[b"c"])
+
+    assert cache.get(b"a") is wrappers[b"a"]
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") is wrappers[b"c"]
+    assert len(cache) == 2
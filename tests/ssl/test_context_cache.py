@@ -0,0 +1,68 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import os
+import ssl
+
+import pytest
+
+from ignition.ssl.context_cache import SSLContextCache, create_ssl_context
+
+from ..helpers import generate_self_signed_cert
+
+
+def test_create_ssl_context():
+    context = create_ssl_context()
+
+    assert context.minimum_version == ssl.TLSVersion.TLSv1_2
+    assert context.check_hostname is False
+    assert context.verify_mode == ssl.CERT_NONE
+
+
+def test_reuses_default_context():
+    cache = SSLContextCache()
+
+    assert cache.get_context() is cache.get_context()
+
+
+def test_reuses_client_certificate_context(tmp_path):
+    ca_cert = generate_self_signed_cert(str(tmp_path))
+    cache = SSLContextCache()
+
+    context = cache.get_context(ca_cert)
+
+    assert context is cache.get_context(ca_cert)
+    assert context is cache.get_context(list(ca_cert))
+    assert context is not cache.get_context()
+
+
+def test_invalidates_on_file_change(tmp_path):
+    cert_file, key_file = generate_self_signed_cert(str(tmp_path))
+    cache = SSLContextCache()
+
+    context = cache.get_context((cert_file, key_file))
+    stat = os.stat(key_file)
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert context is not cache.get_context((cert_file, key_file))
+
+
+def test_clear():
+    cache = SSLContextCache()
+    context = cache.get_context()
+    cache.clear()
+
+    assert context is not cache.get_context()
+
+
+def test_missing_client_certificate(tmp_path):
+    cache = SSLContextCache()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get_context((str(tmp_path / "missing.pem"), str(tmp_path / "key.pem")))
@@ -0,0 +1,81 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import mock
+
+from ignition.ssl.session_cache import SSLSessionCache
+
+context = object()
+
+
+def fake_session(timeout=7200):
+    return mock.Mock(timeout=timeout)
+
+
+def test_get_and_set_session():
+    cache = SSLSessionCache(max_size=10, ttl=60)
+    session = fake_session()
+
+    assert cache.get_session("host:1965", context) is None
+    cache.set_session("host:1965", context, session)
+    assert cache.get_session("host:1965", context) is session
+
+
+def test_ignores_empty_session():
+    cache = SSLSessionCache(max_size=10, ttl=60)
+    cache.set_session("host:1965", context, None)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_rejects_session_from_other_context():
+    cache = SSLSessionCache(max_size=10, ttl=60)
+    cache.set_session("host:1965", context, fake_session())
+
+    assert cache.get_session("host:1965", object()) is None
+    assert cache.stats()["size"] == 0
+
+
+@mock.patch("ignition.ssl.session_cache.time")
+def test_expires_sessions(time_mock):
+    time_mock.monotonic.return_value = 100
+    cache = SSLSessionCache(max_size=10, ttl=60)
+    cache.set_session("long:1965", context, fake_session())
+    cache.set_session("short:1965", context, fake_session(timeout=10))
+
+    time_mock.monotonic.return_value = 120
+    assert cache.get_session("long:1965", context) is not None
+    assert cache.get_session("short:1965", context) is None
+
+    time_mock.monotonic.return_value = 200
+    assert cache.get_session("long:1965", context) is None
+
+
+def test_evicts_least_recently_used():
+    cache = SSLSessionCache(max_size=2, ttl=60)
+    cache.set_session("a:1965", context, fake_session())
+    cache.set_session("b:1965", context, fake_session())
+    cache.get_session("a:1965", context)
+    cache.set_session("c:1965", context, fake_session())
+
+    assert cache.get_session("a:1965", context) is not None
+    assert cache.get_session("b:1965", context) is None
+    assert cache.get_session("c:1965", context) is not None
+
+
+def test_counters():
+    cache = SSLSessionCache(max_size=2, ttl=60)
+    cache.record_handshake(False)
+    cache.record_handshake(True)
+    cache.record_handshake(True)
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 0}
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
@@ -0,0 +1,166 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring,redefined-outer-name
+
+import asyncio
+import threading
+import time
+
+import mock
+import pytest
+
+import ignition
+import ignition.aio
+from ignition.aio import AsyncRequest
+from ignition.response import ErrorResponse, SuccessResponse
+from ignition.ssl.cert_store import CertStore
+from ignition.util import TimeoutBudget
+
+from .helpers import GeminiTestServer
+
+
+@pytest.fixture
+def mock_async_request(mocker):
+    mocked = mocker.patch("ignition.aio.AsyncRequest")
+    mocked.return_value.send = mock.AsyncMock(return_value="response")
+    yield mocked
+
+
+def test_get_url():
+    request = AsyncRequest(
+        "software/", referer="gemini://geminiprotocol.net/", request_timeout=30
+    )
+    assert request.get_url() == "gemini://geminiprotocol.net/software/"
+
+
+def test_request(mock_async_request):
+    assert asyncio.run(ignition.aio.request("//test")) == "response"
+
+    args, kwargs = mock_async_request.call_args
+    assert args == ("//test",)
+    assert kwargs["request_timeout"] == ignition.DEFAULT_REQUEST_TIMEOUT
+    assert kwargs["cert_store"].get_hosts_file() == ignition.DEFAULT_HOSTS_FILE
+    assert kwargs["referer"] is None
+    assert kwargs["ca_cert"] is None
+    assert kwargs["raise_errors"] is False
+    mock_async_request.return_value.send.assert_awaited_once()
+
+
+def test_request_with_values(mock_async_request):
+    asyncio.run(
+        ignition.aio.request(
+            "path", referer="//test", timeout=10, raise_errors=True, ca_cert="string"
+        )
+    )
+
+    args, kwargs = mock_async_request.call_args
+    assert args == ("path",)
+    assert kwargs["request_timeout"] == 10
+    assert kwargs["referer"] == "//test"
+    assert kwargs["ca_cert"] == "string"
+    assert kwargs["raise_errors"] is True
+
+
+def test_request_with_total_timeout(mock_async_request):
+    asyncio.run(ignition.aio.request("//test", timeout=10, total_timeout=20))
+
+    _, kwargs = mock_async_request.call_args
+    assert kwargs["timeout_budget"].timeout == 10
+    assert kwargs["timeout_budget"].total_timeout == 20
+
+
+def test_send(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        request = AsyncRequest(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+        )
+        response = asyncio.run(request.send())
+
+    assert isinstance(response, SuccessResponse)
+    assert response.data() == "# Hello\n"
+    assert response.certificate is not None
+    assert server.requests == [f"{server.url}\r\n".encode()]
+
+
+def test_send_connection_refused(tmp_path):
+    request = AsyncRequest(
+        "gemini://127.0.0.1:1/",
+        request_timeout=5,
+        cert_store=CertStore(str(tmp_path / "known_hosts")),
+    )
+    response = asyncio.run(request.send())
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == ignition.RESPONSE_STATUSDETAIL_ERROR_HOST
+
+
+def test_send_max_body_bytes(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n" + b"x" * 200000) as server:
+        request = AsyncRequest(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            max_body_bytes=1000,
+        )
+        response = asyncio.run(request.send())
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == ignition.RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE
+
+
+def test_send_header_too_long(tmp_path):
+    with GeminiTestServer(b"20 " + b"x" * 5000 + b"\r\n") as server:
+        request = AsyncRequest(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+        )
+        response = asyncio.run(request.send())
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == ignition.RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
+
+
+def test_send_validates_tofu_off_the_event_loop(tmp_path):
+    cert_store = CertStore(str(tmp_path / "known_hosts"))
+    validate_tofu_or_add = cert_store.validate_tofu_or_add
+    threads = []
+
+    def record_thread(*args):
+        threads.append(threading.current_thread())
+        return validate_tofu_or_add(*args)
+
+    cert_store.validate_tofu_or_add = record_thread
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        request = AsyncRequest(server.url, request_timeout=5, cert_store=cert_store)
+        response = asyncio.run(request.send())
+
+    assert isinstance(response, SuccessResponse)
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+
+
+def test_send_total_timeout(tmp_path):
+    with GeminiTestServer(
+        b"20 text/gemini\r\n" + b"x" * 100, drip_delay=0.05
+    ) as server:
+        request = AsyncRequest(
+            server.url,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            timeout_budget=TimeoutBudget(5, total_timeout=0.5),
+        )
+        started_at = time.monotonic()
+        response = asyncio.run(request.send())
+        elapsed = time.monotonic() - started_at
+
+    assert isinstance(response, ErrorResponse)
+    assert response.data() == "Socket timeout"
+    assert elapsed < 2
@@ -0,0 +1,123 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import threading
+import time
+
+import pytest
+
+from ignition.batch import BatchRequest
+from ignition.globals import DEFAULT_BATCH_ORDERED_WINDOW_FACTOR
+
+
+class FakeRequest:
+    """
+    Stand-in for Request that records how many sends overlap
+    """
+
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def __init__(self, request_url):
+        self.request_url = request_url
+        self.host, delay = request_url.split("/")
+        self.delay = float(delay)
+
+    def get_netloc(self):
+        return self.host
+
+    def send(self):
+        with FakeRequest.lock:
+            for key in (self.host, None):
+                FakeRequest.active[key] = FakeRequest.active.get(key, 0) + 1
+                FakeRequest.peak[key] = max(
+                    FakeRequest.peak.get(key, 0), FakeRequest.active[key]
+                )
+        time.sleep(self.delay)
+        with FakeRequest.lock:
+            for key in (self.host, None):
+                FakeRequest.active[key] -= 1
+        return self.request_url
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_request():
+    FakeRequest.active = {}
+    FakeRequest.peak = {}
+
+
+def test_returns_every_response():
+    urls = [f"host{i}/0" for i in range(20)]
+    batch = BatchRequest(FakeRequest, concurrency=4)
+
+    assert sorted(batch.run(urls)) == sorted(urls)
+    assert FakeRequest.peak[None] <= 4
+
+
+def test_unordered_yields_as_completed():
+    batch = BatchRequest(FakeRequest, concurrency=2)
+
+    assert list(batch.run(["a/0.2", "b/0"])) == ["b/0", "a/0.2"]
+
+
+def test_ordered_keeps_input_order():
+    urls = ["a/0.2", "b/0", "c/0.1", "d/0"]
+    batch = BatchRequest(FakeRequest, concurrency=4, ordered=True)
+
+    assert list(batch.run(urls)) == urls
+
+
+def test_ordered_buffer_is_bounded():
+    created = []
+    created_before_head = []
+
+    def recording_factory(request_url):
+        request = FakeRequest(request_url)
+        created.append(request_url)
+        if request_url == "head/0.5":
+            send = request.send
+            request.send = lambda: (send(), created_before_head.append(len(created)))[0]
+        return request
+
+    urls = ["head/0.5"] + [f"host{i}/0" for i in range(200)]
+    batch = BatchRequest(recording_factory, concurrency=2, ordered=True)
+
+    assert list(batch.run(iter(urls))) == urls
+    # The buffer window, plus what can be in flight or held back
+    assert created_before_head[0] <= 2 * DEFAULT_BATCH_ORDERED_WINDOW_FACTOR + 2 * 2 + 1
+
+
+def test_per_host_concurrency():
+    urls = ["same/0.02"] * 6 + [f"other{i}/0.02" for i in range(6)]
+    batch = BatchRequest(FakeRequest, concurrency=8, per_host_concurrency=2)
+
+    assert len(list(batch.run(iter(urls)))) == 12
+    assert FakeRequest.peak["same"] == 2
+    assert FakeRequest.peak[None] > 2
+
+
+def test_errors_propagate():
+    def failing_factory(request_url):
+        request = FakeRequest(request_url)
+        request.send = lambda: 1 / 0
+        return request
+
+    batch = BatchRequest(failing_factory, concurrency=2)
+
+    with pytest.raises(ZeroDivisionError):
+        list(batch.run(["a/0"]))
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        BatchRequest(FakeRequest, concurrency=0)
+
+    with pytest.raises(ValueError):
+        BatchRequest(FakeRequest, concurrency=1, per_host_concurrency=0)
@@ -0,0 +1,140 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring,redefined-outer-name
+
+import socket
+
+import pytest
+
+from ignition.connect import HappyEyeballsConnector
+
+
+def address(family, port):
+    host = "::1" if family == socket.AF_INET6 else "127.0.0.1"
+    return (family, socket.SOCK_STREAM, 6, "", (host, port))
+
+
+@pytest.fixture
+def listeners():
+    """
+    Listening IPv6 & IPv4 sockets, by family
+    """
+    sockets = {}
+    for family in (socket.AF_INET6, socket.AF_INET):
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        listener.bind(("::1" if family == socket.AF_INET6 else "127.0.0.1", 0))
+        listener.listen(8)
+        sockets[family] = listener
+    yield sockets
+    for listener in sockets.values():
+        listener.close()
+
+
+def closed_port(family):
+    """
+    A port with nothing listening on it
+    """
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.bind(("::1" if family == socket.AF_INET6 else "127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_connect_single_address(listeners):
+    connector = HappyEyeballsConnector(delay=0.25, max_hosts=10)
+    port = listeners[socket.AF_INET].getsockname()[1]
+
+    sock = connector.connect("test.com", [address(socket.AF_INET, port)], 5)
+
+    assert sock.family == socket.AF_INET
+    assert sock.gettimeout() == 5
+    assert connector.get_family("test.com") == socket.AF_INET
+    sock.close()
+
+
+def test_connect_prefers_resolver_order(listeners):
+    connector = HappyEyeballsConnector(delay=1, max_hosts=10)
+    addresses = [
+        address(family, listener.getsockname()[1])
+        for family, listener in listeners.items()
+    ]
+
+    sock = connector.connect("test.com", addresses, 5)
+
+    assert sock.family == socket.AF_INET6
+    assert sock.gettimeout() == 5
+    sock.close()
+
+
+def test_connect_falls_back_to_other_family(listeners):
+    connector = HappyEyeballsConnector(delay=1, max_hosts=10)
+    addresses = [
+        address(socket.AF_INET6, closed_port(socket.AF_INET6)),
+        address(socket.AF_INET, listeners[socket.AF_INET].getsockname()[1]),
+    ]
+
+    sock = connector.connect("test.com", addresses, 5)
+
+    assert sock.family == socket.AF_INET
+    assert connector.get_family("test.com") == socket.AF_INET
+    sock.close()
+
+
+def test_connect_remembers_family(listeners):
+    connector = HappyEyeballsConnector(delay=1, max_hosts=10)
+    addresses = [
+        address(socket.AF_INET6, closed_port(socket.AF_INET6)),
+        address(socket.AF_INET, listeners[socket.AF_INET].getsockname()[1]),
+    ]
+    connector.connect("test.com", addresses, 5).close()
+
+    # Both families now accept, but the remembered family is tried first
+    addresses[0] = address(socket.AF_INET6, listeners[socket.AF_INET6].getsockname()[1])
+    sock = connector.connect("test.com", addresses, 5)
+
+    assert sock.family == socket.AF_INET
+    sock.close()
+
+    connector.clear()
+    sock = connector.connect("test.com", addresses, 5)
+
+    assert sock.family == socket.AF_INET6
+    sock.close()
+
+
+def test_connect_all_refused():
+    connector = HappyEyeballsConnector(delay=0.25, max_hosts=10)
+    addresses = [
+        address(socket.AF_INET6, closed_port(socket.AF_INET6)),
+        address(socket.AF_INET, closed_port(socket.AF_INET)),
+    ]
+
+    with pytest.raises(ConnectionRefusedError):
+        connector.connect("test.com", addresses, 5)
+
+    assert connector.get_family("test.com") is None
+
+
+def test_connect_no_addresses():
+    connector = HappyEyeballsConnector(delay=0.25, max_hosts=10)
+
+    with pytest.raises(OSError):
+        connector.connect("test.com", [], 5)
+
+
+def test_remembers_least_recently_used_hosts(listeners):
+    connector = HappyEyeballsConnector(delay=0.25, max_hosts=2)
+    port = listeners[socket.AF_INET].getsockname()[1]
+
+    for host in ("a.com", "b.com", "a.com", "c.com"):
+        connector.connect(host, [address(socket.AF_INET, port)], 5).close()
+
+    assert connector.get_family("a.com") == socket.AF_INET
+    assert connector.get_family("b.com") is None
+    assert connector.get_family("c.com") == socket.AF_INET
@@ -0,0 +1,107 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring,redefined-outer-name
+
+import socket
+
+import pytest
+
+from ignition.dns_cache import DNSCache
+
+ADDRESSES = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 1965))]
+
+
+@pytest.fixture
+def mock_getaddrinfo(mocker):
+    return mocker.patch("socket.getaddrinfo", return_value=ADDRESSES)
+
+
+def test_resolve_caches(mock_getaddrinfo):
+    cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+
+    assert cache.resolve("test.com", 1965) == ADDRESSES
+    assert cache.resolve("test.com", 1965) == ADDRESSES
+
+    mock_getaddrinfo.assert_called_once_with("test.com", 1965, 0, socket.SOCK_STREAM)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_resolve_expires(mock_getaddrinfo):
+    cache = DNSCache(max_size=10, ttl=0, negative_ttl=10)
+
+    cache.resolve("test.com", 1965)
+    cache.resolve("test.com", 1965)
+
+    assert mock_getaddrinfo.call_count == 2
+
+
+def test_resolve_caches_failures(mock_getaddrinfo):
+    mock_getaddrinfo.side_effect = socket.gaierror(-2, "Name or service not known")
+    cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            cache.resolve("unknown.test", 1965)
+
+    mock_getaddrinfo.assert_called_once()
+
+
+@pytest.mark.parametrize("error", [socket.EAI_AGAIN, socket.EAI_FAIL])
+def test_resolve_does_not_cache_transient_failures(mock_getaddrinfo, error):
+    mock_getaddrinfo.side_effect = socket.gaierror(error, "Temporary failure")
+    cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+
+    with pytest.raises(socket.gaierror):
+        cache.resolve("test.com", 1965)
+    mock_getaddrinfo.side_effect = None
+
+    assert cache.resolve("test.com", 1965) == ADDRESSES
+    assert mock_getaddrinfo.call_count == 2
+
+
+def test_resolve_evicts_least_recently_used(mock_getaddrinfo):
+    cache = DNSCache(max_size=2, ttl=60, negative_ttl=10)
+
+    cache.resolve("a.test", 1965)
+    cache.resolve("b.test", 1965)
+    cache.resolve("a.test", 1965)
+    cache.resolve("c.test", 1965)
+    cache.resolve("a.test", 1965)
+    cache.resolve("b.test", 1965)
+
+    assert [call[0][0] for call in mock_getaddrinfo.call_args_list] == [
+        "a.test",
+        "b.test",
+        "c.test",
+        "b.test",
+    ]
+
+
+def test_pre_resolve(mock_getaddrinfo):
+    def getaddrinfo(host, *_):
+        if host != "test.com":
+            raise socket.gaierror(-2, "Name or service not known")
+        return ADDRESSES
+
+    mock_getaddrinfo.side_effect = getaddrinfo
+    cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+
+    assert cache.pre_resolve([("test.com", 1965), ("unknown.test", 1965)]) == {
+        ("test.com", 1965): True,
+        ("unknown.test", 1965): False,
+    }
+    assert cache.resolve("test.com", 1965) == ADDRESSES
+    assert cache.stats()["hits"] == 1
+
+
+def test_clear(mock_getaddrinfo):
+    cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+    cache.resolve("test.com", 1965)
+    cache.clear()
+
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
@@ -0,0 +1,153 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import hashlib
+import io
+import os
+import socket
+import stat
+
+import pytest
+from mock import Mock
+
+from ignition.download import Download, DownloadResponse
+from ignition.globals import (
+    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+    RESPONSE_STATUSDETAIL_SUCCESS,
+)
+from ignition.request import Request
+from ignition.response import ErrorResponse, ResponseFactory
+from ignition.ssl.cert_store import CertStore
+from ignition.stream import ResponseStream
+
+from .helpers import GeminiTestServer
+
+
+def create_request(body=None, status=RESPONSE_STATUSDETAIL_SUCCESS):
+    stream = None
+    if body is not None:
+        stream = ResponseStream(Mock(), io.BufferedReader(io.BytesIO(body)))
+    request = Mock()
+    request.send.return_value = ResponseFactory.create(
+        "gemini://test.com/file",
+        status,
+        meta="application/octet-stream",
+        certificate="dummy cert object",
+        stream=stream,
+    )
+    return request
+
+
+def test_download_to_path(tmp_path):
+    body = bytes(range(256)) * 100
+    path = tmp_path / "file"
+
+    response = Download(create_request(body), str(path), chunk_size=1000).send()
+
+    assert isinstance(response, DownloadResponse)
+    assert response.success()
+    assert response.meta == "application/octet-stream"
+    assert response.size == len(body)
+    assert response.digest == hashlib.sha256(body).hexdigest()
+    assert response.data() == str(path)
+    assert path.read_bytes() == body
+    assert [p.name for p in tmp_path.iterdir()] == ["file"]
+
+
+def test_download_to_path_file_mode(tmp_path):
+    path = tmp_path / "file"
+
+    umask = os.umask(0o022)
+    try:
+        Download(create_request(b"body"), str(path)).send()
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        path.chmod(0o640)
+        Download(create_request(b"body"), str(path)).send()
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_download_to_fileobj():
+    fileobj = io.BytesIO()
+
+    response = Download(
+        create_request(b"Hello"), fileobj, digest_algorithm="md5"
+    ).send()
+
+    assert fileobj.getvalue() == b"Hello"
+    assert response.path is None
+    assert response.digest == hashlib.md5(b"Hello").hexdigest()
+
+
+def test_download_non_success_response(tmp_path):
+    path = tmp_path / "file"
+
+    response = Download(create_request(status="51"), str(path)).send()
+
+    assert response.status == "51"
+    assert not path.exists()
+
+
+def test_download_timeout_keeps_destination(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(b"previous")
+    fd = Mock()
+    fd.readinto1.side_effect = socket.timeout()
+    request = create_request()
+    request.send.return_value.stream = ResponseStream(Mock(), fd)
+
+    response = Download(request, str(path)).send()
+
+    assert isinstance(response, ErrorResponse)
+    assert path.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["file"]
+
+
+def test_download_timeout_raise_errors(tmp_path):
+    fd = Mock()
+    fd.readinto1.side_effect = socket.timeout()
+    request = create_request()
+    request.send.return_value.stream = ResponseStream(Mock(), fd)
+
+    with pytest.raises(socket.timeout):
+        Download(request, str(tmp_path / "file"), raise_errors=True).send()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_from_server(tmp_path):
+    body = b"x" * 300000
+    path = tmp_path / "file"
+
+    with GeminiTestServer(b"20 application/octet-stream\r\n" + body) as server:
+        request = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+        )
+        response = Download(request, path).send()
+
+    assert response.size == len(body)
+    assert path.read_bytes() == body
+
+
+def test_download_max_body_bytes(tmp_path):
+    path = tmp_path / "file"
+    request = create_request()
+    request.send.return_value.stream = ResponseStream(
+        Mock(), io.BufferedReader(io.BytesIO(b"x" * 100)), max_bytes=10
+    )
+
+    response = Download(request, str(path), chunk_size=8).send()
+
+    assert response.status == RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,79 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import pytest
+
+from ignition.globals import HOOK_ON_COMPLETE, HOOK_ON_CONNECT
+from ignition.hooks import HookEvent, Hooks
+
+
+def create_event(event=HOOK_ON_CONNECT):
+    return HookEvent(event, "gemini://test.com/", "test.com", None)
+
+
+def test_empty_hooks_are_falsy():
+    assert not Hooks()
+
+
+def test_add_and_emit():
+    events = []
+    hooks = Hooks()
+    hooks.add(HOOK_ON_CONNECT, events.append)
+
+    assert hooks
+    assert hooks.has(HOOK_ON_CONNECT)
+    assert not hooks.has(HOOK_ON_COMPLETE)
+
+    event = create_event()
+    hooks.emit(event)
+    hooks.emit(create_event(HOOK_ON_COMPLETE))
+    assert events == [event]
+
+
+def test_add_unknown_event():
+    with pytest.raises(ValueError):
+        Hooks().add("on_nothing", print)
+
+
+def test_remove():
+    events = []
+    hooks = Hooks({HOOK_ON_CONNECT: events.append})
+    hooks.remove(HOOK_ON_CONNECT, events.append)
+
+    hooks.emit(create_event())
+    assert events == []
+    assert not hooks
+
+
+def test_merged():
+    global_events = []
+    request_events = []
+    hooks = Hooks({HOOK_ON_CONNECT: global_events.append})
+
+    assert hooks.merged(None) is hooks
+
+    merged = hooks.merged({HOOK_ON_CONNECT: [request_events.append]})
+    merged.emit(create_event())
+    assert len(global_events) == 1
+    assert len(request_events) == 1
+
+    hooks.emit(create_event())
+    assert len(request_events) == 1
+
+
+def test_failing_callback_does_not_raise():
+    events = []
+
+    def fail(_):
+        raise RuntimeError("broken hook")
+
+    hooks = Hooks({HOOK_ON_CONNECT: [fail, events.append]})
+    hooks.emit(create_event())
+
+    assert len(events) == 1
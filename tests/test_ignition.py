@@ -50,6 +50,8 @@ def test_request(mock_request):
     assert raise_errors is False
     assert referer is None
     assert ca_cert is None
+    assert mock_request.call_args[1]["ssl_context_cache"] is not None
+    assert mock_request.call_args[1]["ssl_session_cache"] is None
 
     mock_request.return_value.send.assert_called_once()
 
@@ -80,6 +82,178 @@ def test_request_with_values(mock_request):
     mock_request.return_value.send.assert_called_once()
 
 
+def test_request_with_tls_session_reuse(mock_request):
+    ignition.request("//test", reuse_tls_session=True)
+
+    assert mock_request.call_args[1]["ssl_session_cache"] is not None
+
+
+def test_request_with_stream(mock_request):
+    ignition.request("//test", stream=True)
+
+    assert mock_request.call_args[1]["stream"] is True
+
+
+def test_request_with_max_body_bytes(mock_request):
+    ignition.request("//test", max_body_bytes=1000)
+
+    assert mock_request.call_args[1]["max_body_bytes"] == 1000
+
+
+def test_request_with_total_timeout(mock_request):
+    ignition.request("//test", timeout=10, total_timeout=60)
+
+    timeout_budget = mock_request.call_args[1]["timeout_budget"]
+    assert timeout_budget.timeout == 10
+    assert timeout_budget.total_timeout == 60
+
+
+def test_request_with_default_budgets(mock_request):
+    ignition.set_default_timeout(9, connect_timeout=2, total_timeout=60)
+    ignition.request("//test")
+    ignition.set_default_timeout(ignition.DEFAULT_REQUEST_TIMEOUT)
+
+    timeout_budget = mock_request.call_args[1]["timeout_budget"]
+    assert timeout_budget.timeout == 9
+    assert timeout_budget.connect_timeout == 2
+    assert timeout_budget.total_timeout == 60
+
+
+def test_request_with_hooks(mock_request):
+    def global_hook(_):
+        pass
+
+    def request_hook(_):
+        pass
+
+    ignition.add_hook(ignition.HOOK_ON_COMPLETE, global_hook)
+    try:
+        ignition.request("//test", hooks={ignition.HOOK_ON_HEADER: request_hook})
+    finally:
+        ignition.remove_hook(ignition.HOOK_ON_COMPLETE, global_hook)
+
+    hooks = mock_request.call_args[1]["hooks"]
+    assert hooks.has(ignition.HOOK_ON_COMPLETE)
+    assert hooks.has(ignition.HOOK_ON_HEADER)
+
+
+def test_request_without_hooks(mock_request):
+    ignition.request("//test")
+
+    assert not mock_request.call_args[1]["hooks"]
+
+
+def test_request_with_dns_cache(mock_request):
+    ignition.request("//test")
+    assert mock_request.call_args[1]["dns_cache"] is None
+
+    ignition.request("//test", cache_dns=True)
+    assert mock_request.call_args[1]["dns_cache"] is not None
+
+
+def test_request_with_connector(mock_request):
+    ignition.request("//test")
+    assert mock_request.call_args[1]["connector"] is not None
+
+
+def test_request_with_scheduler(mock_request):
+    ignition.request("//test")
+    assert mock_request.call_args[1]["scheduler"] is not None
+
+
+def test_request_follow_redirects(mocker, mock_request):
+    mock_send = mocker.patch("ignition.RedirectFollower.send")
+
+    response = ignition.request("/b", referer="//test/a", follow_redirects=3)
+
+    assert response == mock_send.return_value
+    mock_send.assert_called_once_with("gemini://test/b")
+    mock_request.assert_not_called()
+
+
+def test_request_follow_redirects_with_ca_cert(mocker, mock_request):
+    mock_follower = mocker.patch("ignition.RedirectFollower")
+
+    ignition.request("//test", ca_cert=("cert", "key"), follow_redirects=3)
+
+    (_, _, redirect_cache), kwargs = mock_follower.call_args
+    assert redirect_cache is None
+    assert kwargs["same_host_only"] is True
+
+
+def test_request_without_follow_redirects(mocker, mock_request):
+    mock_send = mocker.patch("ignition.RedirectFollower.send")
+
+    ignition.request("//test")
+
+    mock_send.assert_not_called()
+    mock_request.return_value.send.assert_called_once()
+
+
+def test_get_redirect_cache_stats():
+    assert set(ignition.get_redirect_cache_stats()) == {"hits", "misses", "size"}
+
+
+def test_request_with_response_cache(mock_request):
+    ignition.request("//test")
+    assert mock_request.call_args[1]["response_cache"] is None
+
+    ignition.request("//test", use_cache=True)
+    assert mock_request.call_args[1]["response_cache"] is not None
+
+
+def test_get_response_cache_stats():
+    assert set(ignition.get_response_cache_stats()) == {
+        "hits",
+        "misses",
+        "size",
+        "bytes",
+    }
+
+
+def test_set_host_limits(mocker):
+    mock_set_limits = mocker.patch("ignition.HostScheduler.set_limits")
+
+    ignition.set_host_limits(requests_per_second=2, max_in_flight=4)
+
+    mock_set_limits.assert_called_once_with(
+        rate=2, burst=1, max_in_flight=4, max_pause=300
+    )
+
+
+def test_pre_resolve(mocker):
+    mock_pre_resolve = mocker.patch(
+        "ignition.DNSCache.pre_resolve",
+        return_value={("test.com", 1965): True, ("test.com", 300): False},
+    )
+
+    assert ignition.pre_resolve(
+        ["//test.com/a", "gemini://test.com/b", "//test.com:300/"]
+    ) == {"test.com": True, "test.com:300": False}
+    assert list(mock_pre_resolve.call_args[0][0]) == [
+        ("test.com", 1965),
+        ("test.com", 300),
+    ]
+
+
+def test_get_dns_cache_stats():
+    assert set(ignition.get_dns_cache_stats()) == {"hits", "misses", "size"}
+
+
+def test_download(mock_request, mocker):
+    mock_download = mocker.patch("ignition.Download")
+
+    ignition.download("//test", "file.gmi")
+
+    assert mock_request.call_args[1]["stream"] is True
+    assert mock_download.call_args[0][1] == "file.gmi"
+    mock_download.return_value.send.assert_called_once()
+
+
+def test_get_tls_session_stats():
+    assert set(ignition.get_tls_session_stats()) == {"hits", "misses", "size"}
+
+
 def test_request_with_default_timeout(mock_request):
     ignition.set_default_timeout(9)
     ignition.request("//test")
@@ -140,6 +314,51 @@ def test_request_with_hosts_file(mock_request):
     mock_request.return_value.send.assert_called_once()
 
 
+def test_request_with_fingerprint_mode(mock_request):
+    ignition.set_default_hosts_file(
+        ".my_hosts_file", fingerprint_mode=ignition.FINGERPRINT_MODE_SHA256
+    )
+    try:
+        ignition.request("//test")
+
+        (
+            _,
+            cert_store,
+            _,
+            _,
+            _,
+            _,
+        ) = _destructure_request_args(mock_request)
+
+        assert cert_store.get_fingerprint_mode() == ignition.FINGERPRINT_MODE_SHA256
+    finally:
+        ignition.set_default_hosts_file(
+            ".my_hosts_file", fingerprint_mode=ignition.FINGERPRINT_MODE_OPENSSH
+        )
+
+
+def test_request_many(mock_request):
+    ignition.set_default_timeout(ignition.DEFAULT_REQUEST_TIMEOUT)
+    responses = list(
+        ignition.request_many(["//test1", "//test2"], referer="//test", ca_cert="c")
+    )
+
+    assert len(responses) == 2
+    assert mock_request.call_count == 2
+    assert [call[0][0] for call in mock_request.call_args_list] == [
+        "//test1",
+        "//test2",
+    ]
+
+    _, request_kwargs = mock_request.call_args
+    assert request_kwargs["cert_store"].get_hosts_file() is not None
+    assert request_kwargs["request_timeout"] == ignition.DEFAULT_REQUEST_TIMEOUT
+    assert request_kwargs["referer"] == "//test"
+    assert request_kwargs["ca_cert"] == "c"
+    assert request_kwargs["raise_errors"] is False
+    assert mock_request.return_value.send.call_count == 2
+
+
 def test_url(mock_request):
     ignition.url("//test")
 
@@ -0,0 +1,72 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import json
+import subprocess
+import sys
+
+# Modules only needed by optional features, which `import ignition` must not load
+# (selectors is left out: the standard library socket module imports it)
+LAZY_MODULES = ("cryptography", "cgi", "sqlite3", "concurrent")
+
+
+def run_python(code):
+    """
+    Runs code in a fresh interpreter and returns the JSON it prints
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def loaded_modules(prefixes):
+    return (
+        f"json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in {prefixes!r}"
+        f" or m.startswith('ignition.python.')))"
+    )
+
+
+def test_import_is_lazy():
+    modules = run_python(
+        "import json, sys\n"
+        "import ignition\n"
+        f"print({loaded_modules(LAZY_MODULES)})\n"
+    )
+
+    assert modules == []
+
+
+def test_single_urllib_shim():
+    modules = run_python(
+        "import json, sys\n"
+        "import ignition\n"
+        "ignition.url('gemini://user@test.com/')\n"
+        f"print({loaded_modules(())})\n"
+    )
+
+    versions = {module.split(".")[2] for module in modules}
+    assert versions == {f"python3_{sys.version_info.minor}"}
+
+
+def test_decoding_does_not_load_cgi():
+    modules = run_python(
+        "import json, sys\n"
+        "import ignition.response\n"
+        "response = ignition.response.ResponseFactory.create(\n"
+        "    'gemini://test.com/', '20', 'text/gemini; charset=utf-8', b'Hello'\n"
+        ")\n"
+        "assert response.data() == 'Hello'\n"
+        f"print({loaded_modules(('cgi',))})\n"
+    )
+
+    assert modules == []
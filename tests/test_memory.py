@@ -0,0 +1,112 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-class-docstring,missing-function-docstring
+
+import datetime
+import logging
+import tracemalloc
+
+import pytest
+
+from ignition.download import DownloadResponse
+from ignition.response import ResponseFactory, SuccessResponse
+from ignition.ssl.cert_record import CertRecord
+from ignition.ssl.cert_wrapper import CertWrapper
+from ignition.url import URL
+
+logger = logging.getLogger(__name__)
+
+INSTANCES = 10000
+
+test_datetime = datetime.datetime(2030, 11, 15, 12, 15, 2, 438000)
+
+
+class DictSuccessResponse(SuccessResponse):
+    pass
+
+
+class DictCertRecord(CertRecord):
+    pass
+
+
+class DictCertWrapper(CertWrapper):
+    pass
+
+
+class DictURL(URL):
+    pass
+
+
+def create_response(cls):
+    return cls("gemini://test.com/", "20", "text/gemini", b"# Hello\n", None)
+
+
+def create_cert_record(cls):
+    return cls("test.com", "ssh-rsa fingerprint", test_datetime)
+
+
+def create_cert_wrapper(cls):
+    return cls(None)
+
+
+def create_url(cls):
+    return cls("gemini://test.com/")
+
+
+def measure_instance_size(factory):
+    """
+    Returns the average memory allocated per instance, over many instances
+    """
+    tracemalloc.start()
+    try:
+        allocated_before = tracemalloc.get_traced_memory()[0]
+        instances = [factory() for _ in range(INSTANCES)]
+        allocated_after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(instances) == INSTANCES
+    return (allocated_after - allocated_before) / INSTANCES
+
+
+@pytest.mark.parametrize(
+    "create,slotted_class,dict_class",
+    [
+        (create_response, SuccessResponse, DictSuccessResponse),
+        (create_cert_record, CertRecord, DictCertRecord),
+        (create_cert_wrapper, CertWrapper, DictCertWrapper),
+        (create_url, URL, DictURL),
+    ],
+)
+def test_slotted_instances_are_smaller(create, slotted_class, dict_class):
+    slotted_size = measure_instance_size(lambda: create(slotted_class))
+    dict_size = measure_instance_size(lambda: create(dict_class))
+    logger.info(
+        f"{slotted_class.__name__}: {slotted_size:.0f} bytes per instance, {dict_size:.0f} bytes with a __dict__"
+    )
+
+    assert not hasattr(create(slotted_class), "__dict__")
+    assert slotted_size < dict_size
+
+
+@pytest.mark.parametrize("status", ["00", "10", "20", "30", "40", "50", "60"])
+def test_responses_have_no_dict(status):
+    response = ResponseFactory.create("gemini://test.com/", status, "meta")
+
+    assert not hasattr(response, "__dict__")
+    assert response.url == "gemini://test.com/"
+    assert response.status == status
+    assert response.meta == "meta"
+
+
+def test_download_response_has_no_dict():
+    response = DownloadResponse(
+        create_response(SuccessResponse), "/tmp/file", 8, "abcd", "sha256"
+    )
+
+    assert not hasattr(response, "__dict__")
+    assert (response.path, response.size) == ("/tmp/file", 8)
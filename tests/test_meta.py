@@ -0,0 +1,77 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import warnings
+
+import pytest
+
+from ignition.meta import parse_meta
+
+METAS = [
+    "text/gemini",
+    "text/gemini; charset=utf-8",
+    "text/gemini;charset=utf-8;lang=en",
+    "TEXT/Gemini; Charset=UTF-8; LANG=en-US",
+    "text/plain; charset=iso-8859-1",
+    "  text/plain ;  charset = utf-8  ",
+    'text/plain; charset="utf-8"',
+    'text/plain; title="a; b"; charset=utf-8',
+    'text/plain; title="say \\"hi\\"; bye"; lang=fr',
+    'text/plain; title="back\\\\slash"',
+    "text/plain; flag; charset=utf-8",
+    "text/plain;",
+    "image/png",
+]
+
+
+def test_default_meta():
+    parsed_meta = parse_meta("")
+
+    assert parsed_meta.mime_type == "text/gemini"
+    assert dict(parsed_meta.params) == {"charset": "utf-8"}
+    assert parse_meta(None) == parsed_meta
+
+
+def test_parse_meta():
+    parsed_meta = parse_meta("Text/Gemini; Charset=utf-8; lang=en,fr")
+
+    assert parsed_meta.mime_type == "text/gemini"
+    assert dict(parsed_meta.params) == {"charset": "utf-8", "lang": "en,fr"}
+
+
+def test_parse_meta_quoted_params():
+    parsed_meta = parse_meta('text/plain; title="a; \\"b\\""; charset=utf-8')
+
+    assert dict(parsed_meta.params) == {"title": 'a; "b"', "charset": "utf-8"}
+
+
+def test_parse_meta_skips_params_without_value():
+    assert dict(parse_meta("text/plain; flag; lang=en").params) == {"lang": "en"}
+
+
+def test_parse_meta_is_cached():
+    assert parse_meta("text/gemini; lang=en") is parse_meta("text/gemini; lang=en")
+
+
+def test_params_are_read_only():
+    with pytest.raises(TypeError):
+        parse_meta("text/gemini; lang=en").params["lang"] = "fr"
+
+
+@pytest.mark.parametrize("meta", METAS)
+def test_parse_meta_matches_cgi(meta):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        cgi = pytest.importorskip("cgi")
+
+    mime_type, params = cgi.parse_header(meta)
+    parsed_meta = parse_meta(meta)
+
+    assert parsed_meta.mime_type == mime_type.lower()
+    assert dict(parsed_meta.params) == params
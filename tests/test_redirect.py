@@ -0,0 +1,175 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+from unittest.mock import Mock
+
+from ignition.globals import RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
+from ignition.redirect import RedirectCache, RedirectFollower
+from ignition.response import ErrorResponse, RedirectResponse, ResponseFactory
+from ignition.url import URL
+
+
+def request_factory(routes):
+    """
+    Returns a mock request factory answering each url with the (status, meta) in routes
+    """
+
+    def create_request(request_url):
+        status, meta = routes[request_url]
+        request = Mock()
+        request.send.return_value = ResponseFactory.create(
+            URL(request_url), status, meta, b"" if status == "20" else None
+        )
+        return request
+
+    return Mock(side_effect=create_request)
+
+
+def requested_urls(factory):
+    return [call[0][0] for call in factory.call_args_list]
+
+
+def test_follows_redirects():
+    factory = request_factory(
+        {
+            "gemini://a.com/": ("30", "/b"),
+            "gemini://a.com/b": ("30", "gemini://c.com/"),
+            "gemini://c.com/": ("20", "text/gemini"),
+        }
+    )
+
+    response = RedirectFollower(factory, 5).send("gemini://a.com/")
+
+    assert response.status == "20"
+    assert response.url == "gemini://c.com/"
+    assert requested_urls(factory) == [
+        "gemini://a.com/",
+        "gemini://a.com/b",
+        "gemini://c.com/",
+    ]
+
+
+def test_stops_at_max_redirects():
+    factory = request_factory(
+        {
+            "gemini://a.com/": ("30", "/b"),
+            "gemini://a.com/b": ("30", "/c"),
+            "gemini://a.com/c": ("20", "text/gemini"),
+        }
+    )
+
+    response = RedirectFollower(factory, 1).send("gemini://a.com/")
+
+    assert isinstance(response, RedirectResponse)
+    assert response.url == "gemini://a.com/b"
+    assert factory.call_count == 2
+
+
+def test_detects_loops():
+    factory = request_factory(
+        {
+            "gemini://a.com/": ("30", "/b"),
+            "gemini://a.com/b": ("31", "/"),
+        }
+    )
+
+    response = RedirectFollower(factory, 5).send("gemini://a.com/")
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
+    assert response.data() == "Redirect loop"
+    assert factory.call_count == 2
+
+
+def test_does_not_follow_other_protocols():
+    factory = request_factory({"gemini://a.com/": ("31", "https://a.com/")})
+
+    response = RedirectFollower(factory, 5).send("gemini://a.com/")
+
+    assert isinstance(response, RedirectResponse)
+    assert response.data() == "https://a.com/"
+
+
+def test_invalid_target():
+    factory = request_factory({"gemini://a.com/": ("31", "gemini://[broken/")})
+
+    response = RedirectFollower(factory, 5).send("gemini://a.com/")
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
+    assert response.data() == "Invalid redirect target"
+    assert factory.call_count == 1
+
+
+def test_same_host_only():
+    factory = request_factory(
+        {
+            "gemini://a.com/": ("30", "/b"),
+            "gemini://a.com/b": ("30", "gemini://c.com/"),
+            "gemini://c.com/": ("20", "text/gemini"),
+        }
+    )
+
+    response = RedirectFollower(factory, 5, same_host_only=True).send("gemini://a.com/")
+
+    assert isinstance(response, RedirectResponse)
+    assert response.data() == "gemini://c.com/"
+    assert requested_urls(factory) == ["gemini://a.com/", "gemini://a.com/b"]
+
+
+def test_caches_permanent_redirects():
+    cache = RedirectCache(max_size=10)
+    factory = request_factory(
+        {
+            "gemini://a.com/": ("31", "/b"),
+            "gemini://a.com/b": ("30", "/c"),
+            "gemini://a.com/c": ("20", "text/gemini"),
+        }
+    )
+
+    RedirectFollower(factory, 5, cache).send("gemini://a.com/")
+    factory.reset_mock()
+    response = RedirectFollower(factory, 5, cache).send("gemini://a.com/")
+
+    # The permanent redirect is skipped, the temporary one is not
+    assert response.status == "20"
+    assert requested_urls(factory) == ["gemini://a.com/b", "gemini://a.com/c"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_resolves_chains():
+    cache = RedirectCache(max_size=10)
+    cache.add("gemini://a.com/", "gemini://a.com/b")
+    cache.add("gemini://a.com/b", "gemini://a.com/c")
+
+    assert cache.resolve("gemini://a.com/") == "gemini://a.com/c"
+    assert cache.resolve("gemini://b.com/") == "gemini://b.com/"
+
+
+def test_cache_stops_at_loops():
+    cache = RedirectCache(max_size=10)
+    cache.add("gemini://a.com/", "gemini://a.com/b")
+    cache.add("gemini://a.com/b", "gemini://a.com/")
+
+    assert cache.resolve("gemini://a.com/") == "gemini://a.com/b"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RedirectCache(max_size=2)
+    cache.add("gemini://a.com/", "gemini://a.com/new")
+    cache.add("gemini://b.com/", "gemini://b.com/new")
+    cache.resolve("gemini://a.com/")
+    cache.add("gemini://c.com/", "gemini://c.com/new")
+
+    assert cache.resolve("gemini://a.com/") == "gemini://a.com/new"
+    assert cache.resolve("gemini://b.com/") == "gemini://b.com/"
+    assert cache.stats()["size"] == 2
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
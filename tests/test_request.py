@@ -7,7 +7,36 @@ at http://mozilla.org/MPL/2.0/.
 
 # pylint:disable=missing-function-docstring
 
+import socket
+import time
+
+import pytest
+
+from ignition.connect import HappyEyeballsConnector
+from ignition.dns_cache import DNSCache
+from ignition.exceptions import ResponseBodyTooLarge
+from ignition.globals import (
+    HOOK_ON_COMPLETE,
+    HOOK_ON_CONNECT,
+    HOOK_ON_HANDSHAKE,
+    HOOK_ON_HEADER,
+    HOOK_ON_TOFU_RESULT,
+    RESPONSE_STATUSDETAIL_ERROR_PROTOCOL,
+    RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE,
+    TOFU_RESULT_ADDED,
+)
+from ignition.hooks import Hooks
 from ignition.request import Request
+from ignition.response import ErrorResponse, SuccessResponse, TempFailureResponse
+from ignition.response_cache import ResponseCache
+from ignition.scheduler import HostScheduler
+from ignition.ssl.cert_store import CertStore
+from ignition.ssl.context_cache import SSLContextCache
+from ignition.ssl.session_cache import SSLSessionCache
+from ignition.timings import RequestTimings
+from ignition.util import TimeoutBudget
+
+from .helpers import GeminiTestServer, generate_self_signed_cert
 
 request = Request(
     "software/", referer="gemini://geminiprotocol.net/", request_timeout=30
@@ -18,5 +47,409 @@ def test_get_url():
     assert request.get_url() == "gemini://geminiprotocol.net/software/"
 
 
-def test_send():
-    print("Requests.send() test skipped; it's currently too complex to test.")
+def test_get_netloc():
+    assert request.get_netloc() == "geminiprotocol.net"
+
+
+def test_send(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+        ).send()
+
+    assert isinstance(response, SuccessResponse)
+    assert response.data() == "# Hello\n"
+    assert server.requests == [f"{server.url}\r\n".encode()]
+
+
+def test_send_timings(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+        ).send()
+
+    assert list(response.timings.durations()) == list(RequestTimings.PHASES)
+    assert all(duration >= 0 for duration in response.timings.durations().values())
+    assert response.timings.failed_phase is None
+
+
+def test_send_timings_error(tmp_path):
+    response = Request(
+        "gemini://127.0.0.1:1/",
+        request_timeout=5,
+        cert_store=CertStore(str(tmp_path / "known_hosts")),
+    ).send()
+
+    assert isinstance(response, ErrorResponse)
+    assert list(response.timings.durations()) == [RequestTimings.DNS]
+    assert response.timings.failed_phase == RequestTimings.CONNECT
+
+
+def test_send_hooks(tmp_path):
+    events = []
+    hooks = Hooks(
+        {
+            event: events.append
+            for event in (
+                HOOK_ON_CONNECT,
+                HOOK_ON_HANDSHAKE,
+                HOOK_ON_TOFU_RESULT,
+                HOOK_ON_HEADER,
+                HOOK_ON_COMPLETE,
+            )
+        }
+    )
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            hooks=hooks,
+        ).send()
+
+    assert [event.event for event in events] == [
+        HOOK_ON_CONNECT,
+        HOOK_ON_HANDSHAKE,
+        HOOK_ON_TOFU_RESULT,
+        HOOK_ON_HEADER,
+        HOOK_ON_COMPLETE,
+    ]
+    assert {event.host for event in events} == {f"localhost:{server.port}"}
+    assert events[2].tofu_result == TOFU_RESULT_ADDED
+    assert events[3].status == "20"
+    assert events[3].meta == "text/gemini"
+    assert events[3].bytes_read == len(b"20 text/gemini\r\n")
+    assert events[4].bytes_read == len(b"# Hello\n")
+    assert events[4].response is response
+    assert events[4].timings is response.timings
+
+
+def test_send_hooks_header_bytes(tmp_path):
+    events = []
+    header = "20 text/gemini; title=café\r\n".encode()
+
+    with GeminiTestServer(header + b"# Hello\n") as server:
+        Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            hooks=Hooks({HOOK_ON_HEADER: events.append}),
+        ).send()
+
+    assert events[0].meta == "text/gemini; title=café"
+    assert events[0].bytes_read == len(header)
+
+
+def test_send_hooks_error(tmp_path):
+    events = []
+    response = Request(
+        "gemini://127.0.0.1:1/",
+        request_timeout=5,
+        cert_store=CertStore(str(tmp_path / "known_hosts")),
+        hooks=Hooks({HOOK_ON_CONNECT: events.append, HOOK_ON_COMPLETE: events.append}),
+    ).send()
+
+    assert [event.event for event in events] == [HOOK_ON_COMPLETE]
+    assert events[0].status == response.status
+
+
+def test_send_with_dns_cache(tmp_path):
+    dns_cache = DNSCache(max_size=10, ttl=60, negative_ttl=10)
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        for _ in range(2):
+            response = Request(
+                server.url,
+                request_timeout=5,
+                cert_store=CertStore(str(tmp_path / "known_hosts")),
+                dns_cache=dns_cache,
+            ).send()
+            assert response.data() == "# Hello\n"
+
+    assert dns_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_send_with_connector(tmp_path):
+    connector = HappyEyeballsConnector(delay=0.25, max_hosts=10)
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            connector=connector,
+        ).send()
+
+    assert response.data() == "# Hello\n"
+    assert connector.get_family("localhost") == socket.AF_INET
+
+
+def test_send_slow_down_pauses_host(tmp_path, mocker):
+    scheduler = HostScheduler(max_in_flight=1)
+    paused_at_release = []
+    release = scheduler.release
+    mocker.patch.object(
+        scheduler,
+        "release",
+        side_effect=lambda host: (
+            paused_at_release.append(scheduler.paused_for(host)),
+            release(host),
+        ),
+    )
+
+    with GeminiTestServer(b"44 60\r\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            scheduler=scheduler,
+        ).send()
+
+        assert isinstance(response, TempFailureResponse)
+        assert 59 < scheduler.paused_for(f"localhost:{server.port}") <= 60
+
+    # The pause is in place before waiters on the slot are woken
+    assert len(paused_at_release) == 1
+    assert paused_at_release[0] > 59
+
+
+def test_send_stream_holds_host_slot(tmp_path, mocker):
+    scheduler = HostScheduler(max_in_flight=1)
+    release = mocker.spy(scheduler, "release")
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+            scheduler=scheduler,
+        ).send()
+
+        release.assert_not_called()
+        assert response.stream.read() == b"# Hello\n"
+        response.close()
+
+    release.assert_called_once_with(f"localhost:{server.port}")
+
+
+def test_send_releases_host_slot(tmp_path, mocker):
+    scheduler = HostScheduler(max_in_flight=1)
+    release = mocker.spy(scheduler, "release")
+
+    with GeminiTestServer(b"51 Not found\r\n") as server:
+        Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+            scheduler=scheduler,
+        ).send()
+
+    release.assert_called_once_with(f"localhost:{server.port}")
+
+
+def test_send_with_response_cache(tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "cache"), 60, 1024 * 1024, ("2",))
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        responses = [
+            Request(
+                server.url,
+                request_timeout=5,
+                cert_store=CertStore(str(tmp_path / "known_hosts")),
+                response_cache=response_cache,
+            ).send()
+            for _ in range(2)
+        ]
+
+        assert len(server.requests) == 1
+
+    assert responses[1].data() == "# Hello\n"
+    assert responses[1].certificate == responses[0].certificate
+    assert responses[1].timings is None
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_send_with_client_certificate_skips_response_cache(tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "cache"), 60, 1024 * 1024, ("2",))
+    client_cert = generate_self_signed_cert(str(tmp_path), "client")
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Private\n") as server:
+        for ca_cert in (client_cert, None, client_cert):
+            Request(
+                server.url,
+                request_timeout=5,
+                cert_store=CertStore(str(tmp_path / "known_hosts")),
+                ca_cert=ca_cert,
+                response_cache=response_cache,
+            ).send()
+
+        assert len(server.requests) == 3
+
+    assert response_cache.stats()["hits"] == 0
+
+
+def test_send_response_cache_max_body_bytes(tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "cache"), 60, 1024 * 1024, ("2",))
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        responses = [
+            Request(
+                server.url,
+                request_timeout=5,
+                cert_store=CertStore(str(tmp_path / "known_hosts")),
+                max_body_bytes=max_body_bytes,
+                response_cache=response_cache,
+            ).send()
+            for max_body_bytes in (None, 4)
+        ]
+
+        assert len(server.requests) == 1
+
+    assert isinstance(responses[1], ErrorResponse)
+    assert responses[1].status == "05"
+
+
+def test_send_total_timeout(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n", drip_delay=0.05) as server:
+        started_at = time.monotonic()
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            timeout_budget=TimeoutBudget(5, total_timeout=0.5),
+        ).send()
+        elapsed = time.monotonic() - started_at
+
+    assert isinstance(response, ErrorResponse)
+    assert response.data() == "Socket timeout"
+    assert elapsed < 2
+
+
+def test_send_stream_total_timeout(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n", drip_delay=0.05) as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+            timeout_budget=TimeoutBudget(5, total_timeout=0.5),
+        ).send()
+
+        with pytest.raises(socket.timeout):
+            for _ in response.iter_content():
+                pass
+
+    assert response.stream.closed
+
+
+def test_send_max_body_bytes(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n" + b"x" * 200000) as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            max_body_bytes=1000,
+        ).send()
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == RESPONSE_STATUSDETAIL_ERROR_RESPONSE_TOO_LARGE
+
+
+def test_send_within_max_body_bytes(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n" + b"x" * 1000) as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            max_body_bytes=1000,
+        ).send()
+
+    assert response.raw_body == b"x" * 1000
+
+
+def test_send_header_too_long(tmp_path):
+    with GeminiTestServer(b"20 " + b"x" * 5000 + b"\r\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+        ).send()
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == RESPONSE_STATUSDETAIL_ERROR_PROTOCOL
+
+
+def test_send_stream_max_body_bytes(tmp_path):
+    with GeminiTestServer(b"20 text/gemini\r\n" + b"x" * 200000) as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+            max_body_bytes=1000,
+        ).send()
+
+        with pytest.raises(ResponseBodyTooLarge):
+            for _ in response.iter_content(256):
+                pass
+
+    assert response.stream.bytes_read == 1001
+    assert response.stream.closed
+
+
+def test_send_stream(tmp_path):
+    body = b"x" * 200000
+    with GeminiTestServer(b"20 application/octet-stream\r\n" + body) as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+        ).send()
+
+        assert isinstance(response, SuccessResponse)
+        assert response.stream.bytes_read == 0
+        assert b"".join(response.iter_content(4096)) == body
+
+    assert response.stream.closed
+
+
+def test_send_stream_without_body(tmp_path):
+    with GeminiTestServer(b"51 Not found\r\n") as server:
+        response = Request(
+            server.url,
+            request_timeout=5,
+            cert_store=CertStore(str(tmp_path / "known_hosts")),
+            stream=True,
+        ).send()
+
+    assert response.status == "51"
+    assert response.stream is None
+
+
+def test_send_resumes_tls_session(tmp_path):
+    cert_store = CertStore(str(tmp_path / "known_hosts"))
+    ssl_context_cache = SSLContextCache()
+    ssl_session_cache = SSLSessionCache(max_size=10, ttl=60)
+
+    with GeminiTestServer(b"20 text/gemini\r\n# Hello\n") as server:
+        responses = [
+            Request(
+                server.url,
+                request_timeout=5,
+                cert_store=cert_store,
+                ssl_context_cache=ssl_context_cache,
+                ssl_session_cache=ssl_session_cache,
+            ).send()
+            for _ in range(3)
+        ]
+
+    assert [response.data() for response in responses] == ["# Hello\n"] * 3
+    assert ssl_session_cache.stats() == {"hits": 2, "misses": 1, "size": 1}
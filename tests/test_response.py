@@ -157,6 +157,15 @@ class SuccessResponseTests(TestCase):
     def test_meta(self):
         self.assertEqual(self.response.meta, "text/gemini; charset=utf-8")
 
+    def test_iter_content(self):
+        self.assertEqual(
+            list(self.response.iter_content(16)),
+            [b"This is a sample", b" body\r\n\r\nHello"],
+        )
+
+    def test_stream(self):
+        self.assertEqual(self.response.stream, None)
+
     def test_raw_body(self):
         self.assertEqual(self.response.raw_body, b"This is a sample body\r\n\r\nHello")
 
@@ -170,6 +179,33 @@ class SuccessResponseTests(TestCase):
     def test_data(self):
         self.assertEqual(self.response.data(), "This is a sample body\r\n\r\nHello")
 
+    def test_data_is_cached(self):
+        self.assertIs(self.response.data(), self.response.data())
+
+    def test_data_after_raw_body_changes(self):
+        data = self.response.data()
+        self.response.raw_body = b"New body"
+
+        self.assertEqual(self.response.data(), "New body")
+        self.assertIsNot(self.response.data(), data)
+
+    def test_encoding(self):
+        self.assertEqual(self.response.encoding, "utf-8")
+
+    def test_mime_type(self):
+        self.assertEqual(self.response.mime_type, "text/gemini")
+
+    def test_params(self):
+        self.assertEqual(dict(self.response.params), {"charset": "utf-8"})
+
+    def test_raw_body_view(self):
+        view = self.response.raw_body_view()
+
+        self.assertIsInstance(view, memoryview)
+        self.assertTrue(view.readonly)
+        self.assertIs(view.obj, self.response.raw_body)
+        self.assertEqual(bytes(view[:4]), b"This")
+
     def test_certificate(self):
         self.assertEqual(self.response.certificate, "dummy cert object")
 
@@ -452,12 +488,53 @@ class ErrorResponseUnknownStatusTests(TestCase):
 
 
 class SuccessResponseAdvancedTests(TestCase):
-    # TODO: More advanced tests around the success body response. pylint: disable=fixme
+    def create_response(self, meta, raw_body):
+        return ResponseFactory.create(
+            "gemini://test.com/", RESPONSE_STATUSDETAIL_SUCCESS, meta, raw_body
+        )
+
     def test_default_metadata(self):
-        pass
+        response = self.create_response("", "Ünïcode".encode("utf-8"))
+
+        self.assertEqual(response.mime_type, "text/gemini")
+        self.assertEqual(response.encoding, "utf-8")
+        self.assertEqual(response.data(), "Ünïcode")
 
     def test_utf8_encoding(self):
-        pass
+        response = self.create_response(
+            "text/gemini; charset=utf-8", "Ünïcode".encode("utf-8")
+        )
+
+        self.assertEqual(response.data(), "Ünïcode")
 
     def test_other_encodings(self):
-        pass
+        response = self.create_response(
+            "text/plain; charset=iso-8859-1", "Ünïcode".encode("iso-8859-1")
+        )
+
+        self.assertEqual(response.encoding, "iso-8859-1")
+        self.assertEqual(response.data(), "Ünïcode")
+
+    def test_lang_param(self):
+        response = self.create_response("text/gemini; lang=en", b"Hello")
+
+        self.assertEqual(response.params["lang"], "en")
+        self.assertEqual(response.encoding, "utf-8")
+
+    def test_invalid_encoding(self):
+        response = self.create_response("text/plain; charset=invalid", b"body")
+
+        self.assertEqual(response.data(), b"body")
+
+    def test_undecodable_body(self):
+        response = self.create_response("text/plain; charset=utf-8", b"\xff\xfe")
+
+        self.assertEqual(response.data(), b"\xff\xfe")
+        self.assertIs(response.data(), response.data())
+
+    def test_raw_body_view_without_body(self):
+        response = ResponseFactory.create(
+            "gemini://test.com/", RESPONSE_STATUSDETAIL_PERM_FAILURE, "Not found"
+        )
+
+        self.assertEqual(len(response.raw_body_view()), 0)
@@ -0,0 +1,163 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import os
+
+from ignition.response import (
+    ErrorResponse,
+    InputResponse,
+    PermFailureResponse,
+    ResponseFactory,
+    SuccessResponse,
+)
+from ignition.response_cache import ResponseCache
+from ignition.url import URL
+
+STATUSES = ("2", "5")
+
+
+def create_cache(tmp_path, ttl=60, max_size=1024 * 1024):
+    return ResponseCache(str(tmp_path / "cache"), ttl, max_size, STATUSES)
+
+
+def create_response(url, status="20", meta="text/gemini", raw_body=b"# Hello\n"):
+    return ResponseFactory.create(URL(url), status, meta, raw_body)
+
+
+def test_get_missing(tmp_path):
+    cache = create_cache(tmp_path)
+
+    assert cache.get("gemini://test.com/") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "size": 0, "bytes": 0}
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_put_and_get(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put("gemini://test.com/", create_response("gemini://test.com/"))
+
+    response = cache.get("gemini://test.com/")
+
+    assert isinstance(response, SuccessResponse)
+    assert response.url == "gemini://test.com/"
+    assert response.status == "20"
+    assert response.meta == "text/gemini"
+    assert response.raw_body == b"# Hello\n"
+    assert response.data() == "# Hello\n"
+    assert response.certificate is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_put_perm_failure(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put(
+        "gemini://test.com/",
+        create_response("gemini://test.com/", "51", "Not found", None),
+    )
+
+    response = cache.get("gemini://test.com/")
+
+    assert isinstance(response, PermFailureResponse)
+    assert response.meta == "Not found"
+    assert response.raw_body is None
+
+
+def test_put_skips_uncacheable_statuses(tmp_path):
+    cache = create_cache(tmp_path)
+    for status in ("00", "10", "30", "44", "60"):
+        cache.put("gemini://test.com/", create_response("gemini://test.com/", status))
+
+    assert cache.get("gemini://test.com/") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_custom_statuses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache"), 60, 1024, ("1",))
+    cache.put(
+        "gemini://test.com/",
+        create_response("gemini://test.com/", "10", "Query?", None),
+    )
+
+    assert isinstance(cache.get("gemini://test.com/"), InputResponse)
+
+
+def test_get_max_body_bytes(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put("gemini://test.com/", create_response("gemini://test.com/"))
+
+    response = cache.get("gemini://test.com/", max_body_bytes=4)
+
+    assert isinstance(response, ErrorResponse)
+    assert response.status == "05"
+    assert cache.get("gemini://test.com/", max_body_bytes=8).raw_body == b"# Hello\n"
+
+
+def test_put_skips_non_text_meta(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache"), 60, 1024, ("0",))
+    cache.put(
+        "gemini://test.com/",
+        ResponseFactory.create(URL("gemini://test.com/"), "04", ValueError("error")),
+    )
+
+    assert cache.get("gemini://test.com/") is None
+
+
+def test_expires(tmp_path):
+    cache = create_cache(tmp_path, ttl=0)
+    cache.put("gemini://test.com/", create_response("gemini://test.com/"))
+
+    assert cache.get("gemini://test.com/") is None
+    assert cache.stats()["size"] == 0
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_evicts_least_recently_used(tmp_path):
+    body = b"x" * 400
+    cache = create_cache(tmp_path, max_size=1200)
+    cache.put("gemini://a.com/", create_response("gemini://a.com/", raw_body=body))
+    cache.put("gemini://b.com/", create_response("gemini://b.com/", raw_body=body))
+    cache.get("gemini://a.com/")
+    cache.put("gemini://c.com/", create_response("gemini://c.com/", raw_body=body))
+
+    assert cache.get("gemini://b.com/") is None
+    assert cache.get("gemini://a.com/") is not None
+    assert cache.get("gemini://c.com/") is not None
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["bytes"] <= 1200
+
+
+def test_persists_across_instances(tmp_path):
+    create_cache(tmp_path).put(
+        "gemini://test.com/", create_response("gemini://test.com/")
+    )
+
+    cache = create_cache(tmp_path)
+
+    assert cache.get("gemini://test.com/").raw_body == b"# Hello\n"
+    assert cache.stats()["size"] == 1
+
+
+def test_drops_corrupt_entries(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put("gemini://test.com/", create_response("gemini://test.com/"))
+    (entry,) = os.listdir(tmp_path / "cache")
+    (tmp_path / "cache" / entry).write_bytes(b"not a cache entry")
+
+    assert cache.get("gemini://test.com/") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_clear(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put("gemini://test.com/", create_response("gemini://test.com/"))
+
+    cache.clear()
+
+    assert cache.get("gemini://test.com/") is None
+    assert os.listdir(tmp_path / "cache") == []
@@ -0,0 +1,129 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import threading
+import time
+
+import pytest
+
+from ignition.response import ResponseFactory
+from ignition.scheduler import HostScheduler
+from ignition.url import URL
+
+
+def test_acquire_without_limits():
+    scheduler = HostScheduler()
+
+    started_at = time.monotonic()
+    for _ in range(100):
+        with scheduler.slot("test.com"):
+            pass
+
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_rate_limit():
+    scheduler = HostScheduler(rate=20, burst=2)
+
+    started_at = time.monotonic()
+    for _ in range(4):
+        with scheduler.slot("test.com"):
+            pass
+    elapsed = time.monotonic() - started_at
+
+    # Two requests from the burst, then one every 50ms
+    assert 0.09 <= elapsed < 0.5
+
+
+def test_rate_limit_is_per_host():
+    scheduler = HostScheduler(rate=1, burst=1)
+
+    started_at = time.monotonic()
+    for host in ("a.com", "b.com", "c.com"):
+        with scheduler.slot(host):
+            pass
+
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_max_in_flight():
+    scheduler = HostScheduler(max_in_flight=2)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def send():
+        with scheduler.slot("test.com"):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=send) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_pause():
+    scheduler = HostScheduler()
+    scheduler.pause("test.com", 0.1)
+
+    assert 0 < scheduler.paused_for("test.com") <= 0.1
+    assert scheduler.paused_for("other.com") == 0
+
+    started_at = time.monotonic()
+    with scheduler.slot("test.com"):
+        pass
+
+    assert time.monotonic() - started_at >= 0.09
+    assert scheduler.paused_for("test.com") == 0
+
+
+def test_pause_is_capped():
+    scheduler = HostScheduler(max_pause=0.1)
+    scheduler.pause("test.com", 3600)
+
+    assert scheduler.paused_for("test.com") <= 0.1
+
+
+def test_observe_slow_down():
+    scheduler = HostScheduler()
+
+    scheduler.observe("test.com", ResponseFactory.create(URL("//test.com"), "44", "60"))
+
+    assert 59 < scheduler.paused_for("test.com") <= 60
+
+
+@pytest.mark.parametrize(
+    ["status", "meta"],
+    [("20", "60"), ("40", "60"), ("44", "soon"), ("44", "")],
+)
+def test_observe_ignores(status, meta):
+    scheduler = HostScheduler()
+
+    scheduler.observe(
+        "test.com", ResponseFactory.create(URL("//test.com"), status, meta)
+    )
+
+    assert scheduler.paused_for("test.com") == 0
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        HostScheduler(rate=0)
+    with pytest.raises(ValueError):
+        HostScheduler(burst=0)
+    with pytest.raises(ValueError):
+        HostScheduler(max_in_flight=0)
@@ -0,0 +1,152 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+import io
+
+import pytest
+from mock import Mock
+
+from ignition.exceptions import ResponseBodyTooLarge, ResponseStreamConsumed
+from ignition.globals import RESPONSE_STATUSDETAIL_SUCCESS
+from ignition.response import ResponseFactory
+from ignition.stream import ResponseStream
+
+
+def create_stream(body=b"0123456789", max_bytes=None):
+    secure_socket = Mock()
+    return (
+        ResponseStream(
+            secure_socket, io.BufferedReader(io.BytesIO(body)), max_bytes=max_bytes
+        ),
+        secure_socket,
+    )
+
+
+def create_response(stream):
+    return ResponseFactory.create(
+        "gemini://test.com/",
+        RESPONSE_STATUSDETAIL_SUCCESS,
+        meta="text/gemini",
+        certificate="dummy cert object",
+        stream=stream,
+    )
+
+
+def test_read():
+    stream, secure_socket = create_stream()
+
+    assert stream.read(4) == b"0123"
+    assert stream.read() == b"456789"
+    assert stream.bytes_read == 10
+    assert stream.closed
+    secure_socket.close.assert_called_once()
+    assert stream.read() == b""
+
+
+def test_readinto():
+    stream, secure_socket = create_stream()
+    buffer = bytearray(4)
+
+    lengths = []
+    length = stream.readinto(buffer)
+    while length:
+        lengths.append(length)
+        length = stream.readinto(buffer)
+
+    assert lengths == [4, 4, 2]
+    assert buffer[:2] == b"89"
+    assert stream.closed
+    secure_socket.close.assert_called_once()
+
+
+def test_read_max_bytes():
+    stream, secure_socket = create_stream(max_bytes=5)
+
+    assert stream.read(5) == b"01234"
+    with pytest.raises(ResponseBodyTooLarge):
+        stream.read(5)
+    assert stream.bytes_read == 6
+    secure_socket.close.assert_called_once()
+
+
+def test_read_all_max_bytes():
+    stream, _ = create_stream(max_bytes=10)
+
+    assert stream.read() == b"0123456789"
+    assert stream.closed
+
+
+def test_readinto_max_bytes():
+    stream, _ = create_stream(max_bytes=5)
+    buffer = bytearray(4)
+
+    assert stream.readinto(buffer) == 4
+    with pytest.raises(ResponseBodyTooLarge):
+        stream.readinto(buffer)
+    assert stream.bytes_read == 6
+
+
+def test_iter_content():
+    stream, secure_socket = create_stream()
+
+    assert list(stream.iter_content(4)) == [b"0123", b"4567", b"89"]
+    secure_socket.close.assert_called_once()
+
+
+def test_iter_content_abandoned():
+    stream, secure_socket = create_stream()
+
+    chunks = stream.iter_content(4)
+    assert next(chunks) == b"0123"
+    chunks.close()
+
+    assert stream.closed
+    secure_socket.close.assert_called_once()
+
+
+def test_response_raw_body():
+    stream, _ = create_stream()
+    response = create_response(stream)
+
+    assert response.raw_body == b"0123456789"
+    assert response.data() == "0123456789"
+    assert stream.closed
+
+
+def test_response_iter_content():
+    stream, _ = create_stream()
+    response = create_response(stream)
+
+    assert b"".join(response.iter_content(3)) == b"0123456789"
+
+
+def test_response_raw_body_after_partial_read():
+    stream, _ = create_stream()
+    response = create_response(stream)
+    stream.read(2)
+
+    with pytest.raises(ResponseStreamConsumed):
+        response.raw_body  # pylint:disable=pointless-statement
+
+
+def test_response_context_manager():
+    stream, secure_socket = create_stream()
+
+    with create_response(stream) as response:
+        assert response.stream is stream
+
+    assert stream.closed
+    secure_socket.close.assert_called_once()
+
+
+def test_error_response_closes_stream():
+    stream, _ = create_stream()
+    ResponseFactory.create("gemini://test.com/", "99", stream=stream)
+
+    assert stream.closed
@@ -0,0 +1,40 @@
+"""
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL
+was not distributed with this file, You can obtain one
+at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint:disable=missing-function-docstring
+
+from ignition.timings import RequestTimings
+
+
+def test_durations():
+    timings = RequestTimings()
+    timings.started_at = 10.0
+    timings.timestamps = {"dns": 10.5, "connect": 11.0, "handshake": 12.5}
+
+    assert timings.durations() == {"dns": 0.5, "connect": 0.5, "handshake": 1.5}
+    assert timings.total() == 2.5
+
+
+def test_mark():
+    timings = RequestTimings()
+    timings.mark(RequestTimings.DNS)
+
+    assert timings.timestamps[RequestTimings.DNS] >= timings.started_at
+    assert list(timings.durations()) == ["dns"]
+
+
+def test_mark_failed():
+    timings = RequestTimings()
+    timings.mark(RequestTimings.DNS)
+    timings.mark(RequestTimings.CONNECT)
+    timings.mark_failed()
+
+    assert timings.failed_phase == RequestTimings.HANDSHAKE
+
+
+def test_total_without_phases():
+    assert RequestTimings().total() == 0.0
@@ -9,7 +9,7 @@ at http://mozilla.org/MPL/2.0/.
 
 import pytest
 
-from ignition.url import URL
+from ignition.url import URL, parse_url, split_url
 
 
 @pytest.mark.parametrize(
@@ -128,3 +128,70 @@ def test_relative_path_url_with_trailing_slash_with_referer():
     assert final_url.port() == 1965
     assert final_url.path() == "/page1/"
     assert final_url.query() == ""
+
+
+REFERER_URLS = [
+    None,
+    "gemini://gus.guru/search/page2",
+    "gemini://gus.guru/search/",
+    "gemini://gus.guru",
+    "gemini://gus.guru?q=1",
+    "gemini://GUS.guru:1966/a/b/../c?x#y",
+    "gemini://gus.guru#frag",
+    "gemini://gus.guru/a//b/./c",
+    "//gus.guru/a/b",
+    "gemini://gus.guru:0/",
+    "gemini://user@gus.guru/",
+    "gemini://[::1]:1965/a",
+    "https://gus.guru/a/b",
+    " gemini://gus.guru/a",
+]
+
+LINK_URLS = [
+    "",
+    "?",
+    "?query",
+    "#frag",
+    "page1",
+    "page1/",
+    "./page1",
+    "../page1",
+    "../../../page1",
+    "a/./b/../c",
+    ".",
+    "..",
+    "/home",
+    "/home/../x/",
+    "//other.guru/path?q",
+    "//other.guru",
+    "//other.guru:80",
+    "//other.guru:99999/",
+    "//other.guru:abc/",
+    "//other.guru:/",
+    "//",
+    "gemini://other.guru/a%20b",
+    "gemini://Other.Guru/",
+    "gemini://other.guru#frag/x",
+    "GEMINI://other.guru/",
+    "https://other.guru/",
+    "mailto:user@gus.guru",
+    "a:b/c",
+    "path;params",
+    "with space",
+    "  page1",
+    "tab\tpage",
+    "ünïcode",
+]
+
+
+@pytest.mark.parametrize("referer_url", REFERER_URLS)
+@pytest.mark.parametrize("test_url", LINK_URLS)
+def test_fast_path_matches_urllib(test_url, referer_url):
+    expected = split_url(test_url.lstrip(), referer_url)
+
+    assert parse_url(test_url, referer_url) == expected
+
+
+def test_parse_url_is_cached():
+    assert parse_url("gemini://gus.guru/a") is parse_url("gemini://gus.guru/a")
+    assert URL("a", referer_url="gemini://gus.guru/").path() == "/a"
@@ -7,7 +7,11 @@ at http://mozilla.org/MPL/2.0/.
 
 # pylint:disable=missing-function-docstring
 
-from ignition.util import TimeoutManager, normalize_path
+import socket
+
+import pytest
+
+from ignition.util import TimeoutBudget, TimeoutManager, normalize_path
 
 
 def test_base_normalize_path():
@@ -52,3 +56,43 @@ def test_timeout_manager():
 
     assert timeout_manager.get_timeout(None) == 12
     assert timeout_manager.get_timeout(15) == 15
+
+    assert timeout_manager.get_budget(None).timeout == 12
+    assert timeout_manager.get_budget(15).timeout == 15
+
+
+def test_timeout_manager_budgets():
+    timeout_manager = TimeoutManager(10)
+    assert timeout_manager.get_budget(None).total_timeout is None
+
+    timeout_manager.set_default_budgets(connect_timeout=2, total_timeout=60)
+    budget = timeout_manager.get_budget(None)
+    assert budget.connect_timeout == 2
+    assert budget.handshake_timeout is None
+    assert budget.total_timeout == 60
+    assert timeout_manager.get_budget(None, total_timeout=5).total_timeout == 5
+
+
+def test_request_deadline_phases():
+    deadline = TimeoutBudget(10, connect_timeout=2, first_byte_timeout=4).start()
+
+    assert deadline.connect() == 2
+    assert deadline.handshake() == 10
+    assert deadline.first_byte() == 4
+    assert deadline.read() == 10
+    assert deadline.remaining() is None
+
+
+def test_request_deadline_total():
+    deadline = TimeoutBudget(10, connect_timeout=2, total_timeout=5).start()
+
+    assert deadline.connect() == 2
+    assert 4 < deadline.read() <= 5
+    assert 4 < deadline.remaining() <= 5
+
+
+def test_request_deadline_exceeded():
+    deadline = TimeoutBudget(10, total_timeout=0).start()
+
+    with pytest.raises(socket.timeout):
+        deadline.read()